@@ -0,0 +1,13 @@
+Feature: Test scenario with a background and a failure
+
+  Background: Init our scenario
+    Given I have empty step
+
+  Scenario: The first scenario
+    Then I have another empty step
+
+  Scenario: The second scenario
+    Then I have another empty step
+
+  Scenario: The failed scenario
+    Then I have a failed step
@@ -0,0 +1,25 @@
+#  Copyright (c) 2022 https://reportportal.io .
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#  https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License
+
+DEPTH = 30
+
+
+def call_deep(depth):
+    payload = "x" * 100
+    if depth <= 0:
+        raise ValueError(f"Failed at the bottom: {payload}")
+    call_deep(depth - 1)
+
+
+def test_deep_traceback():
+    call_deep(DEPTH)
@@ -0,0 +1,28 @@
+#  Copyright (c) 2022 https://reportportal.io .
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#  https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License
+
+import pytest
+
+
+class Dependency:
+    def call(self, value):
+        raise ConnectionError(f"Dependency {self} is not available for {value}")
+
+
+@pytest.mark.parametrize("value", [1, 2, 3])
+def test_dependency_failure(value):
+    Dependency().call(value)
+
+
+def test_other_failure():
+    assert False
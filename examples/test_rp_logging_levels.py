@@ -0,0 +1,29 @@
+#  Copyright (c) 2022 https://reportportal.io .
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#  https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License
+
+import logging
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+third_party_logger = logging.getLogger("third_party.client")
+
+LOG_MESSAGE = "Test logger logs to Report Portal"
+DEBUG_MESSAGE = "Test logger debug message"
+THIRD_PARTY_MESSAGE = "Third party library debug message"
+
+
+def test_report_portal_logging_levels():
+    third_party_logger.debug(THIRD_PARTY_MESSAGE)
+    logger.debug(DEBUG_MESSAGE)
+    logger.info(LOG_MESSAGE)
@@ -0,0 +1,315 @@
+#  Copyright (c) 2023 https://reportportal.io .
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#  https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License
+
+"""This module contains the circuit breaker, which writes client requests to a local journal if the server is down."""
+
+import copy
+import logging
+import os
+import pickle
+import tempfile
+import threading
+from time import monotonic
+from typing import Any, BinaryIO, Optional
+from uuid import uuid4
+
+from reportportal_client import RP
+from reportportal_client.steps import StepReporter
+
+LOGGER = logging.getLogger(__name__)
+
+LIFECYCLE_METHODS = ("start_test_item", "finish_test_item", "finish_launch")
+
+
+def _is_failure(name: str, result: Any) -> bool:
+    # The synchronous client returns None instead of an Item ID or a response message if a request failed
+    return name in LIFECYCLE_METHODS and result is None
+
+
+def _replay_entries(journal_file: BinaryIO, size: int, client: RP) -> int:
+    replayed = 0
+    while replayed < size:
+        offset = journal_file.tell()
+        name, args, kwargs = pickle.load(journal_file)
+        if _is_failure(name, getattr(client, name)(*args, **kwargs)):
+            journal_file.seek(offset)
+            break
+        replayed += 1
+    return replayed
+
+
+def replay_journal(path: str, client: RP) -> bool:
+    """Replay requests from a journal file, which was kept after the run.
+
+    The client should be created with the Launch UUID of the journal, it is a part of the journal file name.
+
+    :param path:   path to the journal file
+    :param client: ReportPortal client to send requests with
+    :return: True if all requests were sent, False otherwise
+    """
+    with open(path, "rb") as journal_file:
+        size = 0
+        while journal_file.peek(1):
+            pickle.load(journal_file)
+            size += 1
+        journal_file.seek(0)
+        return _replay_entries(journal_file, size, client) == size
+
+
+class Journal:
+    """Local append-only file of client requests, which can be replayed in the order of writing."""
+
+    path: Optional[str]
+    directory: Optional[str]
+    prefix: str
+
+    def __init__(self, directory: Optional[str] = None, prefix: str = "rp-journal-") -> None:
+        """Initialize the journal, the file is created on the first request.
+
+        :param directory: directory of the journal file, the system temporary directory by default
+        :param prefix:    journal file name prefix
+        """
+        self.path = None
+        self.directory = directory
+        self.prefix = prefix
+        self._file = None
+        self._size = 0
+        self._offset = 0
+
+    def __len__(self) -> int:
+        """Return the number of requests, which were not replayed yet."""
+        return self._size
+
+    def append(self, name: str, args: tuple, kwargs: dict) -> None:
+        """Write a client request to the journal.
+
+        :param name:   client method name
+        :param args:   method positional arguments
+        :param kwargs: method keyword arguments
+        """
+        if not self._file:
+            fd, self.path = tempfile.mkstemp(prefix=self.prefix, suffix=".pickle", dir=self.directory)
+            self._file = os.fdopen(fd, "w+b")
+        self._file.seek(0, 2)
+        pickle.dump((name, args, kwargs), self._file)
+        self._file.flush()
+        self._size += 1
+
+    def replay(self, client: RP) -> bool:
+        """Send journal requests until the first failed one.
+
+        :param client: ReportPortal client to send requests with
+        :return: True if all requests were sent, False otherwise
+        """
+        if not self._size:
+            return True
+        self._file.seek(self._offset)
+        self._size -= _replay_entries(self._file, self._size, client)
+        if self._size:
+            self._offset = self._file.tell()
+            return False
+        self._file.seek(0)
+        self._file.truncate()
+        self._offset = 0
+        return True
+
+    def close(self) -> None:
+        """Close the journal, keep the file only if there are requests which were not replayed."""
+        if not self._file:
+            return
+        if self._size and self._offset:
+            self._file.seek(self._offset)
+            rest = self._file.read()
+            self._file.seek(0)
+            self._file.truncate()
+            self._file.write(rest)
+        self._file.close()
+        self._file = None
+        if self._size:
+            LOGGER.warning(
+                "ReportPortal - %d requests were not sent, they are kept in the journal: %s", self._size, self.path
+            )
+        else:
+            os.remove(self.path)
+
+
+class CircuitBreakerClient:
+    """ReportPortal client wrapper, which stops sending requests to the server after consecutive failures.
+
+    While the breaker is open, Test Item starts and finishes and logs are written to a local journal without any
+    network wait, Test Items get their UUIDs on the agent side. After the reset timeout the next request replays the
+    journal, which probes the server. If all journal requests are sent the breaker closes, otherwise it stays open for
+    another timeout.
+
+    Nested steps go through the breaker too, and clients cloned for other threads share the breaker state and the
+    journal. A pickled breaker, e.g. the one xdist workers receive, gets its own journal and starts closed.
+
+    Only the synchronous client is supported, since failures of asynchronous requests are not known on call.
+    """
+
+    client: RP
+    failure_threshold: int
+    reset_timeout: float
+    journal: Journal
+    failures: int
+    opened_at: Optional[float]
+    step_reporter: StepReporter
+
+    def __init__(
+        self, client: RP, failure_threshold: int, reset_timeout: float, journal_directory: Optional[str] = None
+    ) -> None:
+        """Initialize the breaker.
+
+        :param client:            ReportPortal client to wrap
+        :param failure_threshold: number of consecutive failed requests, which opens the breaker
+        :param reset_timeout:     time in seconds after which the open breaker probes the server again
+        :param journal_directory: directory of the journal file, the system temporary directory by default
+        """
+        self.client = client
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.journal = Journal(journal_directory, f"rp-journal-{client.launch_uuid or 'launch'}-")
+        self.failures = 0
+        self.opened_at = None
+        self.step_reporter = StepReporter(self)
+        self._lock = threading.RLock()
+        # The breaker which holds the state and the journal, clones share it
+        self._root = self
+
+    def __getattr__(self, name: str) -> Any:
+        """Delegate everything else to the client."""
+        if name == "client":
+            # The client is not set yet, e.g. while the breaker is unpickled
+            raise AttributeError(name)
+        return getattr(self.client, name)
+
+    def __getstate__(self) -> dict[str, Any]:
+        """Control object pickling and return object fields as Dictionary.
+
+        :return: object state dictionary
+        """
+        state = self.__dict__.copy()
+        # Locks and open files are not transferable between processes, other processes write their own journal
+        del state["_lock"]
+        del state["_root"]
+        state["journal"] = Journal(self.journal.directory, self.journal.prefix)
+        state["failures"] = 0
+        state["opened_at"] = None
+        return state
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        """Control object pickling, receives object state as Dictionary.
+
+        :param dict state: object state dictionary
+        """
+        self.__dict__.update(state)
+        self._lock = threading.RLock()
+        self._root = self
+
+    def clone(self) -> "CircuitBreakerClient":
+        """Clone the client for another thread, the clone shares the breaker state and the journal.
+
+        :return: cloned breaker
+        """
+        cloned = object.__new__(CircuitBreakerClient)
+        cloned.__dict__.update(self.__dict__)
+        cloned.client = self.client.clone()
+        cloned.step_reporter = StepReporter(cloned)
+        return cloned
+
+    def start_launch(self, *args: Any, **kwargs: Any) -> Optional[str]:
+        """Start the Launch and use its UUID in the journal name."""
+        launch_uuid = self.client.start_launch(*args, **kwargs)
+        if launch_uuid:
+            self.journal.prefix = f"rp-journal-{launch_uuid}-"
+        return launch_uuid
+
+    def start_test_item(self, *args: Any, **kwargs: Any) -> Optional[str]:
+        """Start Test Item or write the request to the journal."""
+        return self._call("start_test_item", args, kwargs)
+
+    def finish_test_item(self, *args: Any, **kwargs: Any) -> Optional[str]:
+        """Finish Test Item or write the request to the journal."""
+        return self._call("finish_test_item", args, kwargs)
+
+    def log(self, *args: Any, **kwargs: Any) -> Optional[tuple[str, ...]]:
+        """Send Log message or write the request to the journal."""
+        return self._call("log", args, kwargs)
+
+    def finish_launch(self, *args: Any, **kwargs: Any) -> Optional[str]:
+        """Replay the journal regardless of the reset timeout and finish the Launch.
+
+        If the journal can't be replayed, the Launch finish is written to the journal too, the journal file is kept.
+        """
+        root = self._root
+        with root._lock:
+            if len(root.journal) and not root._replay(self.client):
+                root.journal.append("finish_launch", args, kwargs)
+                return None
+        return self.client.finish_launch(*args, **kwargs)
+
+    def close(self) -> None:
+        """Close the journal and the client, clones close only their client."""
+        if self._root is self:
+            self.journal.close()
+        self.client.close()
+
+    def _call(self, name: str, args: tuple, kwargs: dict) -> Any:
+        root = self._root
+        with root._lock:
+            if root.opened_at is not None:
+                if monotonic() - root.opened_at < root.reset_timeout or not root._replay(self.client):
+                    return self._write(name, args, kwargs)
+        result = getattr(self.client, name)(*args, **kwargs)
+        if name not in LIFECYCLE_METHODS:
+            return result
+        with root._lock:
+            if not _is_failure(name, result):
+                root.failures = 0
+                return result
+            root.failures += 1
+            if root.failures < root.failure_threshold:
+                return result
+            LOGGER.warning(
+                "ReportPortal - %d requests failed in a row, writing requests to the local journal", root.failures
+            )
+            root.opened_at = monotonic()
+            return self._write(name, args, kwargs)
+
+    # noinspection PyProtectedMember
+    def _replay(self, client: RP) -> bool:
+        # Replayed starts and finishes change the client Item stack, which already reflects journaled ones
+        stack = copy.deepcopy(client._item_stack)
+        try:
+            replayed = self.journal.replay(client)
+        finally:
+            client._item_stack = stack
+        if replayed:
+            LOGGER.warning("ReportPortal - server is available again, the local journal is sent")
+            self.opened_at = None
+            self.failures = 0
+        else:
+            self.opened_at = monotonic()
+        return replayed
+
+    # noinspection PyProtectedMember
+    def _write(self, name: str, args: tuple, kwargs: dict) -> Optional[str]:
+        item_id = None
+        if name == "start_test_item":
+            item_id = kwargs.get("uuid") or str(uuid4())
+            kwargs = dict(kwargs, uuid=item_id)
+            self.client._add_current_item(item_id)
+        elif name == "finish_test_item":
+            self.client._remove_current_item()
+        self._root.journal.append(name, args, kwargs)
+        return item_id
@@ -15,6 +15,7 @@
 
 import logging
 import warnings
+from enum import Enum
 from os import getenv
 from typing import Any, Optional, Union
 
@@ -26,6 +27,41 @@ from reportportal_client.logs import MAX_LOG_BATCH_PAYLOAD_SIZE
 ATTRIBUTES_SEPARATOR = ";"
 
 
+class BddStepsMode(Enum):
+    """Defines how pytest-bdd steps are reported."""
+
+    NESTED = 1  # Report every step as a nested step right away
+    BUFFERED = 2  # Record steps in memory and report them as nested steps on the scenario finish
+    LOG = 3  # Record steps in memory and report them as a single table log on the scenario finish
+
+
+class LogUploadPolicy(Enum):
+    """Defines for which test items captured logs are uploaded."""
+
+    ALWAYS = 1  # Send logs right away
+    ON_FAILURE = 2  # Buffer logs and send them on the item finish only if the item failed
+    ON_FAILURE_OR_RERUN = 3  # Buffer logs and send them on the item finish if the item failed or was rerun
+
+
+class LogQueueOverflow(Enum):
+    """Defines what to do with a new log record if the log queue is full."""
+
+    BLOCK = 1  # Wait until there is a free slot in the queue
+    DROP_OLDEST = 2  # Drop the oldest record in the queue
+    SPILL = 3  # Write the record to a temporary file, which is read after the queue is drained
+
+
+def to_log_level(value: Union[int, str]) -> int:
+    """Convert a logging level name or number to the level number.
+
+    :param value: level name, e.g. 'DEBUG', or its number
+    :return: level number
+    """
+    if isinstance(value, int):
+        return value
+    return int(getattr(logging, str(value).upper(), value))
+
+
 def normalize_attributes(attributes: Optional[Any]) -> Optional[Any]:
     """Split a string of attributes into a deduplicated list of attributes."""
     if not attributes:
@@ -69,6 +105,7 @@ class AgentConfig:
     rp_log_batch_size: int
     rp_log_batch_payload_limit: int
     rp_log_level: Optional[int]
+    rp_log_respect_levels: bool
     rp_log_format: Optional[str]
     rp_mode: str
     rp_parent_item_id: Optional[str]
@@ -93,9 +130,41 @@ class AgentConfig:
     rp_launch_uuid_print_output: OutputType
     rp_http_timeout: Optional[Union[tuple[float, float], float]]
     rp_report_fixtures: bool
+    rp_report_fixtures_buffered: bool
+    rp_report_fixtures_threshold: float
+    rp_description_max_length: int
+    rp_description_skip_oversized: bool
+    rp_evict_finished_items: bool
+    rp_lazy_item_paths: bool
+    rp_launch_start_background: bool
+    rp_bdd_steps_mode: BddStepsMode
+    rp_bdd_background_once: bool
+    rp_log_upload_policy: LogUploadPolicy
+    rp_log_buffer_size: int
+    rp_aggregate_passed: bool
+    rp_failure_dedup: bool
+    rp_failure_signature_attribute: bool
+    rp_traceback_style: Optional[str]
+    rp_traceback_max_bytes: int
+    rp_traceback_attach_full: bool
+    rp_log_coalesce_window: float
+    rp_log_coalesce_max_length: int
+    rp_log_queue_size: int
+    rp_log_queue_overflow: LogQueueOverflow
+    rp_log_max_pending: int
+    rp_circuit_breaker_failures: int
+    rp_circuit_breaker_reset_timeout: float
+    rp_circuit_breaker_journal_dir: Optional[str]
+    rp_retry_backoff: float
+    rp_retry_max_delay: float
+    rp_retry_worker_budget: int
+    rp_max_requests_per_second: float
+    rp_max_bytes_per_second: float
 
     # Custom log levels and overrides
     rp_log_custom_levels: Optional[dict[int, str]]
+    rp_log_logger_levels: Optional[dict[str, int]]
+    rp_retry_budgets: Optional[dict[str, int]]
 
     def __init__(self, pytest_config: Config) -> None:
         """Initialize required attributes."""
@@ -156,12 +225,8 @@ class AgentConfig:
             self.rp_log_batch_payload_limit = MAX_LOG_BATCH_PAYLOAD_SIZE
 
         log_level = self.find_option(pytest_config, "rp_log_level")
-        if not log_level:
-            self.rp_log_level = None
-        elif isinstance(log_level, int):
-            self.rp_log_level = log_level
-        else:
-            self.rp_log_level = int(getattr(logging, str(log_level).upper(), log_level))
+        self.rp_log_level = to_log_level(log_level) if log_level else None
+        self.rp_log_respect_levels = to_bool(self.find_option(pytest_config, "rp_log_respect_levels", False))
         self.rp_log_format = self.find_option(pytest_config, "rp_log_format")
         self.rp_thread_logging = to_bool(self.find_option(pytest_config, "rp_thread_logging") or False)
         self.rp_mode = self.find_option(pytest_config, "rp_mode")
@@ -207,6 +272,95 @@ class AgentConfig:
         else:
             self.rp_http_timeout = connect_timeout or read_timeout
         self.rp_report_fixtures = to_bool(self.find_option(pytest_config, "rp_report_fixtures", False))
+        self.rp_report_fixtures_buffered = to_bool(
+            self.find_option(pytest_config, "rp_report_fixtures_buffered", False)
+        )
+        self.rp_report_fixtures_threshold = float(self.find_option(pytest_config, "rp_report_fixtures_threshold", 0))
+        self.rp_description_max_length = int(self.find_option(pytest_config, "rp_description_max_length", 0))
+        self.rp_description_skip_oversized = to_bool(
+            self.find_option(pytest_config, "rp_description_skip_oversized", False)
+        )
+        self.rp_evict_finished_items = to_bool(self.find_option(pytest_config, "rp_evict_finished_items", False))
+        self.rp_lazy_item_paths = to_bool(self.find_option(pytest_config, "rp_lazy_item_paths", False))
+        if (
+            self.rp_lazy_item_paths
+            and self.rp_hierarchy_code
+            and not self.rp_hierarchy_dirs
+            and not self.rp_hierarchy_test_file
+        ):
+            # Directories are merged only if they hold no tests directly, which depends on all collected tests
+            warnings.warn(
+                "Parameter `rp_lazy_item_paths` is not supported if directories are merged and test file names are "
+                "hidden, the whole test tree is built on collection.",
+                RuntimeWarning,
+                2,
+            )
+            self.rp_lazy_item_paths = False
+        self.rp_launch_start_background = to_bool(self.find_option(pytest_config, "rp_launch_start_background", False))
+        bdd_steps_mode = self.find_option(pytest_config, "rp_bdd_steps_mode")
+        self.rp_bdd_steps_mode = BddStepsMode[bdd_steps_mode.upper()] if bdd_steps_mode else BddStepsMode.NESTED
+        self.rp_bdd_background_once = to_bool(self.find_option(pytest_config, "rp_bdd_background_once", False))
+        log_upload_policy = self.find_option(pytest_config, "rp_log_upload_policy")
+        self.rp_log_upload_policy = (
+            LogUploadPolicy[log_upload_policy.upper()] if log_upload_policy else LogUploadPolicy.ALWAYS
+        )
+        self.rp_log_buffer_size = int(self.find_option(pytest_config, "rp_log_buffer_size", 1000))
+        self.rp_aggregate_passed = to_bool(self.find_option(pytest_config, "rp_aggregate_passed", False))
+        if self.rp_aggregate_passed:
+            # Aggregated tests are started on their finish, so their fixtures can be reported only from the buffer
+            self.rp_report_fixtures_buffered = True
+        self.rp_failure_dedup = to_bool(self.find_option(pytest_config, "rp_failure_dedup", False))
+        self.rp_failure_signature_attribute = to_bool(
+            self.find_option(pytest_config, "rp_failure_signature_attribute", False)
+        )
+        traceback_style = self.find_option(pytest_config, "rp_traceback_style")
+        self.rp_traceback_style = traceback_style.lower() if traceback_style else None
+        self.rp_traceback_max_bytes = int(self.find_option(pytest_config, "rp_traceback_max_bytes", 0))
+        self.rp_traceback_attach_full = to_bool(self.find_option(pytest_config, "rp_traceback_attach_full", False))
+        self.rp_log_coalesce_window = float(self.find_option(pytest_config, "rp_log_coalesce_window", 0))
+        self.rp_log_coalesce_max_length = int(self.find_option(pytest_config, "rp_log_coalesce_max_length", 16384))
+        self.rp_log_queue_size = int(self.find_option(pytest_config, "rp_log_queue_size", 0))
+        log_queue_overflow = self.find_option(pytest_config, "rp_log_queue_overflow")
+        self.rp_log_queue_overflow = (
+            LogQueueOverflow[log_queue_overflow.upper()] if log_queue_overflow else LogQueueOverflow.BLOCK
+        )
+        self.rp_log_max_pending = int(self.find_option(pytest_config, "rp_log_max_pending", 0))
+        if self.rp_log_queue_size > 0 and self.rp_client_type is ClientType.ASYNC_BATCHED:
+            # The batched client runs its event loop in the calling thread, so it can't be called from queue listeners
+            warnings.warn(
+                "Parameter `rp_log_queue_size` is not supported by the ASYNC_BATCHED client, the log queue is "
+                "disabled.",
+                RuntimeWarning,
+                2,
+            )
+            self.rp_log_queue_size = 0
+        if self.rp_log_max_pending > 0 and self.rp_client_type is not ClientType.ASYNC_THREAD:
+            # Only the threaded client's tasks can be waited for from another thread
+            warnings.warn(
+                "Parameter `rp_log_max_pending` is supported only by the ASYNC_THREAD client, the limit is disabled.",
+                RuntimeWarning,
+                2,
+            )
+            self.rp_log_max_pending = 0
+        self.rp_circuit_breaker_failures = int(self.find_option(pytest_config, "rp_circuit_breaker_failures", 0))
+        self.rp_circuit_breaker_reset_timeout = float(
+            self.find_option(pytest_config, "rp_circuit_breaker_reset_timeout", 60)
+        )
+        self.rp_circuit_breaker_journal_dir = self.find_option(pytest_config, "rp_circuit_breaker_journal_dir") or None
+        self.rp_retry_backoff = float(self.find_option(pytest_config, "rp_retry_backoff", 0))
+        self.rp_retry_max_delay = float(self.find_option(pytest_config, "rp_retry_max_delay", 30))
+        self.rp_retry_worker_budget = int(self.find_option(pytest_config, "rp_retry_worker_budget", 0))
+        self.rp_max_requests_per_second = float(self.find_option(pytest_config, "rp_max_requests_per_second", 0))
+        self.rp_max_bytes_per_second = float(self.find_option(pytest_config, "rp_max_bytes_per_second", 0))
+        retry_budgets = self.find_option(pytest_config, "rp_retry_budgets")
+        self.rp_retry_budgets = None
+        if retry_budgets:
+            if isinstance(retry_budgets, str):
+                retry_budgets = retry_budgets.split()
+            self.rp_retry_budgets = {}
+            for retry_budget in retry_budgets:
+                request_type, retries = str(retry_budget).split(":", maxsplit=1)
+                self.rp_retry_budgets[request_type.strip().lower()] = int(retries)
 
         # Custom log levels and overrides
         log_custom_levels = self.find_option(pytest_config, "rp_log_custom_levels")
@@ -217,6 +371,15 @@ class AgentConfig:
                 level, level_name = str(custom_level).split(":", maxsplit=1)
                 levels[int(level)] = level_name
             self.rp_log_custom_levels = levels
+        log_logger_levels = self.find_option(pytest_config, "rp_log_logger_levels")
+        self.rp_log_logger_levels = None
+        if log_logger_levels:
+            if isinstance(log_logger_levels, str):
+                log_logger_levels = log_logger_levels.split()
+            self.rp_log_logger_levels = {}
+            for logger_level in log_logger_levels:
+                logger_name, level = str(logger_level).rsplit(":", maxsplit=1)
+                self.rp_log_logger_levels[logger_name] = to_log_level(level)
 
     # noinspection PyMethodMayBeStatic
     def find_option(self, pytest_config: Config, option_name: str, default: Any = None) -> Any:
@@ -0,0 +1,109 @@
+#  Copyright (c) 2023 https://reportportal.io .
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#  https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License
+
+"""This module contains the registry of reported failure signatures, which can be shared by xdist workers."""
+
+import os
+import threading
+from typing import Any, Optional
+
+try:
+    import fcntl
+
+    FILE_LOCKS = True
+except ImportError:
+    # Windows, each process keeps its own signatures instead
+    FILE_LOCKS = False
+
+
+class FailureSignatures:
+    """Node IDs of the first failed Test Items by failure signature.
+
+    If the state file is set, signatures are appended to it under a file lock, so all processes on the host using the
+    same file send a failure traceback only once.
+    """
+
+    state_file: Optional[str]
+
+    def __init__(self, state_file: Optional[str] = None) -> None:
+        """Initialize the registry.
+
+        :param state_file: path to the file to share the signatures through, signatures are per process if not set
+        """
+        self.state_file = state_file if FILE_LOCKS else None
+        self._signatures = {}
+        self._lock = threading.Lock()
+        self._fd = None
+        self._offset = 0
+
+    def setdefault(self, signature: str, node_id: str) -> str:
+        """Register the Test Item as the first one with the signature, unless there is another one already.
+
+        :param signature: failure signature
+        :param node_id:   node ID of the failed Test Item
+        :return: node ID of the first Test Item with the signature
+        """
+        with self._lock:
+            # Signatures are never removed, so the known ones need no file access
+            if signature in self._signatures or not self.state_file:
+                return self._signatures.setdefault(signature, node_id)
+            if self._fd is None:
+                self._fd = os.open(self.state_file, os.O_RDWR | os.O_CREAT | os.O_APPEND, 0o600)
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+            try:
+                self._read_new_signatures()
+                if signature not in self._signatures:
+                    os.write(self._fd, f"{signature} {node_id}\n".encode("utf-8"))
+                return self._signatures.setdefault(signature, node_id)
+            finally:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+    def _read_new_signatures(self) -> None:
+        os.lseek(self._fd, self._offset, os.SEEK_SET)
+        chunks = []
+        while True:
+            chunk = os.read(self._fd, 65536)
+            if not chunk:
+                break
+            chunks.append(chunk)
+        data = b"".join(chunks)
+        self._offset += len(data)
+        for line in data.decode("utf-8").splitlines():
+            signature, _, node_id = line.partition(" ")
+            self._signatures.setdefault(signature, node_id)
+
+    def __getstate__(self) -> dict[str, Any]:
+        """Control object pickling and return object fields as Dictionary.
+
+        :return: object state dictionary
+        """
+        state = self.__dict__.copy()
+        # Locks and file descriptors are not transferable between processes
+        del state["_lock"]
+        state["_fd"] = None
+        state["_offset"] = 0
+        return state
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        """Control object pickling, receives object state as Dictionary.
+
+        :param dict state: object state dictionary
+        """
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def close(self) -> None:
+        """Close the state file."""
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
@@ -0,0 +1,359 @@
+#  Copyright (c) 2023 https://reportportal.io .
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#  https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License
+
+"""This module contains test execution hooks, which are registered by the plugin only if reporting is enabled."""
+
+import logging
+from typing import Any, Callable, Generator
+
+import _pytest.logging
+import pytest
+from _pytest.runner import CallInfo
+
+# noinspection PyPackageRequirements
+from pytest import Item, Session
+from reportportal_client import RPLogHandler
+
+from pytest_reportportal.plugin import join_launch
+from pytest_reportportal.rp_logging import (
+    LogCoalescer,
+    LogQueue,
+    QueuedRPLogHandler,
+    patching_logger_class,
+    patching_logger_levels,
+    patching_thread_class,
+)
+
+try:
+    # noinspection PyPackageRequirements
+    from pytest_bdd.parser import Feature, Scenario, Step
+
+    PYTEST_BDD = True
+except ImportError:
+    Feature = type("dummy", (), {})
+    Scenario = type("dummy", (), {})
+    Step = type("dummy", (), {})
+    PYTEST_BDD = False
+
+
+# noinspection PyProtectedMember
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtestloop(session: Session) -> Generator[None, Any, None]:
+    """
+    Control start and finish of all test items in the session.
+
+    :param session: pytest.Session
+    :return:     generator object
+    """
+    config = session.config
+    if not config._rp_enabled:
+        yield
+        return
+
+    agent_config = config._reporter_config
+    log_queue = None
+    if agent_config.rp_log_queue_size > 0:
+        log_queue = LogQueue(
+            agent_config.rp_log_queue_size,
+            agent_config.rp_log_queue_overflow,
+            max_pending=agent_config.rp_log_max_pending,
+        )
+        log_queue.start()
+    config._rp_log_queue = log_queue
+    try:
+        # Logger levels are set once per session, since every level change resets caches of all loggers
+        with patching_thread_class(agent_config), patching_logger_levels(agent_config.rp_log_logger_levels):
+            yield
+    finally:
+        if log_queue:
+            log_queue.stop()
+        config._rp_log_queue = None
+
+
+# noinspection PyProtectedMember
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_protocol(item: Item) -> Generator[None, Any, None]:
+    """Control start and finish of pytest items.
+
+    :param item: Pytest.Item
+    :return:     generator object
+    """
+    config = item.config
+    if not config._rp_enabled:
+        yield
+        return
+
+    service = config.py_test_service
+    if service.launch_pending and not join_launch(config):
+        yield
+        return
+    agent_config = config._reporter_config
+    service.start_pytest_item(item)
+
+    log_level = agent_config.rp_log_level
+    if log_level is None and not agent_config.rp_log_respect_levels:
+        log_level = logging.NOTSET
+    log_client = service.create_log_buffer(item)
+    log_coalescer = None
+    if agent_config.rp_log_coalesce_window > 0:
+        log_client = log_coalescer = LogCoalescer(
+            log_client or service.rp, agent_config.rp_log_coalesce_window, agent_config.rp_log_coalesce_max_length
+        )
+    handler_kwargs = {
+        "level": log_level or logging.NOTSET,
+        "filter_client_logs": True,
+        "endpoint": agent_config.rp_endpoint,
+        "ignored_record_names": ("reportportal_client", "pytest_reportportal"),
+        "rp_client": log_client,
+        "custom_levels": agent_config.rp_log_custom_levels,
+    }
+    log_queue = getattr(config, "_rp_log_queue", None)
+    if log_queue:
+        log_handler = QueuedRPLogHandler(log_queue, **handler_kwargs)
+    else:
+        log_handler = RPLogHandler(**handler_kwargs)
+    log_format = agent_config.rp_log_format
+    if log_format:
+        log_handler.setFormatter(logging.Formatter(log_format))
+    with patching_logger_class():
+        with _pytest.logging.catching_logs(log_handler, level=log_level):
+            yield
+
+    if log_queue and log_client:
+        # Buffered and merged records are sent on the item finish, so they should reach the buffer first
+        log_queue.flush()
+    if log_coalescer:
+        log_coalescer.flush()
+    service.finish_pytest_item(item)
+
+
+# noinspection PyProtectedMember
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item: Item, call: CallInfo) -> Generator[None, Any, None]:
+    """Change runtest_makereport function.
+
+    :param item: pytest.Item
+    :param call: pytest.CallInfo
+    :return: None
+    """
+    result = yield
+    if not item.config._rp_enabled:
+        return
+    report = result.get_result()
+    service = item.config.py_test_service
+    service.process_results(item, report, call)
+
+
+def report_fixture(request, fixturedef, name: str, error_msg: str) -> Generator[None, Any, None]:
+    """Report fixture setup and teardown.
+
+    :param request:    Object of the FixtureRequest class
+    :param fixturedef: represents definition of the texture class
+    :param name:       Name of the fixture
+    :param error_msg:  Error message
+    """
+    config = request.config
+    enabled = getattr(config, "_rp_enabled", False)
+    service = getattr(config, "py_test_service", None)
+    agent_config = getattr(config, "_reporter_config", object())
+    report_fixtures = getattr(agent_config, "rp_report_fixtures", False)
+    if not enabled or not service or not report_fixtures:
+        yield
+        return
+
+    cached_result = getattr(fixturedef, "cached_result", None)
+    if cached_result and hasattr(cached_result, "__getitem__"):
+        result = fixturedef.cached_result[2]
+        if hasattr(result, "__getitem__"):
+            result = result[0]
+        if result and isinstance(result, BaseException):
+            yield
+            return
+
+    yield from service.report_fixture(name, error_msg)
+
+
+# no types for backward compatibility for older pytest versions
+@pytest.hookimpl(hookwrapper=True)
+def pytest_fixture_setup(fixturedef, request) -> Generator[None, Any, None]:
+    """Report fixture setup.
+
+    :param fixturedef: represents definition of the texture class
+    :param request:    represents fixture execution metadata
+    """
+    yield from report_fixture(
+        request,
+        fixturedef,
+        f"{fixturedef.scope} fixture setup: {fixturedef.argname}",
+        f"{fixturedef.scope} fixture setup failed: {fixturedef.argname}",
+    )
+
+
+# no types for backward compatibility for older pytest versions
+@pytest.hookimpl(hookwrapper=True)
+def pytest_fixture_post_finalizer(fixturedef, request) -> Generator[None, Any, None]:
+    """Report fixture teardown.
+
+    :param fixturedef: represents definition of the texture class
+    :param request:    represents fixture execution metadata
+    """
+    yield from report_fixture(
+        request,
+        fixturedef,
+        f"{fixturedef.scope} fixture teardown: {fixturedef.argname}",
+        f"{fixturedef.scope} fixture teardown failed: {fixturedef.argname}",
+    )
+
+
+if PYTEST_BDD:
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_bdd_before_scenario(request, feature: Feature, scenario: Scenario) -> Generator[None, Any, None]:
+        """Report BDD scenario start.
+
+        :param request: represents item execution metadata
+        :param feature: represents feature file
+        :param scenario: represents scenario from feature file
+        """
+        config = request.config
+        # noinspection PyProtectedMember
+        if not config._rp_enabled:
+            yield
+            return
+        service = config.py_test_service
+        service.start_bdd_scenario(feature, scenario)
+        yield
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_bdd_after_scenario(request, feature: Feature, scenario: Scenario) -> Generator[None, Any, None]:
+        """Report BDD scenario finish.
+
+        :param request: represents item execution metadata
+        :param feature: represents feature file
+        :param scenario: represents scenario from feature file
+        """
+        config = request.config
+        # noinspection PyProtectedMember
+        if not config._rp_enabled:
+            yield
+            return
+
+        yield
+        service = config.py_test_service
+        service.finish_bdd_scenario(feature, scenario)
+
+    # noinspection PyUnusedLocal
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_bdd_before_step(
+        request, feature: Feature, scenario: Scenario, step: Step, step_func: Callable[..., Any]
+    ) -> Generator[None, Any, None]:
+        """Report BDD step start.
+
+        :param request: represents item execution metadata
+        :param feature: represents feature file
+        :param scenario: represents scenario from feature file
+        :param step: represents step from scenario
+        :param step_func: represents function for step
+        """
+        config = request.config
+        # noinspection PyProtectedMember
+        if not config._rp_enabled:
+            yield
+            return
+
+        service = config.py_test_service
+        service.start_bdd_step(feature, scenario, step)
+        yield
+
+    # noinspection PyUnusedLocal
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_bdd_after_step(
+        request,
+        feature: Feature,
+        scenario: Scenario,
+        step: Step,
+        step_func: Callable[..., Any],
+        step_func_args: dict[str, Any],
+    ) -> Generator[None, Any, None]:
+        """Report BDD step finish.
+
+        :param request: represents item execution metadata
+        :param feature: represents feature file
+        :param scenario: represents scenario from feature file
+        :param step: represents step from scenario
+        :param step_func: represents function for step
+        :param step_func_args: represents arguments for step function
+        """
+        config = request.config
+        # noinspection PyProtectedMember
+        if not config._rp_enabled:
+            yield
+            return
+
+        yield
+        service = config.py_test_service
+        service.finish_bdd_step(feature, scenario, step)
+
+    # noinspection PyUnusedLocal
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_bdd_step_error(
+        request,
+        feature: Feature,
+        scenario: Scenario,
+        step: Step,
+        step_func: Callable[..., Any],
+        step_func_args: dict[str, Any],
+        exception,
+    ) -> Generator[None, Any, None]:
+        """Report BDD step error.
+
+        :param request: represents item execution metadata
+        :param feature: represents feature file
+        :param scenario: represents scenario from feature file
+        :param step: represents step from scenario
+        :param step_func: represents function for step
+        :param step_func_args: represents arguments for step function
+        :param exception: represents exception
+        """
+        config = request.config
+        # noinspection PyProtectedMember
+        if not config._rp_enabled:
+            yield
+            return
+
+        yield
+        service = config.py_test_service
+        service.finish_bdd_step_error(feature, scenario, step, exception)
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_bdd_step_func_lookup_error(
+        request, feature: Feature, scenario: Scenario, step: Step, exception
+    ) -> Generator[None, Any, None]:
+        """Report BDD step lookup error.
+
+        :param request: represents item execution metadata
+        :param feature: represents feature file
+        :param scenario: represents scenario from feature file
+        :param step: represents step from scenario
+        :param exception: represents exception
+        """
+        config = request.config
+        # noinspection PyProtectedMember
+        if not config._rp_enabled:
+            yield
+            return
+
+        service = config.py_test_service
+        service.start_bdd_step(feature, scenario, step)
+        yield
+        service.finish_bdd_step_error(feature, scenario, step, exception)
@@ -16,36 +16,26 @@
 import logging
 import os.path
 import pickle
-import time
+import socket
+import tempfile
 from logging import Logger
-from typing import Any, Callable, Generator
+from typing import TYPE_CHECKING, Any
+from uuid import uuid4
 
-import _pytest.logging
 import pytest
 
 # noinspection PyPackageRequirements
-from pytest import Item, Session
-from reportportal_client import RP, RPLogHandler
-from reportportal_client.errors import ResponseError
+from pytest import Session
 
 from pytest_reportportal import LAUNCH_WAIT_TIMEOUT
-from pytest_reportportal.config import AgentConfig
-from pytest_reportportal.rp_logging import patching_logger_class, patching_thread_class
-from pytest_reportportal.service import PyTestService
 
-try:
-    # noinspection PyPackageRequirements
-    from pytest_bdd.parser import Feature, Scenario, Step
-
-    PYTEST_BDD = True
-except ImportError:
-    Feature = type("dummy", (), {})
-    Scenario = type("dummy", (), {})
-    Step = type("dummy", (), {})
-    PYTEST_BDD = False
+if TYPE_CHECKING:
+    from pytest_reportportal.service import PyTestService
 
 LOGGER: Logger = logging.getLogger(__name__)
 
+HOOKS_PLUGIN_NAME: str = "reportportal_hooks"
+
 MANDATORY_PARAMETER_MISSED_PATTERN: str = (
     "One of the following mandatory parameters is unset: " + "rp_project: {}, rp_endpoint: {}"
 )
@@ -68,6 +58,8 @@ def pytest_configure_node(node: Any) -> None:
         # Stop now if the plugin is not properly configured
         return
     node.workerinput["py_test_service"] = pickle.dumps(node.config.py_test_service)
+    # Workers share the rate limit and failure signature files only if they run on the same host as the controller
+    node.workerinput["rp_controller_host"] = socket.gethostname()
 
 
 # no 'config' type for backward compatibility for older pytest versions
@@ -80,17 +72,29 @@ def is_control(config) -> bool:
     return not hasattr(config, "workerinput")
 
 
-def wait_launch(rp_client: RP) -> bool:
+def wait_launch(py_test_service: "PyTestService") -> bool:
     """Wait for the launch startup.
 
-    :param rp_client: Instance of the ReportPortalService class
+    :param py_test_service: Instance of the PyTestService class
+    :return: True if the launch was started, False otherwise
     """
-    timeout = time.time() + LAUNCH_WAIT_TIMEOUT
-    while not rp_client.launch_uuid:
-        if time.time() > timeout:
-            return False
-        time.sleep(1)
-    return True
+    return py_test_service.wait_launch(LAUNCH_WAIT_TIMEOUT)
+
+
+# no 'config' type for backward compatibility for older pytest versions
+# noinspection PyProtectedMember
+def join_launch(config) -> bool:
+    """Wait for the launch startup, disable reporting if the launch was not started.
+
+    :param config: Object of the pytest Config class
+    :return: True if the launch was started, False otherwise
+    """
+    if wait_launch(config.py_test_service):
+        return True
+    LOGGER.error(FAILED_LAUNCH_WAIT)
+    config.py_test_service.rp = None
+    config._rp_enabled = False
+    return False
 
 
 # noinspection PyProtectedMember
@@ -106,8 +110,14 @@ def pytest_sessionstart(session: Session) -> None:
     if not config._rp_enabled:
         return
 
+    from reportportal_client.errors import ResponseError
+
+    start_in_background = is_control(config) and config._reporter_config.rp_launch_start_background
     try:
-        config.py_test_service.start()
+        if start_in_background:
+            config.py_test_service.start_in_background()
+        else:
+            config.py_test_service.start()
     except ResponseError as response_error:
         LOGGER.warning("Failed to initialize reportportal-client service. " "Reporting is disabled.")
         LOGGER.debug(str(response_error))
@@ -116,12 +126,11 @@ def pytest_sessionstart(session: Session) -> None:
         return
 
     if is_control(config):
-        config.py_test_service.start_launch()
+        if not start_in_background:
+            config.py_test_service.start_launch()
+        # Worker nodes need the launch UUID on their start, so parallel runs join the launch right away
         if config.pluginmanager.hasplugin("xdist") or config.pluginmanager.hasplugin("pytest-parallel"):
-            if not wait_launch(session.config.py_test_service.rp):
-                LOGGER.error(FAILED_LAUNCH_WAIT)
-                config.py_test_service.rp = None
-                config._rp_enabled = False
+            join_launch(config)
 
 
 def pytest_collection_finish(session: Session) -> None:
@@ -147,12 +156,16 @@ def pytest_sessionfinish(session: Session) -> None:
     if not config._rp_enabled:
         # Stop now if the plugin is not properly configured
         return
+    if config.py_test_service.launch_pending and not join_launch(config):
+        return
 
     config.py_test_service.finish_suites()
     if is_control(config):
         config.py_test_service.finish_launch()
 
     config.py_test_service.stop()
+    if is_control(config):
+        config.py_test_service.remove_state_files()
 
 
 # no 'config' type for backward compatibility for older pytest versions
@@ -195,6 +208,10 @@ def pytest_configure(config) -> None:
         LOGGER.debug("Disabling reporting to RP.")
         return
 
+    # Client, service and BDD modules are heavy, so they are imported only if reporting is enabled. This keeps
+    # the plugin import cheap for all other pytest runs.
+    from pytest_reportportal.config import AgentConfig
+
     agent_config = AgentConfig(config)
     cond = (agent_config.rp_project, agent_config.rp_endpoint)
     config._rp_enabled = all(cond)
@@ -205,286 +222,33 @@ def pytest_configure(config) -> None:
 
     config._reporter_config = agent_config
 
+    from pytest_reportportal.service import PyTestService
+
     if is_control(config):
         config.py_test_service = PyTestService(agent_config)
+        if agent_config.rp_max_requests_per_second > 0 or agent_config.rp_max_bytes_per_second > 0:
+            config.py_test_service.rate_limit_file = os.path.join(
+                tempfile.gettempdir(), f"rp-rate-limit-{uuid4().hex}"
+            )
+        if agent_config.rp_failure_dedup:
+            config.py_test_service.failure_signature_file = os.path.join(
+                tempfile.gettempdir(), f"rp-failure-signatures-{uuid4().hex}"
+            )
     else:
         # noinspection PyUnresolvedReferences
         config.py_test_service = pickle.loads(config.workerinput["py_test_service"])
+        # noinspection PyUnresolvedReferences
+        config.py_test_service.rate_limit_share = config.workerinput.get("workercount", 1)
+        # noinspection PyUnresolvedReferences
+        if config.workerinput.get("rp_controller_host") != socket.gethostname():
+            config.py_test_service.rate_limit_file = None
+            config.py_test_service.failure_signature_file = None
 
+    # Test execution hooks are registered only if reporting is enabled, so other runs do not pay for their calls
+    from pytest_reportportal import hooks
 
-# noinspection PyProtectedMember
-@pytest.hookimpl(hookwrapper=True)
-def pytest_runtestloop(session: Session) -> Generator[None, Any, None]:
-    """
-    Control start and finish of all test items in the session.
-
-    :param session: pytest.Session
-    :return:     generator object
-    """
-    config = session.config
-    if not config._rp_enabled:
-        yield
-        return
-
-    agent_config = config._reporter_config
-    with patching_thread_class(agent_config):
-        yield
-
-
-# noinspection PyProtectedMember
-@pytest.hookimpl(hookwrapper=True)
-def pytest_runtest_protocol(item: Item) -> Generator[None, Any, None]:
-    """Control start and finish of pytest items.
-
-    :param item: Pytest.Item
-    :return:     generator object
-    """
-    config = item.config
-    if not config._rp_enabled:
-        yield
-        return
-
-    service = config.py_test_service
-    agent_config = config._reporter_config
-    service.start_pytest_item(item)
-
-    log_level = agent_config.rp_log_level or logging.NOTSET
-    log_handler = RPLogHandler(
-        level=log_level,
-        filter_client_logs=True,
-        endpoint=agent_config.rp_endpoint,
-        ignored_record_names=("reportportal_client", "pytest_reportportal"),
-        custom_levels=agent_config.rp_log_custom_levels,
-    )
-    log_format = agent_config.rp_log_format
-    if log_format:
-        log_handler.setFormatter(logging.Formatter(log_format))
-    with patching_logger_class():
-        with _pytest.logging.catching_logs(log_handler, level=log_level):
-            yield
-
-    service.finish_pytest_item(item)
-
-
-# noinspection PyProtectedMember
-@pytest.hookimpl(hookwrapper=True)
-def pytest_runtest_makereport(item: Item) -> Generator[None, Any, None]:
-    """Change runtest_makereport function.
-
-    :param item: pytest.Item
-    :return: None
-    """
-    result = yield
-    if not item.config._rp_enabled:
-        return
-    report = result.get_result()
-    service = item.config.py_test_service
-    service.process_results(item, report)
-
-
-def report_fixture(request, fixturedef, name: str, error_msg: str) -> Generator[None, Any, None]:
-    """Report fixture setup and teardown.
-
-    :param request:    Object of the FixtureRequest class
-    :param fixturedef: represents definition of the texture class
-    :param name:       Name of the fixture
-    :param error_msg:  Error message
-    """
-    config = request.config
-    enabled = getattr(config, "_rp_enabled", False)
-    service = getattr(config, "py_test_service", None)
-    agent_config = getattr(config, "_reporter_config", object())
-    report_fixtures = getattr(agent_config, "rp_report_fixtures", False)
-    if not enabled or not service or not report_fixtures:
-        yield
-        return
-
-    cached_result = getattr(fixturedef, "cached_result", None)
-    if cached_result and hasattr(cached_result, "__getitem__"):
-        result = fixturedef.cached_result[2]
-        if hasattr(result, "__getitem__"):
-            result = result[0]
-        if result and isinstance(result, BaseException):
-            yield
-            return
-
-    yield from service.report_fixture(name, error_msg)
-
-
-# no types for backward compatibility for older pytest versions
-@pytest.hookimpl(hookwrapper=True)
-def pytest_fixture_setup(fixturedef, request) -> Generator[None, Any, None]:
-    """Report fixture setup.
-
-    :param fixturedef: represents definition of the texture class
-    :param request:    represents fixture execution metadata
-    """
-    yield from report_fixture(
-        request,
-        fixturedef,
-        f"{fixturedef.scope} fixture setup: {fixturedef.argname}",
-        f"{fixturedef.scope} fixture setup failed: {fixturedef.argname}",
-    )
-
-
-# no types for backward compatibility for older pytest versions
-@pytest.hookimpl(hookwrapper=True)
-def pytest_fixture_post_finalizer(fixturedef, request) -> Generator[None, Any, None]:
-    """Report fixture teardown.
-
-    :param fixturedef: represents definition of the texture class
-    :param request:    represents fixture execution metadata
-    """
-    yield from report_fixture(
-        request,
-        fixturedef,
-        f"{fixturedef.scope} fixture teardown: {fixturedef.argname}",
-        f"{fixturedef.scope} fixture teardown failed: {fixturedef.argname}",
-    )
-
-
-if PYTEST_BDD:
-
-    @pytest.hookimpl(hookwrapper=True)
-    def pytest_bdd_before_scenario(request, feature: Feature, scenario: Scenario) -> Generator[None, Any, None]:
-        """Report BDD scenario start.
-
-        :param request: represents item execution metadata
-        :param feature: represents feature file
-        :param scenario: represents scenario from feature file
-        """
-        config = request.config
-        # noinspection PyProtectedMember
-        if not config._rp_enabled:
-            yield
-            return
-        service = config.py_test_service
-        service.start_bdd_scenario(feature, scenario)
-        yield
-
-    @pytest.hookimpl(hookwrapper=True)
-    def pytest_bdd_after_scenario(request, feature: Feature, scenario: Scenario) -> Generator[None, Any, None]:
-        """Report BDD scenario finish.
-
-        :param request: represents item execution metadata
-        :param feature: represents feature file
-        :param scenario: represents scenario from feature file
-        """
-        config = request.config
-        # noinspection PyProtectedMember
-        if not config._rp_enabled:
-            yield
-            return
-
-        yield
-        service = config.py_test_service
-        service.finish_bdd_scenario(feature, scenario)
-
-    # noinspection PyUnusedLocal
-    @pytest.hookimpl(hookwrapper=True)
-    def pytest_bdd_before_step(
-        request, feature: Feature, scenario: Scenario, step: Step, step_func: Callable[..., Any]
-    ) -> Generator[None, Any, None]:
-        """Report BDD step start.
-
-        :param request: represents item execution metadata
-        :param feature: represents feature file
-        :param scenario: represents scenario from feature file
-        :param step: represents step from scenario
-        :param step_func: represents function for step
-        """
-        config = request.config
-        # noinspection PyProtectedMember
-        if not config._rp_enabled:
-            yield
-            return
-
-        service = config.py_test_service
-        service.start_bdd_step(feature, scenario, step)
-        yield
-
-    # noinspection PyUnusedLocal
-    @pytest.hookimpl(hookwrapper=True)
-    def pytest_bdd_after_step(
-        request,
-        feature: Feature,
-        scenario: Scenario,
-        step: Step,
-        step_func: Callable[..., Any],
-        step_func_args: dict[str, Any],
-    ) -> Generator[None, Any, None]:
-        """Report BDD step finish.
-
-        :param request: represents item execution metadata
-        :param feature: represents feature file
-        :param scenario: represents scenario from feature file
-        :param step: represents step from scenario
-        :param step_func: represents function for step
-        :param step_func_args: represents arguments for step function
-        """
-        config = request.config
-        # noinspection PyProtectedMember
-        if not config._rp_enabled:
-            yield
-            return
-
-        yield
-        service = config.py_test_service
-        service.finish_bdd_step(feature, scenario, step)
-
-    # noinspection PyUnusedLocal
-    @pytest.hookimpl(hookwrapper=True)
-    def pytest_bdd_step_error(
-        request,
-        feature: Feature,
-        scenario: Scenario,
-        step: Step,
-        step_func: Callable[..., Any],
-        step_func_args: dict[str, Any],
-        exception,
-    ) -> Generator[None, Any, None]:
-        """Report BDD step error.
-
-        :param request: represents item execution metadata
-        :param feature: represents feature file
-        :param scenario: represents scenario from feature file
-        :param step: represents step from scenario
-        :param step_func: represents function for step
-        :param step_func_args: represents arguments for step function
-        :param exception: represents exception
-        """
-        config = request.config
-        # noinspection PyProtectedMember
-        if not config._rp_enabled:
-            yield
-            return
-
-        yield
-        service = config.py_test_service
-        service.finish_bdd_step_error(feature, scenario, step, exception)
-
-    @pytest.hookimpl(hookwrapper=True)
-    def pytest_bdd_step_func_lookup_error(
-        request, feature: Feature, scenario: Scenario, step: Step, exception
-    ) -> Generator[None, Any, None]:
-        """Report BDD step lookup error.
-
-        :param request: represents item execution metadata
-        :param feature: represents feature file
-        :param scenario: represents scenario from feature file
-        :param step: represents step from scenario
-        :param exception: represents exception
-        """
-        config = request.config
-        # noinspection PyProtectedMember
-        if not config._rp_enabled:
-            yield
-            return
-
-        service = config.py_test_service
-        service.start_bdd_step(feature, scenario, step)
-        yield
-        service.finish_bdd_step_error(feature, scenario, step, exception)
+    if not config.pluginmanager.is_registered(hooks):
+        config.pluginmanager.register(hooks, HOOKS_PLUGIN_NAME)
 
 
 # no types for backward compatibility for older pytest versions
@@ -619,6 +383,19 @@ def pytest_addoption(parser) -> None:
         help="Custom log levels specified as 'int level:string'. E.G.: '35:ASSERTION'. Overrides existing level if int"
         " level matches.",
     )
+    parser.addini(
+        "rp_log_logger_levels",
+        type="args",
+        help="Levels of specific loggers during the test session specified as 'logger name:level'. E.G.: "
+        "'urllib3:WARNING sqlalchemy.engine:INFO'. Records below these levels are not created at all.",
+    )
+    parser.addini(
+        "rp_log_respect_levels",
+        default=False,
+        type="bool",
+        help="Do not lower the root logger level to capture all records for reporting if 'rp_log_level' is not set, "
+        "existing logger levels are respected instead. Possible values: [True, False]",
+    )
     parser.addini("rp_ignore_attributes", type="args", help="Ignore specified pytest markers, i.e parametrize")
     parser.addini(
         "rp_is_skipped_an_issue", default=True, type="bool", help="Treat skipped tests as required investigation"
@@ -684,3 +461,208 @@ def pytest_addoption(parser) -> None:
         type="bool",
         help="Enable reporting fixtures as test items. Possible values: [True, False]",
     )
+    parser.addini(
+        "rp_report_fixtures_buffered",
+        default=False,
+        type="bool",
+        help="Buffer fixture nested steps of a test and report them at once on the test finish. Possible values: "
+        "[True, False]",
+    )
+    parser.addini(
+        "rp_report_fixtures_threshold",
+        default="0",
+        help="Minimal duration in seconds of fixture setup or teardown to report it in buffered mode. Failed fixtures "
+        "are always reported",
+    )
+    parser.addini(
+        "rp_description_max_length",
+        default="0",
+        help="Maximum length of test item descriptions, longer descriptions are truncated. 0 means no limit",
+    )
+    parser.addini(
+        "rp_description_skip_oversized",
+        default=False,
+        type="bool",
+        help="Do not report descriptions which exceed `rp_description_max_length` instead of truncating them. "
+        "Possible values: [True, False]",
+    )
+    parser.addini(
+        "rp_evict_finished_items",
+        default=False,
+        type="bool",
+        help="Release metadata of reported test items and finished suites to keep memory usage bounded on long runs. "
+        "Possible values: [True, False]",
+    )
+    parser.addini(
+        "rp_bdd_steps_mode",
+        default="NESTED",
+        help="How to report pytest-bdd steps: as nested steps right away, as nested steps sent at once on the "
+        "scenario finish or as a single table log on the scenario finish. Possible values: [NESTED, BUFFERED, LOG]",
+    )
+    parser.addini(
+        "rp_bdd_background_once",
+        default=False,
+        type="bool",
+        help="Report pytest-bdd Background steps only under the first scenario of a feature and under failed "
+        "scenarios. Possible values: [True, False]",
+    )
+    parser.addini(
+        "rp_lazy_item_paths",
+        default=False,
+        type="bool",
+        help="Resolve suite paths of test items on their start instead of building the whole test tree on collection. "
+        "Useful for xdist workers, which run only a part of collected items. Suites are finished at the end of the "
+        "session in this mode. Not supported with `rp_hierarchy_test_file = False` unless `rp_hierarchy_dirs` is set "
+        "or `rp_hierarchy_code` is not, since merged directory names then depend on other tests. Possible values: "
+        "[True, False]",
+    )
+    parser.addini(
+        "rp_launch_start_background",
+        default=False,
+        type="bool",
+        help="Start the launch in a background thread while tests are being collected, wait for it on the first test "
+        "start. Possible values: [True, False]",
+    )
+    parser.addini(
+        "rp_log_upload_policy",
+        default="ALWAYS",
+        help="For which test items captured logs are uploaded: for all items right away, only for failed items or for "
+        "failed and rerun items. Logs are buffered until the item finish in the last two modes. Possible values: "
+        "[ALWAYS, ON_FAILURE, ON_FAILURE_OR_RERUN]",
+    )
+    parser.addini(
+        "rp_log_buffer_size",
+        default="1000",
+        help="Maximum number of log entries buffered per test item if logs are not uploaded right away, older entries "
+        "are dropped",
+    )
+    parser.addini(
+        "rp_aggregate_passed",
+        default=False,
+        type="bool",
+        help="Report passed tests as a summary log with a listing attachment of their suite instead of separate test "
+        "items. Failed, skipped and rerun tests are reported as usual, but started only on their finish, so fixtures "
+        "are always reported as buffered and nested steps reported from the test code are attached to the suite. "
+        "Tests without a suite are reported as usual. Possible values: [True, False]",
+    )
+    parser.addini(
+        "rp_failure_dedup",
+        default=False,
+        type="bool",
+        help="Send a failure traceback in full only once per launch, later failures with the same signature get a "
+        "short log with the signature. xdist workers on the same host share the signatures, workers on other hosts "
+        "send the traceback once per worker. The signature is a hash of the traceback with memory addresses, "
+        "temporary paths and parameter values stripped. Possible values: [True, False]",
+    )
+    parser.addini(
+        "rp_failure_signature_attribute",
+        default=False,
+        type="bool",
+        help="Add 'failure_signature' attribute with the failure signature to failed test items. Possible values: "
+        "[True, False]",
+    )
+    parser.addini(
+        "rp_traceback_style",
+        help="Traceback style of failure logs, independent of the '--tb' option. By default the traceback is taken "
+        "from the pytest report as is. Possible values: [auto, long, short, line, native]",
+    )
+    parser.addini(
+        "rp_traceback_max_bytes",
+        default="0",
+        help="Maximum size of a failure log in bytes, the middle of longer tracebacks is cut out. 0 means no limit",
+    )
+    parser.addini(
+        "rp_traceback_attach_full",
+        default=False,
+        type="bool",
+        help="Attach gzip-compressed full traceback to a failure log, if it was truncated. Possible values: "
+        "[True, False]",
+    )
+    parser.addini(
+        "rp_log_coalesce_window",
+        default="0",
+        help="Time window in seconds to merge consecutive log records of the same level into one multi-line log "
+        "entry, identical consecutive messages are collapsed with their repeat count. 0 disables merging",
+    )
+    parser.addini(
+        "rp_log_coalesce_max_length",
+        default="16384",
+        help="Maximum length of a merged log entry message",
+    )
+    parser.addini(
+        "rp_log_queue_size",
+        default="0",
+        help="Size of the queue of captured log records. If set, the test thread only puts records into the queue, "
+        "they are formatted and sent by a background thread. Not supported by the ASYNC_BATCHED client, so its "
+        "memory use for logs is not bounded by the queue. 0 disables the queue",
+    )
+    parser.addini(
+        "rp_log_queue_overflow",
+        default="BLOCK",
+        help="What to do with a new log record if the log queue is full: wait for a free slot, drop the oldest record "
+        "or write the record to a temporary file. Possible values: [BLOCK, DROP_OLDEST, SPILL]",
+    )
+    parser.addini(
+        "rp_log_max_pending",
+        default="0",
+        help="Maximum number of unfinished log requests of the ASYNC_THREAD client. Above it the log queue waits for "
+        "the server, and new records are handled by the queue overflow policy, e.g. written to disk. Works only with "
+        "the log queue. The ASYNC_BATCHED client is not covered, its unfinished log requests are not limited. 0 "
+        "means no limit",
+    )
+    parser.addini(
+        "rp_circuit_breaker_failures",
+        default="0",
+        help="Number of consecutive failed Test Item requests, after which requests are written to a local journal "
+        "instead of the server. The journal is replayed when the server is available again. Works only with the "
+        "SYNC client. 0 disables the circuit breaker",
+    )
+    parser.addini(
+        "rp_circuit_breaker_reset_timeout",
+        default="60",
+        help="Time in seconds after which the circuit breaker probes the server by replaying the journal",
+    )
+    parser.addini(
+        "rp_circuit_breaker_journal_dir",
+        help="Directory of the circuit breaker journal file, the system temporary directory by default. The file is "
+        "kept only if it was not replayed by the end of the run",
+    )
+    parser.addini(
+        "rp_retry_backoff",
+        default="0",
+        help="Base delay in seconds of exponential backoff with full jitter between retries of HTTP requests. "
+        "Requests answered with 429 or 503 are retried regardless of their method, honoring 'Retry-After' header. "
+        "Works only with the SYNC client. 0 keeps the client's own retry policy",
+    )
+    parser.addini(
+        "rp_retry_max_delay",
+        default="30",
+        help="Maximum delay in seconds between retries of HTTP requests, it caps 'Retry-After' header value too",
+    )
+    parser.addini(
+        "rp_retry_budgets",
+        type="args",
+        help="Maximum number of retries of all requests of specific types together specified as 'type:retries', types "
+        "are 'launch', 'item' and 'log'. E.G.: 'item:5 log:1'. Each request is still retried no more than "
+        "'rp_api_retries' times, if it is set",
+    )
+    parser.addini(
+        "rp_retry_worker_budget",
+        default="0",
+        help="Maximum number of retries of all HTTP requests of a pytest process, e.g. an xdist worker, after which "
+        "failed requests are not retried. 0 means no limit",
+    )
+    parser.addini(
+        "rp_max_requests_per_second",
+        default="0",
+        help="Maximum number of HTTP requests per second to ReportPortal of all pytest processes of the run, xdist "
+        "workers on the same host share the limit. Retries and clients of threads started by tests are limited too. "
+        "Works only with the SYNC client. 0 means no limit",
+    )
+    parser.addini(
+        "rp_max_bytes_per_second",
+        default="0",
+        help="Maximum number of HTTP request body bytes per second to ReportPortal of all pytest processes of the "
+        "run, xdist workers on the same host share the limit. Retries are not counted, since their bodies are "
+        "unknown to the retry policy. Works only with the SYNC client. 0 means no limit",
+    )
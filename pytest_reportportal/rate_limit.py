@@ -0,0 +1,258 @@
+#  Copyright (c) 2023 https://reportportal.io .
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#  https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License
+
+"""This module contains the rate limiter of HTTP requests to ReportPortal, which can be shared by xdist workers."""
+
+import os
+import threading
+import time
+import weakref
+from typing import Any, Optional
+
+from reportportal_client import RP
+from requests import PreparedRequest, Response
+from requests.adapters import DEFAULT_RETRIES, HTTPAdapter, Retry
+
+try:
+    import fcntl
+
+    FILE_LOCKS = True
+except ImportError:
+    # Windows, limits are divided between workers instead
+    FILE_LOCKS = False
+
+
+class RateLimiter:
+    """Token buckets of requests and bytes per second.
+
+    Buckets hold one second of tokens, a request larger than the bytes bucket is let through and the debt is paid by
+    the next requests. If the state file is set, buckets are stored in it under a file lock, so all processes on the
+    host using the same file share the limits.
+    """
+
+    max_requests: float
+    max_bytes: float
+    state_file: Optional[str]
+
+    def __init__(self, max_requests: float, max_bytes: float, state_file: Optional[str] = None) -> None:
+        """Initialize the limiter.
+
+        :param max_requests: maximum number of requests per second, 0 means no limit
+        :param max_bytes:    maximum number of request body bytes per second, 0 means no limit
+        :param state_file:   path to the file to share the limits through, limits are per process if not set
+        """
+        self.max_requests = max_requests
+        self.max_bytes = max_bytes
+        self.state_file = state_file if FILE_LOCKS else None
+        self._lock = threading.Lock()
+        self._state = None
+        self._fd = None
+
+    def acquire(self, size: int = 0) -> None:
+        """Wait until a request of the given size can be sent.
+
+        :param size: request body size in bytes
+        """
+        while True:
+            wait = self._take(size)
+            if wait <= 0:
+                return
+            time.sleep(wait)
+
+    def _take(self, size: int) -> float:
+        with self._lock:
+            if not self.state_file:
+                wait, self._state = self._take_tokens(self._state, size, time.monotonic())
+                return wait
+            if self._fd is None:
+                self._fd = os.open(self.state_file, os.O_RDWR | os.O_CREAT, 0o600)
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+            try:
+                os.lseek(self._fd, 0, os.SEEK_SET)
+                data = os.read(self._fd, 128).split()
+                state = tuple(float(value) for value in data) if len(data) == 3 else None
+                # Wall clock time, since monotonic clocks of processes are not comparable
+                wait, state = self._take_tokens(state, size, time.time())
+                os.lseek(self._fd, 0, os.SEEK_SET)
+                os.ftruncate(self._fd, 0)
+                os.write(self._fd, " ".join(repr(value) for value in state).encode("ascii"))
+                return wait
+            finally:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+    def _take_tokens(self, state: Optional[tuple[float, float, float]], size: int, now: float) -> tuple[float, tuple]:
+        if state is None:
+            requests, size_left, last = self.max_requests, self.max_bytes, now
+        else:
+            requests, size_left, last = state
+        elapsed = max(0.0, now - last)
+        requests = min(self.max_requests, requests + elapsed * self.max_requests)
+        size_left = min(self.max_bytes, size_left + elapsed * self.max_bytes)
+        wait = 0.0
+        if self.max_requests and requests < 1:
+            wait = (1 - requests) / self.max_requests
+        if self.max_bytes and size_left < 0:
+            wait = max(wait, -size_left / self.max_bytes)
+        if wait <= 0:
+            requests -= 1
+            size_left -= size
+        return wait, (requests, size_left, now)
+
+    def __getstate__(self) -> dict[str, Any]:
+        """Control object pickling and return object fields as Dictionary.
+
+        :return: object state dictionary
+        """
+        state = self.__dict__.copy()
+        # Locks and file descriptors are not transferable between processes
+        del state["_lock"]
+        state["_fd"] = None
+        return state
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        """Control object pickling, receives object state as Dictionary.
+
+        :param dict state: object state dictionary
+        """
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def close(self) -> None:
+        """Close the state file."""
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+
+def create_rate_limiter(
+    max_requests: float, max_bytes: float, state_file: Optional[str] = None, share: int = 1
+) -> RateLimiter:
+    """Create the rate limiter of a pytest process.
+
+    If the limits can't be shared through the state file, e.g. there are no file locks on the platform, each of the
+    processes gets its share of the limits.
+
+    :param max_requests: maximum number of requests per second of all processes, 0 means no limit
+    :param max_bytes:    maximum number of request body bytes per second of all processes, 0 means no limit
+    :param state_file:   path to the file to share the limits through
+    :param share:        number of processes, which divide the limits
+    :return: rate limiter
+    """
+    if state_file and FILE_LOCKS:
+        return RateLimiter(max_requests, max_bytes, state_file)
+    share = max(1, share)
+    return RateLimiter(max_requests / share, max_bytes / share)
+
+
+# Rate limited adapters by prefix of the client sessions they are mounted on, to mount them on clones of the clients
+MOUNTED_ADAPTERS: "weakref.WeakKeyDictionary[Any, dict[str, RateLimitedAdapter]]" = weakref.WeakKeyDictionary()
+
+
+class RateLimitedRetry(Retry):
+    """Retry, which waits for the rate limiter before each retry of a request.
+
+    Retries are made by urllib3 inside the adapter, so the adapter can't limit them. The request body is unknown here,
+    so retries take only request tokens.
+    """
+
+    rate_limiter: Optional[RateLimiter] = None
+
+    def new(self, **kwargs: Any) -> "RateLimitedRetry":
+        """Create a copy of the retry with custom attributes."""
+        retry = super().new(**kwargs)
+        retry.rate_limiter = self.rate_limiter
+        return retry
+
+    def sleep(self, response: Any = None) -> None:
+        """Wait for the backoff delay and then for the rate limiter."""
+        super().sleep(response)
+        if self.rate_limiter:
+            self.rate_limiter.acquire()
+
+
+class RateLimitedAdapter(HTTPAdapter):
+    """HTTP adapter, which waits for the rate limiter before sending a request.
+
+    Retries are made by urllib3 inside the adapter, so they are limited only if the retry policy is RateLimitedRetry.
+    """
+
+    rate_limiter: Optional[RateLimiter]
+
+    def __init__(self, rate_limiter: Optional[RateLimiter] = None, **kwargs: Any) -> None:
+        """Initialize the adapter.
+
+        :param rate_limiter: rate limiter to wait for, requests are not limited if not set
+        :param kwargs:       HTTPAdapter arguments
+        """
+        super().__init__(**kwargs)
+        self.rate_limiter = rate_limiter
+
+    def send(self, request: PreparedRequest, *args: Any, **kwargs: Any) -> Response:
+        """Wait for the rate limiter and send the request."""
+        if self.rate_limiter:
+            body = request.body
+            self.rate_limiter.acquire(len(body) if isinstance(body, (bytes, str)) else 0)
+        return super().send(request, *args, **kwargs)
+
+
+def mount_rate_limit(client: RP, rate_limiter: RateLimiter) -> None:
+    """Limit request rate of the synchronous client session keeping the client's retry policy.
+
+    :param client:       synchronous ReportPortal client
+    :param rate_limiter: rate limiter to wait for
+    """
+    # The same retry strategy the client mounts on its session
+    if client.retries:
+        retry_strategy = RateLimitedRetry(
+            total=client.retries, backoff_factor=0.1, status_forcelist=[429, 500, 502, 503, 504]
+        )
+        retry_strategy.rate_limiter = rate_limiter
+    else:
+        retry_strategy = DEFAULT_RETRIES
+    adapter = RateLimitedAdapter(rate_limiter, max_retries=retry_strategy, pool_maxsize=client.max_pool_size)
+    mount_adapter(client, "https://", adapter)
+    # noinspection HttpUrlsUsage
+    mount_adapter(client, "http://", adapter)
+
+
+def mount_adapter(client: RP, prefix: str, adapter: RateLimitedAdapter) -> None:
+    """Mount the adapter on the client session and remember it for clones of the client.
+
+    :param client:  synchronous ReportPortal client
+    :param prefix:  URL prefix
+    :param adapter: rate limited adapter
+    """
+    client.session.mount(prefix, adapter)
+    MOUNTED_ADAPTERS.setdefault(client.session, {})[prefix] = adapter
+
+
+def mount_parent_rate_limit(client: RP, parent: RP) -> None:
+    """Mount rate limited adapters of the parent client session on the session of its clone.
+
+    Cloned clients create a new session, so without it requests of other threads would bypass the rate limit and the
+    retry policy.
+
+    :param client: cloned synchronous ReportPortal client
+    :param parent: client the clone was made of
+    """
+    session = getattr(parent, "session", None)
+    if session is None:
+        return
+    for prefix, adapter in list(MOUNTED_ADAPTERS.get(session, {}).items()):
+        mount_adapter(
+            client,
+            prefix,
+            RateLimitedAdapter(
+                adapter.rate_limiter, max_retries=adapter.max_retries, pool_maxsize=client.max_pool_size
+            ),
+        )
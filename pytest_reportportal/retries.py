@@ -0,0 +1,185 @@
+#  Copyright (c) 2023 https://reportportal.io .
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#  https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License
+
+"""This module contains the retry policy of HTTP requests to ReportPortal."""
+
+import random
+import threading
+from typing import Any, Optional
+
+from reportportal_client import RP
+
+from pytest_reportportal.rate_limit import RateLimitedAdapter, RateLimitedRetry, RateLimiter, mount_adapter
+
+REQUEST_TYPES = ("launch", "item", "log")
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+# The server did not process requests with these statuses, so they are safe to retry for any method
+NOT_PROCESSED_STATUSES = (429, 503)
+
+
+class RetryBudget:
+    """Thread-safe number of retries left for a group of requests, e.g. all requests of a type or of the process."""
+
+    limit: int
+    used: int
+
+    def __init__(self, limit: int) -> None:
+        """Initialize the budget.
+
+        :param limit: maximum number of retries
+        """
+        self.limit = limit
+        self.used = 0
+        self._lock = threading.Lock()
+
+    def acquire(self) -> bool:
+        """Take one retry from the budget.
+
+        :return: False if the budget is exhausted
+        """
+        with self._lock:
+            if self.used >= self.limit:
+                return False
+            self.used += 1
+            return True
+
+    def release(self) -> None:
+        """Return one retry to the budget."""
+        with self._lock:
+            self.used -= 1
+
+
+class BackoffRetry(RateLimitedRetry):
+    """Retry with exponential backoff with full jitter, capped 'Retry-After' header and shared retry budgets.
+
+    Each delay is random between zero and the exponential value, so processes which failed at the same time do not
+    retry at the same time. Retries wait for the rate limiter too, if it is set.
+    """
+
+    max_delay: float = 30
+    budget: Optional[RetryBudget] = None
+    type_budget: Optional[RetryBudget] = None
+
+    def new(self, **kwargs: Any) -> "BackoffRetry":
+        """Create a copy of the retry with custom attributes."""
+        retry = super().new(**kwargs)
+        retry.max_delay = self.max_delay
+        retry.budget = self.budget
+        retry.type_budget = self.type_budget
+        return retry
+
+    def is_retry(self, method: str, status_code: int, has_retry_after: bool = False) -> bool:
+        """Retry requests which were not processed by the server regardless of their method."""
+        if status_code in NOT_PROCESSED_STATUSES:
+            return True
+        return super().is_retry(method, status_code, has_retry_after)
+
+    def get_backoff_time(self) -> float:
+        """Return random delay between zero and the exponential backoff value."""
+        if not self.history:
+            return 0
+        return random.uniform(0, min(self.max_delay, self.backoff_factor * 2 ** (len(self.history) - 1)))
+
+    def get_retry_after(self, response: Any) -> Optional[float]:
+        """Return 'Retry-After' header value capped with the maximum delay."""
+        retry_after = super().get_retry_after(response)
+        if retry_after is None:
+            return None
+        return min(retry_after, self.max_delay)
+
+    def increment(self, *args: Any, **kwargs: Any) -> "BackoffRetry":
+        """Count the retry in the budgets, if one is exhausted the request fails as if it was the last retry."""
+        # Raises if retries of the request are exhausted, so the budgets are taken only by actual retries
+        retry = super().increment(*args, **kwargs)
+        acquired = []
+        for budget in (self.type_budget, self.budget):
+            if not budget:
+                continue
+            if not budget.acquire():
+                # The retry is not made, so it is not counted in other budgets
+                for acquired_budget in acquired:
+                    acquired_budget.release()
+                exhausted = self.new(total=0)
+                exhausted.budget = None
+                exhausted.type_budget = None
+                return exhausted.increment(*args, **kwargs)
+            acquired.append(budget)
+        return retry
+
+
+def create_retry(
+    retries: int,
+    backoff: float,
+    max_delay: float,
+    budget: Optional[RetryBudget],
+    rate_limiter: Optional[RateLimiter] = None,
+    type_budget: Optional[RetryBudget] = None,
+) -> BackoffRetry:
+    """Create the retry policy of a request type.
+
+    :param retries:      maximum number of retries of a request
+    :param backoff:      base delay in seconds
+    :param max_delay:    maximum delay in seconds
+    :param budget:       retry budget of the process
+    :param rate_limiter: rate limiter to wait for before each retry
+    :param type_budget:  retry budget of the request type
+    :return: retry policy
+    """
+    retry = BackoffRetry(total=retries, backoff_factor=backoff, status_forcelist=RETRY_STATUSES)
+    retry.max_delay = max_delay
+    retry.budget = budget
+    retry.type_budget = type_budget
+    retry.rate_limiter = rate_limiter
+    return retry
+
+
+def mount_retry_policy(
+    client: RP,
+    retries: int,
+    backoff: float,
+    max_delay: float,
+    type_budgets: Optional[dict[str, int]] = None,
+    worker_budget: int = 0,
+    rate_limiter: Optional[RateLimiter] = None,
+) -> None:
+    """Replace retry policy of the synchronous client session.
+
+    Request types with a retry budget have their own HTTP adapters mounted on their API paths, since the session picks
+    the adapter with the longest matching URL prefix. All requests of the type share the budget, and each of them is
+    still retried no more than the maximum number of retries of a request, if it is set.
+
+    :param client:        synchronous ReportPortal client
+    :param retries:       maximum number of retries of a request
+    :param backoff:       base delay in seconds
+    :param max_delay:     maximum delay in seconds, it caps 'Retry-After' header value too
+    :param type_budgets:  maximum number of retries of all requests by request type: launch, item or log
+    :param worker_budget: maximum number of retries of all requests, 0 means no limit
+    :param rate_limiter:  rate limiter to wait for before each request and retry
+    """
+    budget = RetryBudget(worker_budget) if worker_budget > 0 else None
+
+    def adapter(max_retries: int, type_budget: Optional[RetryBudget] = None) -> RateLimitedAdapter:
+        return RateLimitedAdapter(
+            rate_limiter,
+            max_retries=create_retry(max_retries, backoff, max_delay, budget, rate_limiter, type_budget),
+            pool_maxsize=client.max_pool_size,
+        )
+
+    default_adapter = adapter(retries)
+    mount_adapter(client, "https://", default_adapter)
+    # noinspection HttpUrlsUsage
+    mount_adapter(client, "http://", default_adapter)
+    for request_type, type_budget in (type_budgets or {}).items():
+        type_adapter = adapter(retries if retries > 0 else type_budget, RetryBudget(type_budget))
+        for base_url in (client.base_url_v1, client.base_url_v2):
+            mount_adapter(client, f"{base_url}/{request_type}", type_adapter)
@@ -13,16 +13,31 @@
 
 """RPLogger class for low-level logging in tests."""
 
+import copy
 import logging
+import pickle
+import queue
 import sys
+import tempfile
 import threading
+from collections import deque
 from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
 from functools import wraps
-from typing import Any
+from typing import Any, Optional
 
-from reportportal_client import RPLogger, current, set_current
+from reportportal_client import RP, RPLogger, RPLogHandler, current, set_current
+from reportportal_client.aio import Task
 from reportportal_client.core.worker import APIWorker
 
+from pytest_reportportal.config import LogQueueOverflow
+from pytest_reportportal.rate_limit import mount_parent_rate_limit
+
+LOGGER = logging.getLogger(__name__)
+
+# How often idle queue listeners check if the queue is stopped, in seconds
+STOP_CHECK_INTERVAL = 0.1
+
 
 def is_api_worker(target):
     """Check if target is an RP worker thread."""
@@ -72,6 +87,7 @@ def patching_thread_class(config):
                     if hasattr(self, "parent_rp_client") and self.parent_rp_client and not current():
                         parent = self.parent_rp_client
                         client = parent.clone()
+                        mount_parent_rate_limit(client, parent)
                     try:
                         return original_func(self, *args, **kwargs)
                     finally:
@@ -164,3 +180,462 @@ def patching_logger_class():
             logger_class._log = original_log
             logger_class.makeRecord = original_makeRecord
             logging.setLoggerClass(logger_class)
+
+
+@contextmanager
+def patching_logger_levels(levels: Optional[dict[str, int]]):
+    """Set levels of the given loggers and restore them on exit.
+
+    :param levels: logger names with their levels
+    """
+    if not levels:
+        yield
+        return
+    original_levels = {}
+    for logger_name, level in levels.items():
+        logger = logging.getLogger(logger_name)
+        original_levels[logger] = logger.level
+        logger.setLevel(level)
+    try:
+        yield
+    finally:
+        for logger, level in original_levels.items():
+            logger.setLevel(level)
+
+
+class LogBuffer:
+    """Bounded buffer of test item log entries, which substitutes the client for RPLogHandler.
+
+    Entries are kept in memory until the item finish and then either sent with the `flush` method or discarded. If
+    the buffer is full the oldest entries are dropped.
+    """
+
+    rp_client: RP
+    entries: deque
+    dropped: int
+
+    def __init__(self, rp_client: RP, max_size: int) -> None:
+        """Initialize the buffer.
+
+        :param rp_client: ReportPortal client to send entries with
+        :param max_size:  maximum number of entries to keep
+        """
+        self.rp_client = rp_client
+        self.entries = deque(maxlen=max_size)
+        self.dropped = 0
+
+    def current_item(self) -> Optional[str]:
+        """Return ID of the Test Item which is currently reported by the client."""
+        return self.rp_client.current_item()
+
+    def log(
+        self,
+        time: Any,
+        message: str,
+        level: Optional[Any] = None,
+        attachment: Optional[dict] = None,
+        item_id: Optional[str] = None,
+    ) -> None:
+        """Record a log entry, same signature as the client's `log` method."""
+        if len(self.entries) == self.entries.maxlen:
+            self.dropped += 1
+        self.entries.append((time, message, level, attachment, item_id))
+
+    def flush(self, item_id: Optional[str] = None) -> None:
+        """Send all recorded entries with the client.
+
+        :param item_id: ID of the Test Item to send all entries to instead of the recorded ones, optional
+        """
+        if self.dropped and self.entries:
+            time, _, _, _, entry_item_id = self.entries[0]
+            message = f"{self.dropped} earlier log entries were dropped, since the log buffer is full"
+            self.rp_client.log(time, message, "WARN", None, item_id or entry_item_id)
+        while self.entries:
+            time, message, level, attachment, entry_item_id = self.entries.popleft()
+            self.rp_client.log(time, message, level, attachment, item_id or entry_item_id)
+        self.dropped = 0
+
+
+class LogCoalescer:
+    """Client substitute for RPLogHandler, which merges bursts of log entries into multi-line entries.
+
+    Consecutive entries of the same level for the same item within the time window are joined into one entry up to
+    the length limit. Consecutive identical messages are collapsed into one line with the number of repeats. Entries
+    with attachments are never merged.
+    """
+
+    rp_client: Any
+    window: timedelta
+    max_length: int
+
+    def __init__(self, rp_client: Any, window: float, max_length: int) -> None:
+        """Initialize the coalescer.
+
+        :param rp_client:  ReportPortal client or LogBuffer to send merged entries with
+        :param window:     maximum time span of merged entries in seconds
+        :param max_length: maximum length of a merged message
+        """
+        self.rp_client = rp_client
+        self.window = timedelta(seconds=window)
+        self.max_length = max_length
+        self._lock = threading.Lock()
+        self._entry = None
+
+    def current_item(self) -> Optional[str]:
+        """Return ID of the Test Item which is currently reported by the client."""
+        return self.rp_client.current_item()
+
+    def log(
+        self,
+        time: Any,
+        message: str,
+        level: Optional[Any] = None,
+        attachment: Optional[dict] = None,
+        item_id: Optional[str] = None,
+    ) -> None:
+        """Merge a log entry with the previous ones or start a new entry, same signature as the client's method."""
+        with self._lock:
+            entry = self._entry
+            if (
+                entry
+                and not attachment
+                and entry["level"] == level
+                and entry["item_id"] == item_id
+                and time - entry["time"] <= self.window
+            ):
+                # Room for the repeat counter of the last line is reserved, since it is added when the line is closed
+                if message == entry["lines"][-1]:
+                    if entry["length"] + len(self._repeat_suffix(entry["repeats"] + 1)) <= self.max_length:
+                        entry["repeats"] += 1
+                        return
+                elif (
+                    entry["length"] + len(self._repeat_suffix(entry["repeats"])) + len(message) + 1 <= self.max_length
+                ):
+                    self._close_line(entry)
+                    entry["lines"].append(message)
+                    entry["length"] += len(message) + 1
+                    return
+            self._send()
+            if attachment:
+                self.rp_client.log(time, message, level, attachment, item_id)
+                return
+            self._entry = {
+                "time": time,
+                "level": level,
+                "item_id": item_id,
+                "lines": [message],
+                "length": len(message),
+                "repeats": 1,
+            }
+
+    @staticmethod
+    def _repeat_suffix(repeats: int) -> str:
+        return f" [repeated {repeats} times]" if repeats > 1 else ""
+
+    def _close_line(self, entry: dict[str, Any]) -> None:
+        suffix = self._repeat_suffix(entry["repeats"])
+        entry["lines"][-1] += suffix
+        entry["length"] += len(suffix)
+        entry["repeats"] = 1
+
+    def _send(self) -> None:
+        entry = self._entry
+        if not entry:
+            return
+        self._entry = None
+        self._close_line(entry)
+        self.rp_client.log(entry["time"], "\n".join(entry["lines"]), entry["level"], None, entry["item_id"])
+
+    def flush(self) -> None:
+        """Send the pending merged entry."""
+        with self._lock:
+            self._send()
+
+
+class QueuedRPLogHandler(RPLogHandler):
+    """RPLogHandler, which only puts records into a queue, formatting and sending is done by the queue listener.
+
+    The client and the Test Item are resolved in the logging thread, since they are bound to it.
+    """
+
+    log_queue: "LogQueue"
+
+    def __init__(self, log_queue: "LogQueue", **kwargs: Any) -> None:
+        """Initialize the handler.
+
+        :param log_queue: queue to put records to
+        :param kwargs:    RPLogHandler arguments
+        """
+        super().__init__(**kwargs)
+        self.log_queue = log_queue
+
+    def emit(self, record: logging.LogRecord) -> None:
+        """Put the record into the queue.
+
+        :param record: a log Record of requests
+        """
+        rp_client = self.rp_client
+        if not rp_client:
+            rp_client = current()
+            if not rp_client:
+                rp_client = getattr(threading.current_thread(), "parent_rp_client", None)
+                if rp_client:
+                    set_current(rp_client)
+        if not rp_client:
+            return
+        # Arguments are merged right away, since they can be changed before the record is formatted
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        self.log_queue.put((self, record, rp_client, rp_client.current_item(), datetime.now(tz=timezone.utc)))
+
+    def prepare(self, record: logging.LogRecord) -> tuple[str, str, Optional[dict]]:
+        """Format the record.
+
+        :param record: a log Record of requests
+        :return: message, ReportPortal log level and attachment
+        """
+        msg = ""
+        # noinspection PyBroadException
+        try:
+            msg = self.format(record)
+        except (KeyboardInterrupt, SystemExit):
+            raise
+        except Exception:
+            self.handleError(record)
+        return msg, self._get_rp_log_level(record.levelno), record.__dict__.get("attachment", None)
+
+
+class LogQueue:
+    """Bounded queue of log records with a listener thread, which formats and sends them.
+
+    If the queue is full, the logging thread either waits, drops the oldest record or writes the record to a temporary
+    file. Once anything is written to the file, new records go there too until the file is sent. The file is sent by
+    a separate thread in the order of writing after the records of the queue, which the thread is woken up for.
+
+    The threaded asynchronous client accepts requests without waiting for the server, so the number of its unfinished
+    log requests can be limited. The listener waits for the oldest request above the limit, and new records pile up in
+    the queue instead, where the overflow policy applies. The batched asynchronous client can't be used with the queue,
+    so nothing here limits its unfinished requests.
+    """
+
+    overflow: LogQueueOverflow
+    max_pending: int
+    dropped: int
+    spilled: int
+    drained: int
+    spill_peak_bytes: int
+
+    def __init__(
+        self,
+        max_size: int,
+        overflow: LogQueueOverflow,
+        name: str = "rp-log-queue",
+        max_pending: int = 0,
+    ) -> None:
+        """Initialize the queue.
+
+        :param max_size:    maximum number of records in the queue
+        :param overflow:    what to do with a new record if the queue is full
+        :param name:        prefix of listener thread names
+        :param max_pending: maximum number of unfinished requests of an asynchronous client, 0 means no limit
+        """
+        self.overflow = overflow
+        self.max_pending = max_pending
+        self.dropped = 0
+        self.spilled = 0
+        self.drained = 0
+        self.spill_peak_bytes = 0
+        self._queue = queue.Queue(max_size)
+        self._stop_event = threading.Event()
+        # A single listener, since several ones would send records out of order
+        self._threads = [threading.Thread(target=self._listen, name=f"{name}-0", daemon=True)]
+        self._pending = deque()
+        self._pending_lock = threading.Lock()
+        if overflow is LogQueueOverflow.SPILL:
+            # The only thread which reads the file, so spilled records are sent in the order of writing
+            self._threads.append(threading.Thread(target=self._drain, name=f"{name}-spill", daemon=True))
+        self._spill_condition = threading.Condition()
+        self._spill_file = None
+        self._spill_refs = {}
+        # Number of spilled records which are not sent yet and number of them which are not read from the file yet
+        self._spill_size = 0
+        self._spill_unread = 0
+        self._spill_offset = 0
+
+    def start(self) -> None:
+        """Start the listener threads."""
+        for thread in self._threads:
+            thread.start()
+
+    def put(self, entry: tuple) -> None:
+        """Put a log entry into the queue applying the overflow policy.
+
+        :param entry: the handler, the record, the client, the Test Item ID and the time of the record
+        """
+        if self._stop_event.is_set():
+            # The listener is stopping or stopped, e.g. a background thread logs after the test loop
+            self._process(entry)
+            return
+        if self.overflow is LogQueueOverflow.BLOCK:
+            self._queue.put(entry)
+            return
+        if self.overflow is LogQueueOverflow.SPILL:
+            # The choice is made under the lock, so the drainer can't miss a record spilled after it checked the file
+            with self._spill_condition:
+                if not self._spill_size:
+                    try:
+                        self._queue.put_nowait(entry)
+                        return
+                    except queue.Full:
+                        pass
+                self._spill(entry)
+                self._spill_condition.notify_all()
+            return
+        while True:
+            try:
+                self._queue.put_nowait(entry)
+                return
+            except queue.Full:
+                pass
+            try:
+                self._queue.get_nowait()
+                self._queue.task_done()
+                self.dropped += 1
+            except queue.Empty:
+                pass
+
+    def _spill(self, entry: tuple) -> None:
+        # Called under the spill lock
+        handler, record, rp_client, item_id, time = entry
+        message, level, attachment = handler.prepare(record)
+        if not self._spill_file:
+            self._spill_file = tempfile.TemporaryFile(prefix="rp-log-queue-")
+        # Clients and Item IDs, which can be asynchronous Tasks, are kept in memory, only log data goes to the file
+        self._spill_refs[id(rp_client)] = rp_client
+        self._spill_refs[id(item_id)] = item_id
+        self._spill_file.seek(0, 2)
+        pickle.dump((id(rp_client), id(item_id), time, message, level, attachment), self._spill_file)
+        self.spill_peak_bytes = max(self.spill_peak_bytes, self._spill_file.tell())
+        self._spill_size += 1
+        self._spill_unread += 1
+        self.spilled += 1
+
+    def _read_spill(self) -> list[tuple]:
+        with self._spill_condition:
+            if not self._spill_unread:
+                return []
+            self._spill_file.seek(self._spill_offset)
+            chunk = [pickle.load(self._spill_file) for _ in range(min(self._spill_unread, self._queue.maxsize))]
+            refs = self._spill_refs
+            self._spill_unread -= len(chunk)
+            self.drained += len(chunk)
+            if self._spill_unread:
+                self._spill_offset = self._spill_file.tell()
+            else:
+                self._spill_file.seek(0)
+                self._spill_file.truncate()
+                self._spill_offset = 0
+                self._spill_refs = {}
+        return [(refs[client_id], refs[item_id], *log) for client_id, item_id, *log in chunk]
+
+    def _drain_spill(self) -> None:
+        # Records are sent outside the lock not to block logging threads, which spill new records meanwhile
+        entries = self._read_spill()
+        while entries:
+            for rp_client, item_id, time, message, level, attachment in entries:
+                try:
+                    self._send(rp_client, time, message, level, attachment, item_id)
+                except Exception:
+                    LOGGER.exception("Failed to send a log record")
+            with self._spill_condition:
+                # New records keep going to the file until the sent ones are counted, so they are not sent earlier
+                self._spill_size -= len(entries)
+                self._spill_condition.notify_all()
+            entries = self._read_spill()
+
+    def _drain(self) -> None:
+        while True:
+            with self._spill_condition:
+                self._spill_condition.wait_for(lambda: self._spill_size or self._stop_event.is_set())
+                if not self._spill_size:
+                    break
+            # Spilled records follow the queued ones, and no records are queued while the file is not sent
+            self._queue.join()
+            self._drain_spill()
+
+    def _send(
+        self, rp_client: RP, time: datetime, message: str, level: str, attachment: Optional[dict], item_id: Any
+    ) -> None:
+        result = rp_client.log(time, message, level=level, attachment=attachment, item_id=item_id)
+        if not self.max_pending or not isinstance(result, Task):
+            return
+        with self._pending_lock:
+            self._pending.append(result)
+            while self._pending and self._pending[0].done():
+                self._pending.popleft()
+            overdue = [self._pending.popleft() for _ in range(len(self._pending) - self.max_pending)]
+        for task in overdue:
+            task.blocking_result()
+
+    def _process(self, entry: tuple) -> None:
+        handler, record, rp_client, item_id, time = entry
+        message, level, attachment = handler.prepare(record)
+        self._send(rp_client, time, message, level, attachment, item_id)
+
+    def _listen(self) -> None:
+        # There is no stop sentinel in the queue, since a logging thread could drop it with the oldest records
+        while True:
+            try:
+                entry = self._queue.get(timeout=STOP_CHECK_INTERVAL)
+            except queue.Empty:
+                if self._stop_event.is_set():
+                    break
+                continue
+            try:
+                self._process(entry)
+            except Exception:
+                LOGGER.exception("Failed to send a log record")
+            finally:
+                self._queue.task_done()
+
+    def flush(self) -> None:
+        """Wait until all records put into the queue so far are sent."""
+        self._queue.join()
+        with self._spill_condition:
+            self._spill_condition.wait_for(lambda: not self._spill_size)
+
+    def stop(self) -> None:
+        """Send all remaining records, stop the listener threads and log overflow statistics."""
+        self._stop_event.set()
+        with self._spill_condition:
+            self._spill_condition.notify_all()
+        for thread in self._threads:
+            thread.join()
+        # Records which were put while the listener was exiting
+        while True:
+            try:
+                entry = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                self._process(entry)
+            except Exception:
+                LOGGER.exception("Failed to send a log record")
+            finally:
+                self._queue.task_done()
+        self._drain_spill()
+        for task in self._pending:
+            task.blocking_result()
+        self._pending.clear()
+        if self._spill_file:
+            self._spill_file.close()
+        if self.dropped or self.spilled:
+            LOGGER.warning(
+                "Log queue overflowed: %d log records were dropped, %d were written to disk and %d of them were read "
+                "back, the disk file peaked at %d bytes",
+                self.dropped,
+                self.spilled,
+                self.drained,
+                self.spill_peak_bytes,
+            )
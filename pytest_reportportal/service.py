@@ -13,28 +13,38 @@
 
 """This module includes Service functions for work with pytest agent."""
 
+import gzip
+import hashlib
 import logging
 import os.path
 import re
 import sys
+import tempfile
 import threading
 import traceback
 from collections import OrderedDict
+from concurrent.futures import Future
 from datetime import datetime, timezone
 from enum import Enum
-from functools import wraps
+from functools import lru_cache, wraps
 from os import curdir
 from time import sleep, time
 from typing import Any, Callable, Generator, Optional, Union
 
 from _pytest.doctest import DoctestItem
+from _pytest.runner import CallInfo
 from py.path import local
-from pytest import Class, Function, Item, Module, Package, Session
+from pytest import Class, ExceptionInfo, Function, Item, Module, Package, Session
 from reportportal_client.aio import Task
 from reportportal_client.core.rp_issues import ExternalIssue, Issue
 from reportportal_client.helpers import markdown_helpers
 
-from .config import AgentConfig
+from .circuit_breaker import CircuitBreakerClient
+from .config import AgentConfig, BddStepsMode, LogUploadPolicy
+from .failure_signatures import FailureSignatures
+from .rate_limit import create_rate_limiter, mount_rate_limit
+from .retries import mount_retry_policy
+from .rp_logging import LogBuffer
 
 try:
     # noinspection PyProtectedMember
@@ -75,8 +85,14 @@ try:
 except ImportError:
     Rule = type("dummy", (), {})  # Old pytest-bdd versions do not have Rule
 
-from reportportal_client import RP, OutputType, create_client
-from reportportal_client.helpers import dict_to_payload, gen_attributes, get_launch_sys_attrs, get_package_version
+from reportportal_client import RP, ClientType, OutputType, create_client, set_current
+from reportportal_client.helpers import (
+    TRUNCATE_REPLACEMENT,
+    dict_to_payload,
+    gen_attributes,
+    get_launch_sys_attrs,
+    get_package_version,
+)
 
 LOGGER = logging.getLogger(__name__)
 
@@ -90,6 +106,25 @@ ISSUE_DESCRIPTION_ID_TEMPLATE: str = " {issue_id}"
 PYTHON_REPLACE_REGEX = re.compile(r"\W")
 ALPHA_REGEX = re.compile(r"^\d+_*")
 BACKGROUND_STEP_NAME = "Background"
+BDD_SCENARIO_MODULE_PATH: str = os.path.join("pytest_bdd", "scenario.py")
+DESCRIPTION_CACHE_SIZE: int = 4096
+ADDRESS_REGEX = re.compile(r"0x[0-9a-fA-F]+")
+TMP_PATH_REGEX = re.compile(re.escape(tempfile.gettempdir()) + r"[^\s'\"):]*")
+NODE_PARAMETERS_REGEX = re.compile(r"(\w)\[[^\]\s]*\]")
+FAILURE_SIGNATURE_LENGTH: int = 12
+FAILURE_SIGNATURE_ATTRIBUTE: str = "failure_signature"
+EVICTED_LEAF_KEYS: tuple[str, ...] = (
+    "name",
+    "description",
+    "parameters",
+    "parameters_indices",
+    "code_ref",
+    "test_case_id",
+    "issue",
+    "attributes",
+    "start_time",
+    "failure_signature",
+)
 
 
 def _is_pytest_bdd_scenario(location_path: str) -> bool:
@@ -99,7 +134,25 @@ def _is_pytest_bdd_scenario(location_path: str) -> bool:
     ``Item.location[0]`` uses OS-native separators (backslashes on Windows), so a
     plain suffix check with ``/`` is not portable. See #418.
     """
-    return location_path.endswith(os.path.join("pytest_bdd", "scenario.py"))
+    return location_path.endswith(BDD_SCENARIO_MODULE_PATH)
+
+
+def _get_bdd_item_base_name(item_name: str) -> str:
+    """Strip example parameters from pytest-bdd scenario item name.
+
+    :param item_name: pytest.Item name
+    :return: scenario python name
+    """
+    return item_name.split("[", 1)[0]
+
+
+def _get_step_key(step: Step) -> tuple[str, str, int]:
+    """Get the key which identifies pytest-bdd step within its feature.
+
+    :param step: pytest_bdd.Step
+    :return: step keyword, name and line number
+    """
+    return step.keyword, step.name, step.line_number
 
 
 def trim_docstring(docstring: str) -> str:
@@ -134,6 +187,64 @@ def trim_docstring(docstring: str) -> str:
     return "\n".join(trimmed)
 
 
+@lru_cache(maxsize=DESCRIPTION_CACHE_SIZE)
+def _trim_docstring_cached(code: Any, docstring: str) -> str:
+    """
+    Convert docstring and memoize the result.
+
+    :param code:      code object (or the object itself if it has no code) the docstring belongs to, used as cache key
+    :param docstring: input docstring
+    :return: trimmed docstring
+    """
+    return trim_docstring(docstring)
+
+
+def get_failure_signature(traceback_text: str, parameters: Optional[dict[str, Any]] = None) -> str:
+    """Calculate a signature of a failure, which is equal for failures with the same cause.
+
+    Memory addresses, temporary paths and test parameter values are stripped before hashing.
+
+    :param traceback_text: failure traceback
+    :param parameters:     parameters of the failed test
+    :return: failure signature
+    """
+    normalized = ADDRESS_REGEX.sub("0x?", traceback_text)
+    normalized = TMP_PATH_REGEX.sub("<tmp>", normalized)
+    normalized = NODE_PARAMETERS_REGEX.sub(r"\1[?]", normalized)
+    if parameters:
+        value_regex = re.compile(
+            "|".join(r"(?<![\w.])" + re.escape(repr(value)) + r"(?![\w.])" for value in parameters.values())
+        )
+        # Source code lines, which start with indentation or the ">" marker, are the same for all parameters
+        normalized = "\n".join(
+            line if line.startswith((" ", ">")) else value_regex.sub("<param>", line)
+            for line in normalized.splitlines()
+        )
+    return hashlib.sha1(normalized.encode("utf-8")).hexdigest()[:FAILURE_SIGNATURE_LENGTH]
+
+
+def truncate_middle(text: str, max_bytes: int) -> str:
+    """Cut the middle of a text to fit it into the given number of UTF-8 encoded bytes.
+
+    :param text:      text to truncate
+    :param max_bytes: maximum size of the result, 0 or less means no limit
+    :return: the same text object if it fits, truncated text otherwise
+    """
+    if max_bytes <= 0 or len(text) * 4 <= max_bytes:
+        return text
+    data = text.encode("utf-8")
+    if len(data) <= max_bytes:
+        return text
+    marker = "\n... {} bytes truncated ...\n"
+    budget = max_bytes - len(marker.format(len(data)).encode("utf-8"))
+    if budget <= 0:
+        # Not even the marker fits, so it is cut too
+        return marker.format(len(data))[:max_bytes]
+    head = data[: budget // 2 + budget % 2].decode("utf-8", errors="ignore")
+    tail = data[len(data) - budget // 2 :].decode("utf-8", errors="ignore") if budget > 1 else ""
+    return head + marker.format(len(data) - budget) + tail
+
+
 class LeafType(Enum):
     """This class stores test item path types."""
 
@@ -145,6 +256,24 @@ class LeafType(Enum):
     NESTED = 6
 
 
+class ItemKind(Enum):
+    """This class stores pytest item kinds which require different reporting handling."""
+
+    REGULAR = 1
+    BDD_SCENARIO = 2
+
+
+def _get_item_kind(item: Item) -> ItemKind:
+    """Resolve the kind of the given pytest item.
+
+    :param item: pytest.Item
+    :return: the item kind
+    """
+    if PYTEST_BDD and _is_pytest_bdd_scenario(item.location[0]):
+        return ItemKind.BDD_SCENARIO
+    return ItemKind.REGULAR
+
+
 class ExecStatus(Enum):
     """This class stores test item path types."""
 
@@ -172,36 +301,69 @@ class PyTestService:
     _config: AgentConfig
     _issue_types: dict[str, str]
     _tree_path: dict[Any, list[dict[str, Any]]]
+    _item_kinds: dict[Item, ItemKind]
+    _lazy_tree: Optional[dict[str, Any]]
+    _lazy_suites: dict[Any, dict[str, Any]]
+    _lazy_parent_paths: dict[Any, tuple[list[dict[str, Any]], LeafType, str]]
     _bdd_tree: Optional[dict[str, Any]]
     _bdd_item_by_name: dict[str, Item]
+    _bdd_item_names_by_base_name: dict[str, list[str]]
+    _bdd_feature_indexes: dict[Feature, dict[str, Any]]
+    _bdd_template_metadata: dict[ScenarioTemplate, dict[str, Any]]
     _bdd_scenario_by_item: dict[Item, Scenario]
     _bdd_item_by_scenario: dict[Scenario, Item]
+    _bdd_reported_backgrounds: set[Background]
     _start_tracker: set[str]
+    _fixture_steps: dict[str, list[dict[str, Any]]]
+    _log_buffers: dict[Item, LogBuffer]
+    _passed_items_root: Optional[dict[str, Any]]
+    _failure_signatures: FailureSignatures
     _launch_id: Optional[str]
+    _launch_future: Optional[Future]
     agent_name: str
     agent_version: str
     ignored_attributes: list[str]
     parent_item_id: Optional[str]
     rp: Optional[RP]
     project_settings: Union[dict[str, Any], Task]
+    rate_limit_file: Optional[str]
+    rate_limit_share: int
+    failure_signature_file: Optional[str]
 
     def __init__(self, agent_config: AgentConfig) -> None:
         """Initialize instance attributes."""
         self._config = agent_config
         self._issue_types = {}
         self._tree_path = {}
+        self._item_kinds = {}
+        self._lazy_tree = None
+        self._lazy_suites = {}
+        self._lazy_parent_paths = {}
         self._bdd_tree = None
         self._bdd_item_by_name = OrderedDict()
+        self._bdd_item_names_by_base_name = {}
+        self._bdd_feature_indexes = {}
+        self._bdd_template_metadata = {}
         self._bdd_scenario_by_item = {}
         self._bdd_item_by_scenario = {}
+        self._bdd_reported_backgrounds = set()
         self._start_tracker = set()
+        self._fixture_steps = {}
+        self._log_buffers = {}
+        self._passed_items_root = None
+        self._failure_signatures = FailureSignatures()
         self._launch_id = None
+        self._launch_future = None
         self.agent_name = "pytest-reportportal"
         self.agent_version = get_package_version(self.agent_name) or "None"
         self.ignored_attributes = []
         self.parent_item_id = None
         self.rp = None
         self.project_settings = {}
+        self.rate_limit_file = None
+        self.rate_limit_share = 1
+        self.failure_signature_file = None
+        self._rate_limiter = None
 
     @property
     def issue_types(self) -> dict[str, str]:
@@ -311,25 +473,45 @@ class PyTestService:
         :param session: pytest.Session object of the current execution
         :return: a tree of all tests and their suites
         """
-        test_tree = self._create_leaf(LeafType.ROOT, None, None, item_id=self.parent_item_id)
+        return self._build_items_tree(session.items)
 
-        for item in session.items:
-            dir_path = self._get_item_dirs(item)
-            class_path = self._get_tree_path(item)
+    def _build_items_tree(self, items: list[Item]) -> dict[str, Any]:
+        """Construct a tree of the given tests and their suites.
+
+        :param items: list of pytest.Item
+        :return: a tree of the tests and their suites
+        """
+        test_tree = self._create_leaf(LeafType.ROOT, None, None, item_id=self.parent_item_id)
+        # Items of the same parent share the whole path except themselves, so it is resolved once per parent
+        parent_leafs: dict[Any, tuple[dict[str, Any], LeafType]] = {}
 
-            current_leaf = test_tree
-            for i, leaf in enumerate(dir_path + class_path):
-                children_leafs = current_leaf["children"]
+        for item in items:
+            parent = item.parent
+            if parent not in parent_leafs:
+                dir_path = self._get_item_dirs(item)
+                class_path = self._get_tree_path(item)
 
+                current_leaf = test_tree
                 leaf_type = LeafType.DIR
-                if i == len(dir_path):
-                    leaf_type = LeafType.FILE
-                if i > len(dir_path):
-                    leaf_type = LeafType.CODE
-
-                if leaf not in children_leafs:
-                    children_leafs[leaf] = self._create_leaf(leaf_type, current_leaf, leaf)
-                current_leaf = children_leafs[leaf]
+                for i, leaf in enumerate(dir_path + class_path):
+                    leaf_type = LeafType.DIR
+                    if i == len(dir_path):
+                        leaf_type = LeafType.FILE
+                    if i > len(dir_path):
+                        leaf_type = LeafType.CODE
+                    if leaf is item:
+                        break
+
+                    children_leafs = current_leaf["children"]
+                    if leaf not in children_leafs:
+                        children_leafs[leaf] = self._create_leaf(leaf_type, current_leaf, leaf)
+                    current_leaf = children_leafs[leaf]
+                parent_leafs[parent] = (current_leaf, leaf_type)
+
+            parent_leaf, leaf_type = parent_leafs[parent]
+            children_leafs = parent_leaf["children"]
+            if item not in children_leafs:
+                children_leafs[item] = self._create_leaf(leaf_type, parent_leaf, item)
         return test_tree
 
     def _remove_root_dirs(self, test_tree: dict[str, Any], max_dir_level: int, dir_level: int = 0) -> None:
@@ -363,14 +545,77 @@ class PyTestService:
                 child_leaf["parent"] = parent_leaf
                 self._remove_file_names(child_leaf)
 
+    def _get_feature_index(self, feature: Feature) -> dict[str, Any]:
+        """Get lookup indexes of the given feature, build them on the first call.
+
+        :param feature: pytest_bdd.Feature
+        :return: scenario templates by line number and background step keys of the feature
+        """
+        feature_index = self._bdd_feature_indexes.get(feature, None)
+        if feature_index is None:
+            templates = {}
+            for template in feature.scenarios.values():
+                templates.setdefault(template.line_number, template)
+            background_steps = set()
+            if feature.background:
+                background_steps = {_get_step_key(step) for step in feature.background.steps}
+            feature_index = {"templates": templates, "background_steps": background_steps}
+            self._bdd_feature_indexes[feature] = feature_index
+        return feature_index
+
+    def _get_template_metadata(self, template: ScenarioTemplate) -> dict[str, Any]:
+        """Get metadata shared by all scenarios of the given template, build it on the first call.
+
+        Metadata of every example row is precomputed at once, so large Scenario Outlines do not pay template-level
+        work for each row.
+
+        :param template: pytest_bdd.ScenarioTemplate
+        :return: code reference prefix, example tags and example row metadata of the template
+        """
+        template_metadata = self._bdd_template_metadata.get(template, None)
+        if template_metadata is None:
+            code_ref_prefix = template.feature.rel_filename + "/"
+            rule = getattr(template, "rule", None)
+            if rule:
+                code_ref_prefix += f"[RULE:{rule.name}]/"
+            examples = []
+            if template.templated:
+                if isinstance(template.examples, list):
+                    examples.extend(template.examples)
+                elif template.examples:
+                    examples.append(template.examples)
+            example_tags = []
+            for example in examples:
+                example_tags.extend(getattr(example, "tags", []))
+            template_metadata = {"code_ref_prefix": code_ref_prefix, "example_tags": example_tags, "rows": {}}
+            self._bdd_template_metadata[template] = template_metadata
+            for example in examples:
+                for context in example.as_contexts():
+                    self._get_example_row_metadata(template, context)
+        return template_metadata
+
+    def _get_example_row_metadata(self, template: ScenarioTemplate, parameters: dict[str, str]) -> dict[str, str]:
+        """Get metadata of Scenario Outline example row.
+
+        :param template:   pytest_bdd.ScenarioTemplate
+        :param parameters: example row parameters
+        :return: parameter string for code reference and Test Case ID and parameter table for description
+        """
+        rows = self._get_template_metadata(template)["rows"]
+        row_key = tuple(parameters.items())
+        row_metadata = rows.get(row_key, None)
+        if row_metadata is None:
+            parameters_str = ";".join([f"{k}:{v}" for k, v in sorted(parameters.items())])
+            row_metadata = {
+                "parameters_str": f"[{parameters_str}]" if parameters_str else "",
+                "parameters_table": f"Parameters:\n\n{markdown_helpers.format_data_table_dict(parameters)}",
+            }
+            rows[row_key] = row_metadata
+        return row_metadata
+
     def _get_scenario_template(self, scenario: Scenario) -> Optional[ScenarioTemplate]:
-        line_num = scenario.line_number
-        feature = scenario.feature
-        scenario_template = None
-        for template in feature.scenarios.values():
-            if template.line_number == line_num:
-                scenario_template = template
-                break
+        templates = self._get_feature_index(scenario.feature)["templates"]
+        scenario_template = templates.get(scenario.line_number, None)
         if scenario_template and isinstance(scenario_template, ScenarioTemplate):
             return scenario_template
         return None
@@ -485,8 +730,19 @@ class PyTestService:
 
         :param session: pytest.Session
         """
+        if self._config.rp_lazy_item_paths:
+            # Item paths are resolved on item start, see _resolve_item_path
+            self._lazy_tree = self._create_lazy_tree()
+            return
+
         # Create a test tree to be able to apply mutations
         test_tree = self._build_test_tree(session)
+        self._transform_test_tree(test_tree)
+        self._build_item_paths(test_tree, [])
+        for item in session.items:
+            self._item_kinds[item] = _get_item_kind(item)
+
+    def _transform_test_tree(self, test_tree: dict[str, Any]) -> None:
         self._remove_root_dirs(test_tree, self._config.rp_dir_level)
         self._remove_file_names(test_tree)
         self._generate_names(test_tree)
@@ -494,7 +750,63 @@ class PyTestService:
             self._merge_dirs(test_tree)
         if not self._config.rp_hierarchy_code:
             self._merge_code(test_tree)
-        self._build_item_paths(test_tree, [])
+
+    def _create_lazy_tree(self) -> dict[str, Any]:
+        root_leaf = self._create_leaf(LeafType.ROOT, None, None, item_id=self.parent_item_id)
+        self._generate_names(root_leaf)
+        return root_leaf
+
+    def _resolve_item_path(self, item: Item) -> None:
+        """Resolve the test tree path of a single item and attach it to the lazily built tree.
+
+        Tree mutations depend only on the path of an item, so the path is built and transformed for the first item of
+        each parent node, suite leaves are shared by all items under them.
+
+        :param item: pytest.Item
+        """
+        root_leaf = self._lazy_tree
+        if root_leaf is None:
+            self._lazy_tree = root_leaf = self._create_lazy_tree()
+        self._lock(root_leaf, lambda r: self._attach_item_path(r, item))
+
+    def _attach_item_path(self, root_leaf: dict[str, Any], item: Item) -> None:
+        parent_path = self._lazy_parent_paths.get(item.parent, None)
+        if parent_path is None:
+            test_tree = self._build_items_tree([item])
+            self._transform_test_tree(test_tree)
+            path = [root_leaf]
+            leaf = test_tree
+            while leaf["children"]:
+                leaf = next(iter(leaf["children"].values()))
+                if leaf["item"] is item:
+                    break
+                suite_leaf = self._lazy_suites.get(leaf["item"], None)
+                if suite_leaf is None:
+                    suite_leaf = self._lazy_suites[leaf["item"]] = leaf
+                    suite_leaf["parent"] = path[-1]
+                    path[-1]["children"][leaf["item"]] = suite_leaf
+                path.append(suite_leaf)
+            name_prefix = leaf["name"][: len(leaf["name"]) - len(item.name)]
+            parent_path = self._lazy_parent_paths[item.parent] = (path, leaf["type"], name_prefix)
+
+        path, leaf_type, name_prefix = parent_path
+        item_leaf = self._create_leaf(leaf_type, path[-1], item)
+        item_leaf["name"] = name_prefix + item.name
+        path[-1]["children"][item] = item_leaf
+        self._tree_path[item] = path + [item_leaf]
+
+    def _get_kind(self, item: Item) -> ItemKind:
+        """Get the kind of the given pytest item resolved at collection.
+
+        Items which were not collected by the service are classified and cached on the first call.
+
+        :param item: pytest.Item
+        :return: the item kind
+        """
+        kind = self._item_kinds.get(item)
+        if kind is None:
+            kind = self._item_kinds[item] = _get_item_kind(item)
+        return kind
 
     def _get_item_description(self, test_item: Any) -> Optional[str]:
         """Get description of item.
@@ -504,9 +816,10 @@ class PyTestService:
         """
         if isinstance(test_item, (Class, Function, Module, Item)):
             if hasattr(test_item, "obj"):
-                doc = test_item.obj.__doc__
+                obj = test_item.obj
+                doc = obj.__doc__
                 if doc is not None:
-                    return trim_docstring(doc)
+                    return _trim_docstring_cached(getattr(obj, "__code__", obj), doc)
         if isinstance(test_item, DoctestItem):
             return test_item.reportinfo()[2]
         if isinstance(test_item, (Feature, Rule)):
@@ -514,6 +827,22 @@ class PyTestService:
             if description:
                 return description.lstrip()  # There is a bug in pytest-bdd that adds an extra space
 
+    def _limit_description(self, description: Optional[str]) -> Optional[str]:
+        """Truncate or skip description which exceeds the configured length limit.
+
+        :param description: item description
+        :return: description which fits the limit
+        """
+        max_length = self._config.rp_description_max_length
+        if not description or max_length <= 0 or len(description) <= max_length:
+            return description
+        if self._config.rp_description_skip_oversized:
+            return None
+        truncation_length = len(TRUNCATE_REPLACEMENT)
+        if max_length <= truncation_length:
+            return description[:max_length]
+        return description[: max_length - truncation_length] + TRUNCATE_REPLACEMENT
+
     def _lock(self, leaf: dict[str, Any], func: Callable[[dict[str, Any]], Any]) -> Any:
         """
         Lock test tree leaf and execute a function, bypass the leaf to it.
@@ -535,13 +864,7 @@ class PyTestService:
             tags.extend(test_attributes if test_attributes else [])
             template = self._get_scenario_template(item)
             if template and template.templated:
-                examples = []
-                if isinstance(template.examples, list):
-                    examples.extend(template.examples)
-                else:
-                    examples.append(template.examples)
-                for example in examples:
-                    tags.extend(getattr(example, "tags", []))
+                tags.extend(self._get_template_metadata(template)["example_tags"])
         return gen_attributes(tags)
 
     def _get_suite_code_ref(self, leaf: dict[str, Any]) -> str:
@@ -565,7 +888,7 @@ class PyTestService:
         item = leaf["item"]
         payload = {
             "name": leaf["name"],
-            "description": self._get_item_description(item),
+            "description": self._limit_description(self._get_item_description(item)),
             "start_time": datetime.now(tz=timezone.utc),
             "item_type": "SUITE",
             "code_ref": code_ref,
@@ -861,13 +1184,15 @@ class PyTestService:
         """
         item = leaf["item"]
         leaf["attributes"] = self._process_attributes(item)
+        if leaf.get("failure_signature"):
+            leaf["attributes"].append(self._to_attribute((FAILURE_SIGNATURE_ATTRIBUTE, leaf["failure_signature"])))
         leaf["issue"] = self._process_issue(item)
 
     def _build_start_step_rq(self, leaf: dict[str, Any]) -> dict[str, Any]:
         payload = {
             "attributes": leaf.get("attributes", None),
             "name": leaf["name"],
-            "description": leaf["description"],
+            "description": self._limit_description(leaf["description"]),
             "start_time": datetime.now(tz=timezone.utc),
             "item_type": "STEP",
             "code_ref": leaf.get("code_ref", None),
@@ -901,33 +1226,53 @@ class PyTestService:
         if not self.__started():
             self.start()
 
-        if PYTEST_BDD and _is_pytest_bdd_scenario(test_item.location[0]):
+        if self._config.rp_lazy_item_paths and test_item not in self._tree_path:
+            self._resolve_item_path(test_item)
+
+        if self._get_kind(test_item) is ItemKind.BDD_SCENARIO:
             self._bdd_item_by_name[test_item.name] = test_item
+            base_name = _get_bdd_item_base_name(test_item.name)
+            self._bdd_item_names_by_base_name.setdefault(base_name, []).append(test_item.name)
             return
 
         self._create_suite_path(test_item)
         current_leaf = self._tree_path[test_item][-1]
         self._process_metadata_item_start(current_leaf)
-        item_id = self._start_step(self._build_start_step_rq(current_leaf))
-        current_leaf["item_id"] = item_id
+        if self._config.rp_aggregate_passed and self._lock(current_leaf["parent"], lambda p: p["item_id"]):
+            # The item is started on its finish only if it did not pass, passed items are summarized by their suite.
+            # Items without a parent are reported as usual, since there is no suite to put the summary to.
+            current_leaf["start_time"] = datetime.now(tz=timezone.utc)
+            current_leaf["deferred"] = True
+        else:
+            current_leaf["item_id"] = self._start_step(self._build_start_step_rq(current_leaf))
         current_leaf["exec"] = ExecStatus.IN_PROGRESS
 
-    def process_results(self, test_item: Item, report):
+    def process_results(self, test_item: Item, report, call: Optional[CallInfo] = None):
         """
         Save test item results after execution.
 
         :param test_item: pytest.Item
         :param report:    pytest's result report
+        :param call:      pytest's call information of the reported phase, used to render the failure traceback
         """
+        signature = None
         if report.longrepr:
-            self.post_log(test_item, report.longreprtext, log_level="ERROR")
+            if report.failed:
+                signature = self._post_failure_log(test_item, report, call)
+            else:
+                self.post_log(test_item, report.longreprtext, log_level="ERROR")
 
-        if PYTEST_BDD and _is_pytest_bdd_scenario(test_item.location[0]):
+        if self._get_kind(test_item) is ItemKind.BDD_SCENARIO:
             return
 
         leaf = self._tree_path[test_item][-1]
+        if signature and self._config.rp_failure_signature_attribute:
+            leaf["failure_signature"] = signature
         # Defining test result
         if report.when == "setup":
+            if leaf.get("status"):
+                # The item was already run in the same session, e.g. by a rerun plugin
+                leaf["rerun"] = True
             leaf["status"] = "PASSED"
 
         if report.failed:
@@ -938,6 +1283,64 @@ class PyTestService:
             if leaf["status"] in (None, "PASSED"):
                 leaf["status"] = "SKIPPED"
 
+    def _render_traceback(self, test_item: Item, report, call: Optional[CallInfo]) -> str:
+        """Render the failure traceback in the configured style.
+
+        :param test_item: pytest.Item
+        :param report:    pytest's result report
+        :param call:      pytest's call information of the reported phase
+        :return: failure traceback
+        """
+        style = self._config.rp_traceback_style
+        if not style or not call or not call.excinfo or not isinstance(test_item, Function):
+            return report.longreprtext
+        # A copy, since the original exception info can be used by other plugins
+        excinfo = ExceptionInfo.from_exc_info((call.excinfo.type, call.excinfo.value, call.excinfo.tb))
+        # Frames of pytest itself are cut, as pytest does for its own report
+        excinfo.traceback = excinfo.traceback.cut(path=test_item.path)
+        return str(excinfo.getrepr(style=style, showlocals=test_item.config.getoption("showlocals", False)))
+
+    def _post_failure_log(self, test_item: Item, report, call: Optional[CallInfo]) -> Optional[str]:
+        """Send the failure traceback, or only its signature if the same failure was already sent in this launch.
+
+        :param test_item: pytest.Item
+        :param report:    pytest's result report
+        :param call:      pytest's call information of the reported phase
+        :return: failure signature if it is configured to be calculated
+        """
+        traceback_text = self._render_traceback(test_item, report, call)
+        signature = None
+        if self._config.rp_failure_dedup or self._config.rp_failure_signature_attribute:
+            signature = get_failure_signature(traceback_text, self._get_parameters(test_item))
+
+        message_prefix = ""
+        if self._config.rp_failure_dedup:
+            first_node_id = self._failure_signatures.setdefault(signature, test_item.nodeid)
+            if first_node_id != test_item.nodeid:
+                message = f"Failure signature: {signature}, the same failure traceback is reported for {first_node_id}"
+                self.post_log(test_item, message, log_level="ERROR")
+                return signature
+            message_prefix = f"Failure signature: {signature}\n"
+
+        max_bytes = self._config.rp_traceback_max_bytes
+        if max_bytes > 0 and message_prefix:
+            # The prefix is a part of the posted message, so it takes from the same size limit
+            prefix_bytes = len(message_prefix.encode("utf-8"))
+            if prefix_bytes < max_bytes:
+                max_bytes -= prefix_bytes
+            else:
+                message_prefix = ""
+        message = truncate_middle(traceback_text, max_bytes)
+        attachment = None
+        if message is not traceback_text and self._config.rp_traceback_attach_full:
+            attachment = {
+                "name": "traceback.txt.gz",
+                "data": gzip.compress(traceback_text.encode("utf-8")),
+                "mime": "application/gzip",
+            }
+        self.post_log(test_item, message_prefix + message, log_level="ERROR", attachment=attachment)
+        return signature
+
     def _build_finish_step_rq(self, leaf: dict[str, Any]) -> dict[str, Any]:
         issue = leaf.get("issue", None)
         status = leaf.get("status", "PASSED")
@@ -970,8 +1373,12 @@ class PyTestService:
         if leaf.get("exec", ExecStatus.FINISHED) == ExecStatus.FINISHED:
             return
 
+        self._report_passed_items(leaf)
         self._finish_suite(self._build_finish_suite_rq(leaf))
         leaf["exec"] = ExecStatus.FINISHED
+        if self._config.rp_evict_finished_items:
+            # Replace, not clear, since sibling threads may iterate the children at the moment
+            leaf["children"] = {}
 
     def _finish_parents(self, leaf: dict[str, Any]) -> None:
         if (
@@ -1005,13 +1412,114 @@ class PyTestService:
         leaf = self._tree_path[test_item][-1]
         self._process_metadata_item_finish(leaf)
 
-        if PYTEST_BDD and _is_pytest_bdd_scenario(test_item.location[0]):
+        if self._get_kind(test_item) is ItemKind.BDD_SCENARIO:
             del self._bdd_item_by_name[test_item.name]
+            base_name = _get_bdd_item_base_name(test_item.name)
+            same_item_names = self._bdd_item_names_by_base_name.get(base_name, [])
+            if test_item.name in same_item_names:
+                same_item_names.remove(test_item.name)
+            if not same_item_names:
+                self._bdd_item_names_by_base_name.pop(base_name, None)
+            scenario = self._bdd_scenario_by_item.get(test_item, None)
+            if scenario:
+                self._flush_log_buffer(test_item, self._tree_path[scenario][-1])
+                self._report_buffered_fixtures(self._tree_path[scenario][-1]["item_id"])
+            self._log_buffers.pop(test_item, None)
             return
 
-        self._finish_step(self._build_finish_step_rq(leaf))
+        if leaf.get("deferred"):
+            if leaf.get("status", "PASSED") == "PASSED" and not leaf.get("rerun"):
+                self._aggregate_passed_item(test_item, leaf)
+            else:
+                start_rq = self._build_start_step_rq(leaf)
+                start_rq["start_time"] = leaf["start_time"]
+                leaf["item_id"] = self._start_step(start_rq)
+        if leaf["item_id"]:
+            self._flush_log_buffer(test_item, leaf)
+            self._report_buffered_fixtures(leaf["item_id"])
+            self._finish_step(self._build_finish_step_rq(leaf))
         leaf["exec"] = ExecStatus.FINISHED
-        self._finish_parents(leaf)
+        if not self._config.rp_lazy_item_paths:
+            # Lazily built suites do not know all their items, so they are finished at the end of the session
+            self._finish_parents(leaf)
+        if self._config.rp_evict_finished_items:
+            self._evict_item(test_item, leaf)
+
+    def create_log_buffer(self, test_item: Item) -> Optional[LogBuffer]:
+        """Create a buffer for logs of the given item if they should not be sent right away.
+
+        :param test_item: pytest.Item
+        :return: the item's log buffer or None if logs should be sent right away
+        """
+        if not self.rp:
+            return None
+        deferred = self._tree_path[test_item][-1].get("deferred")
+        if self._config.rp_log_upload_policy is LogUploadPolicy.ALWAYS and not deferred:
+            return None
+        log_buffer = LogBuffer(self.rp, self._config.rp_log_buffer_size)
+        self._log_buffers[test_item] = log_buffer
+        return log_buffer
+
+    def _flush_log_buffer(self, test_item: Item, leaf: dict[str, Any]) -> None:
+        """Send buffered logs of the given item if its result calls for it, discard them otherwise.
+
+        :param test_item: pytest.Item
+        :param leaf:      the leaf which holds the item's status
+        """
+        log_buffer = self._log_buffers.pop(test_item, None)
+        if not log_buffer:
+            return
+        policy = self._config.rp_log_upload_policy
+        if (
+            policy is LogUploadPolicy.ALWAYS
+            or leaf.get("status") == "FAILED"
+            or (policy is LogUploadPolicy.ON_FAILURE_OR_RERUN and leaf.get("rerun"))
+        ):
+            # Items started on their finish get all their logs, since there was no item to attach them to before
+            log_buffer.flush(leaf["item_id"] if leaf.get("deferred") else None)
+
+    def _aggregate_passed_item(self, test_item: Item, leaf: dict[str, Any]) -> None:
+        """Add a passed item to the summary of its suite instead of reporting it.
+
+        :param test_item: pytest.Item
+        :param leaf:      the item's leaf
+        """
+        self._log_buffers.pop(test_item, None)
+        self._fixture_steps.pop(self.__unique_id(), None)
+        duration = (datetime.now(tz=timezone.utc) - leaf["start_time"]).total_seconds()
+        parent = leaf["parent"]
+        if parent["type"] is LeafType.ROOT:
+            # The root is not finished as suites are, so its summary is sent on the session finish
+            self._passed_items_root = parent
+        self._lock(parent, lambda p: p.setdefault("passed_items", []).append((leaf["name"], duration)))
+
+    def _report_passed_items(self, leaf: dict[str, Any]) -> None:
+        """Send the summary of passed items aggregated in the given suite.
+
+        :param leaf: the suite's leaf
+        """
+        passed_items = leaf.pop("passed_items", None)
+        if not passed_items or not leaf["item_id"]:
+            return
+        total_duration = sum(duration for _, duration in passed_items)
+        listing = "\n".join(f"{duration:.3f}s {name}" for name, duration in passed_items)
+        attachment = {"name": "passed_tests.txt", "data": listing.encode("utf-8"), "mime": "text/plain"}
+        message = f"{len(passed_items)} tests passed in {total_duration:.3f}s"
+        self.rp.log(**self._build_log(leaf["item_id"], message, "INFO", attachment))
+
+    def _evict_item(self, test_item: Item, leaf: dict[str, Any]) -> None:
+        """Release metadata of a reported item.
+
+        Only the leaf itself with its ID and execution status is kept, which is enough for late log entries and
+        suite finishing.
+
+        :param test_item: pytest.Item
+        :param leaf:      the item's leaf
+        """
+        for key in EVICTED_LEAF_KEYS:
+            leaf.pop(key, None)
+        self._tree_path[test_item] = [leaf]
+        self._item_kinds.pop(test_item, None)
 
     def _get_items(self, exec_status) -> list[Item]:
         return [k for k, v in self._tree_path.items() if v[-1]["exec"] == exec_status]
@@ -1038,6 +1546,12 @@ class PyTestService:
             for leaf in path[1:-1]:
                 if leaf["exec"] == ExecStatus.IN_PROGRESS:
                     self._lock(leaf, lambda p: self._proceed_suite_finish(p))
+        # Child suites are always created after their parents, so the reverse order finishes them first
+        for leaf in reversed(list(self._lazy_suites.values())):
+            if leaf["exec"] == ExecStatus.IN_PROGRESS:
+                self._lock(leaf, lambda p: self._proceed_suite_finish(p))
+        if self._passed_items_root:
+            self._report_passed_items(self._passed_items_root)
 
     def _build_finish_launch_rq(self) -> dict[str, Any]:
         finish_rq = {"end_time": datetime.now(tz=timezone.utc)}
@@ -1084,9 +1598,16 @@ class PyTestService:
             LOGGER.warning(
                 "Incorrect loglevel = %s. Force set to INFO. " "Available levels: %s.", log_level, KNOWN_LOG_LEVELS
             )
-        item_id = self._tree_path[test_item][-1]["item_id"]
-        if PYTEST_BDD:
-            if not item_id:
+        leaf = self._tree_path[test_item][-1]
+        item_id = leaf["item_id"]
+        if not item_id and leaf.get("deferred"):
+            # The item is not started yet, keep the entry until it is known whether the item is reported
+            log_buffer = self._log_buffers.get(test_item)
+            if log_buffer:
+                log_buffer.log(datetime.now(tz=timezone.utc), message, log_level, attachment)
+            return
+        if not item_id:
+            if self._get_kind(test_item) is ItemKind.BDD_SCENARIO:
                 # Check if we are actually a BDD scenario
                 scenario = self._bdd_scenario_by_item.get(test_item, None)
                 if scenario:
@@ -1106,6 +1627,10 @@ class PyTestService:
             yield
             return
 
+        if self._config.rp_report_fixtures_buffered:
+            yield from self._buffer_fixture(name, error_msg)
+            return
+
         reporter = self.rp.step_reporter
         item_id = reporter.start_nested_step(name, datetime.now(tz=timezone.utc))
 
@@ -1130,9 +1655,71 @@ class PyTestService:
             LOGGER.exception(e)
             reporter.finish_nested_step(item_id, datetime.now(tz=timezone.utc), "FAILED")
 
+    def _buffer_fixture(self, name: str, error_msg: str) -> Generator[None, Any, None]:
+        """Record fixture setup or teardown to report it later on the test finish.
+
+        Only failed fixtures and fixtures which took longer than the configured threshold are recorded.
+
+        :param name:       Name of the fixture
+        :param error_msg:  Error message
+        """
+        start_time = datetime.now(tz=timezone.utc)
+        outcome = yield
+        end_time = datetime.now(tz=timezone.utc)
+        exc_info = outcome.excinfo
+        status = "PASSED"
+        if exc_info and type(exc_info[1]).__name__ != "Skipped":
+            status = "FAILED"
+        else:
+            exc_info = None
+            if (end_time - start_time).total_seconds() < self._config.rp_report_fixtures_threshold:
+                return
+
+        self._fixture_steps.setdefault(self.__unique_id(), []).append(
+            {
+                "name": name,
+                "error_msg": error_msg,
+                "start_time": start_time,
+                "end_time": end_time,
+                "status": status,
+                "exc_info": exc_info,
+            }
+        )
+
+    def _report_buffered_fixtures(self, parent_item_id: Optional[str]) -> None:
+        """Report fixture nested steps recorded in the current thread.
+
+        :param parent_item_id: ID of the test item to report fixtures under
+        """
+        fixture_steps = self._fixture_steps.pop(self.__unique_id(), None)
+        if not fixture_steps or not parent_item_id:
+            return
+
+        for fixture_step in fixture_steps:
+            item_id = self.rp.start_test_item(
+                fixture_step["name"],
+                fixture_step["start_time"],
+                "step",
+                has_stats=False,
+                parent_item_id=parent_item_id,
+            )
+            exc_info = fixture_step["exc_info"]
+            if exc_info:
+                error_log = self._build_log(item_id, fixture_step["error_msg"], log_level="ERROR")
+                error_log["time"] = fixture_step["end_time"]
+                self.rp.log(**error_log)
+                traceback_str = "\n".join(traceback.format_exception(exc_info[0], value=exc_info[1], tb=exc_info[2]))
+                exception_log = self._build_log(item_id, traceback_str, log_level="ERROR")
+                exception_log["time"] = fixture_step["end_time"]
+                self.rp.log(**exception_log)
+            self.rp.finish_test_item(item_id, fixture_step["end_time"], status=fixture_step["status"])
+
     def _get_python_name(self, scenario: Scenario) -> str:
         python_name = f"test_{make_python_name(self._get_scenario_template(scenario).name)}"
-        same_item_names = [name for name in self._bdd_item_by_name.keys() if name.startswith(python_name)]
+        same_item_names = self._bdd_item_names_by_base_name.get(python_name, None)
+        if not same_item_names:
+            # pytest-bdd adds numeric suffixes to duplicate scenario names, look them up by prefix
+            same_item_names = [name for name in self._bdd_item_by_name.keys() if name.startswith(python_name)]
         if len(same_item_names) < 1:
             return python_name
         else:
@@ -1202,6 +1789,19 @@ class PyTestService:
         leaf = self._tree_path[scenario][-1]
         if leaf["exec"] != ExecStatus.IN_PROGRESS:
             return
+        step_leaves = list(leaf["children"].values())
+        background = feature.background
+        if background and self._config.rp_bdd_background_once and background in leaf["children"]:
+            if leaf.get("status", "PASSED") == "PASSED" and background in self._bdd_reported_backgrounds:
+                step_leaves.remove(leaf["children"][background])
+            else:
+                self._bdd_reported_backgrounds.add(background)
+        if self._config.rp_bdd_steps_mode is BddStepsMode.LOG:
+            self._report_recorded_bdd_steps_log(leaf, step_leaves)
+        else:
+            # In NESTED mode only Background steps can be recorded, others are already reported
+            for step_leaf in step_leaves:
+                self._report_recorded_bdd_step(step_leaf, leaf["item_id"])
         self._finish_step(self._build_finish_step_rq(leaf))
         leaf["exec"] = ExecStatus.FINISHED
         self._finish_parents(leaf)
@@ -1222,35 +1822,31 @@ class PyTestService:
             return OrderedDict(item_params["_pytest_bdd_example"])
         return None
 
-    def _get_scenario_code_ref(self, scenario: Scenario, scenario_template: Optional[ScenarioTemplate]) -> str:
+    def _get_scenario_code_ref(
+        self,
+        scenario: Scenario,
+        scenario_template: Optional[ScenarioTemplate],
+        row_metadata: Optional[dict[str, str]] = None,
+    ) -> str:
+        if scenario_template and scenario_template.templated and scenario_template.examples:
+            code_ref = self._get_template_metadata(scenario_template)["code_ref_prefix"]
+            parameters_str = row_metadata["parameters_str"] if row_metadata else ""
+            return code_ref + f"[EXAMPLE:{scenario.name}{parameters_str}]"
+
         code_ref = scenario.feature.rel_filename + "/"
         rule = getattr(scenario, "rule", None)
         if rule:
             code_ref += f"[RULE:{rule.name}]/"
-        if scenario_template and scenario_template.templated and scenario_template.examples:
-            parameters = self._get_scenario_parameters_from_template(scenario)
-            if parameters:
-                parameters_str = ";".join([f"{k}:{v}" for k, v in sorted(parameters.items())])
-                parameters_str = f"[{parameters_str}]" if parameters_str else ""
-            else:
-                parameters_str = ""
-            code_ref += f"[EXAMPLE:{scenario.name}{parameters_str}]"
-        else:
-            keyword = getattr(scenario, "keyword", "Scenario").upper()
-            code_ref += f"[{keyword}:{scenario.name}]"
-
+        keyword = getattr(scenario, "keyword", "Scenario").upper()
+        code_ref += f"[{keyword}:{scenario.name}]"
         return code_ref
 
-    def _get_scenario_test_case_id(self, leaf: dict[str, Any]) -> str:
+    def _get_scenario_test_case_id(self, leaf: dict[str, Any], row_metadata: Optional[dict[str, str]] = None) -> str:
         attributes = leaf.get("attributes", [])
-        params: Optional[dict[str, str]] = leaf.get("parameters", None)
         for attribute in attributes:
             if attribute.get("key", None) == "tc_id":
                 tc_id = attribute["value"]
-                params_str = ""
-                if params:
-                    params_str = ";".join([f"{k}:{v}" for k, v in sorted(params.items())])
-                    params_str = f"[{params_str}]"
+                params_str = row_metadata["parameters_str"] if row_metadata else ""
                 return f"{tc_id}{params_str}"
         return leaf["code_ref"]
 
@@ -1266,28 +1862,104 @@ class PyTestService:
         ).rstrip("\n")
         leaf["description"] = description if description else None
         scenario_template = self._get_scenario_template(scenario)
+        row_metadata = None
         if scenario_template and scenario_template.templated:
             parameters = self._get_scenario_parameters_from_template(scenario)
             leaf["parameters"] = parameters
             if parameters:
-                parameters_str = f"Parameters:\n\n{markdown_helpers.format_data_table_dict(parameters)}"
+                row_metadata = self._get_example_row_metadata(scenario_template, parameters)
+                parameters_table = row_metadata["parameters_table"]
                 if leaf["description"]:
-                    leaf["description"] = markdown_helpers.as_two_parts(leaf["description"], parameters_str)
+                    leaf["description"] = markdown_helpers.as_two_parts(leaf["description"], parameters_table)
                 else:
-                    leaf["description"] = parameters_str
-        leaf["code_ref"] = self._get_scenario_code_ref(scenario, scenario_template)
+                    leaf["description"] = parameters_table
+        leaf["code_ref"] = self._get_scenario_code_ref(scenario, scenario_template, row_metadata)
         leaf["attributes"] = self._process_bdd_attributes(scenario)
-        leaf["test_case_id"] = self._get_scenario_test_case_id(leaf)
+        leaf["test_case_id"] = self._get_scenario_test_case_id(leaf, row_metadata)
+
+    def _start_bdd_step(self, leaf: dict[str, Any], name: str, background: bool = False) -> None:
+        start_time = datetime.now(tz=timezone.utc)
+        if self._config.rp_bdd_steps_mode is BddStepsMode.NESTED and not (
+            background and self._config.rp_bdd_background_once
+        ):
+            leaf["item_id"] = self.rp.step_reporter.start_nested_step(name, start_time)
+        else:
+            leaf["name"] = name
+            leaf["start_time"] = start_time
+        leaf["exec"] = ExecStatus.IN_PROGRESS
 
     def _finish_bdd_step(self, leaf: dict[str, Any], status: str) -> None:
         if leaf["exec"] != ExecStatus.IN_PROGRESS:
             return
 
-        reporter = self.rp.step_reporter
-        item_id = leaf["item_id"]
-        reporter.finish_nested_step(item_id, datetime.now(tz=timezone.utc), status)
+        end_time = datetime.now(tz=timezone.utc)
+        if "start_time" not in leaf:
+            self.rp.step_reporter.finish_nested_step(leaf["item_id"], end_time, status)
+        else:
+            leaf["end_time"] = end_time
+            leaf["status"] = status
         leaf["exec"] = ExecStatus.FINISHED
 
+    def _report_recorded_bdd_step(self, leaf: dict[str, Any], parent_item_id: Optional[str]) -> None:
+        """Report a step recorded in memory and its child steps as nested steps.
+
+        :param leaf:           the step or background leaf
+        :param parent_item_id: ID of the parent item
+        """
+        if "start_time" not in leaf:
+            return
+
+        end_time = leaf.get("end_time", None) or datetime.now(tz=timezone.utc)
+        item_id = self.rp.start_test_item(
+            leaf["name"], leaf["start_time"], "step", has_stats=False, parent_item_id=parent_item_id
+        )
+        leaf["item_id"] = item_id
+        for child_leaf in leaf["children"].values():
+            self._report_recorded_bdd_step(child_leaf, item_id)
+        traceback_str = leaf.get("traceback", None)
+        if traceback_str:
+            exception_log = self._build_log(item_id, traceback_str, log_level="ERROR")
+            exception_log["time"] = end_time
+            self.rp.log(**exception_log)
+        self.rp.finish_test_item(item_id, end_time, status=leaf.get("status", "STOPPED"))
+
+    def _report_recorded_bdd_steps_log(self, scenario_leaf: dict[str, Any], leaves: list[dict[str, Any]]) -> None:
+        """Report steps recorded in memory as a single table log entry of the scenario.
+
+        Tracebacks of failed steps are logged separately, with the step name in the first line.
+
+        :param scenario_leaf: the scenario leaf
+        :param leaves:        step and background leaves to report
+        """
+        step_leaves = []
+        for leaf in leaves:
+            if "start_time" not in leaf:
+                continue
+            step_leaves.append((leaf["name"], leaf))
+            for child_leaf in leaf["children"].values():
+                if "start_time" in child_leaf:
+                    step_leaves.append((f"{leaf['name']}: {child_leaf['name']}", child_leaf))
+        if not step_leaves:
+            return
+
+        item_id = scenario_leaf["item_id"]
+        table = [["Step", "Status", "Duration"]]
+        errors = []
+        for name, leaf in step_leaves:
+            end_time = leaf.get("end_time", None) or datetime.now(tz=timezone.utc)
+            duration = (end_time - leaf["start_time"]).total_seconds()
+            table.append([name, leaf.get("status", "STOPPED"), f"{duration:.3f}s"])
+            traceback_str = leaf.get("traceback", None)
+            if traceback_str:
+                errors.append((name, end_time, traceback_str))
+        self.rp.log(
+            **self._build_log(item_id, markdown_helpers.as_markdown(markdown_helpers.format_data_table(table)), "INFO")
+        )
+        for name, end_time, traceback_str in errors:
+            exception_log = self._build_log(item_id, f"{name}\n{traceback_str}", log_level="ERROR")
+            exception_log["time"] = end_time
+            self.rp.log(**exception_log)
+
     def _is_background_step(self, step: Step, feature: Feature) -> bool:
         """Check if step belongs to feature background.
 
@@ -1298,11 +1970,7 @@ class PyTestService:
         if not feature.background:
             return False
 
-        background_steps = feature.background.steps
-        return any(
-            s.name == step.name and s.keyword == step.keyword and s.line_number == step.line_number
-            for s in background_steps
-        )
+        return _get_step_key(step) in self._get_feature_index(feature)["background_steps"]
 
     @check_rp_enabled
     def start_bdd_step(self, feature: Feature, scenario: Scenario, step: Step) -> None:
@@ -1321,23 +1989,19 @@ class PyTestService:
             self._process_scenario_metadata(scenario_leaf)
             scenario_leaf["item_id"] = self._start_step(self._build_start_step_rq(scenario_leaf))
             scenario_leaf["exec"] = ExecStatus.IN_PROGRESS
-        reporter = self.rp.step_reporter
         step_leaf = self._create_leaf(LeafType.NESTED, scenario_leaf, step)
-        if self._is_background_step(step, feature):
+        is_background_step = self._is_background_step(step, feature)
+        if is_background_step:
             background_leaf = scenario_leaf["children"][feature.background]
             background_leaf["children"][step] = step_leaf
             if background_leaf["exec"] != ExecStatus.IN_PROGRESS:
-                item_id = reporter.start_nested_step(BACKGROUND_STEP_NAME, datetime.now(tz=timezone.utc))
-                background_leaf["item_id"] = item_id
-                background_leaf["exec"] = ExecStatus.IN_PROGRESS
+                self._start_bdd_step(background_leaf, BACKGROUND_STEP_NAME, background=True)
         else:
             scenario_leaf["children"][step] = step_leaf
             if feature.background:
                 background_leaf = scenario_leaf["children"][feature.background]
                 self._finish_bdd_step(background_leaf, "PASSED")
-        item_id = reporter.start_nested_step(f"{step.keyword} {step.name}", datetime.now(tz=timezone.utc))
-        step_leaf["item_id"] = item_id
-        step_leaf["exec"] = ExecStatus.IN_PROGRESS
+        self._start_bdd_step(step_leaf, f"{step.keyword} {step.name}", background=is_background_step)
 
     @check_rp_enabled
     def finish_bdd_step(self, feature: Feature, scenario: Scenario, step: Step) -> None:
@@ -1351,16 +2015,7 @@ class PyTestService:
             return
 
         scenario_leaf = self._tree_path[scenario][-1]
-        background_steps = []
-        if feature.background:
-            background_steps = feature.background.steps
-        if next(
-            filter(
-                lambda s: s.name == step.name and s.keyword == step.keyword and s.line_number == step.line_number,
-                background_steps,
-            ),
-            None,
-        ):
+        if self._is_background_step(step, feature):
             parent_leaf = scenario_leaf["children"][feature.background]
         else:
             parent_leaf = scenario_leaf
@@ -1385,13 +2040,15 @@ class PyTestService:
             step_leaf = scenario_leaf["children"][step.background]["children"][step]
         else:
             step_leaf = scenario_leaf["children"][step]
-        item_id = step_leaf["item_id"]
         traceback_str = "\n".join(
             traceback.format_exception(type(exception), value=exception, tb=exception.__traceback__)
         )
-        exception_log = self._build_log(item_id, traceback_str, log_level="ERROR")
-        client = self.rp.step_reporter.client
-        client.log(**exception_log)
+        if "start_time" not in step_leaf:
+            exception_log = self._build_log(step_leaf["item_id"], traceback_str, log_level="ERROR")
+            client = self.rp.step_reporter.client
+            client.log(**exception_log)
+        else:
+            step_leaf["traceback"] = traceback_str
 
         self._finish_bdd_step(step_leaf, "FAILED")
         if step.background:
@@ -1400,7 +2057,58 @@ class PyTestService:
 
     def start(self) -> None:
         """Start servicing Report Portal requests."""
+        self._init_client()
+        self._fetch_project_settings()
+
+    def start_in_background(self) -> None:
+        """Start servicing Report Portal requests, start the launch in a background thread.
+
+        The project settings request, which opens and warms up the connection, and the launch start request are sent
+        while pytest collects tests. Use `wait_launch` to join the result.
+        """
+        self._init_client()
+        future = Future()
+        self._launch_future = future
+        thread = threading.Thread(
+            target=self._start_launch_in_background, args=(future,), name="rp-launch-start", daemon=True
+        )
+        thread.start()
+
+    def _start_launch_in_background(self, future: Future) -> None:
+        try:
+            self._fetch_project_settings()
+            future.set_result(self.start_launch())
+        except BaseException as exc:
+            future.set_exception(exc)
+
+    @property
+    def launch_pending(self) -> bool:
+        """Return True if the launch is being started in background and nobody has joined it yet."""
+        return self._launch_future is not None
+
+    def wait_launch(self, timeout: float) -> bool:
+        """Wait for the launch startup.
+
+        :param timeout: maximum time to wait for the background launch start in seconds
+        :return: True if the launch was started, False otherwise
+        """
+        future = self._launch_future
+        if future is not None:
+            try:
+                future.result(timeout)
+            except Exception as exc:
+                LOGGER.debug("ReportPortal - Background launch start failed: %s", exc)
+                return False
+            self._launch_future = None
+        return bool(self.rp and self.rp.launch_uuid)
+
+    def _fetch_project_settings(self) -> None:
+        if hasattr(self.rp, "get_project_settings"):
+            self.project_settings = self.rp.get_project_settings()
+
+    def _init_client(self) -> None:
         self.parent_item_id = self._config.rp_parent_item_id
+        self._failure_signatures = FailureSignatures(self.failure_signature_file)
         self.ignored_attributes = list(set(self._config.rp_ignore_attributes or []).union({"parametrize"}))
         LOGGER.debug(
             "ReportPortal - Init service: endpoint=%s, " "project=%s, api_key=%s",
@@ -1434,8 +2142,35 @@ class PyTestService:
             oauth_client_secret=self._config.rp_oauth_client_secret,
             oauth_scope=self._config.rp_oauth_scope,
         )
-        if hasattr(self.rp, "get_project_settings"):
-            self.project_settings = self.rp.get_project_settings()
+        is_sync = self._config.rp_client_type is ClientType.SYNC
+        if is_sync and (self._config.rp_max_requests_per_second > 0 or self._config.rp_max_bytes_per_second > 0):
+            self._rate_limiter = create_rate_limiter(
+                self._config.rp_max_requests_per_second,
+                self._config.rp_max_bytes_per_second,
+                self.rate_limit_file,
+                self.rate_limit_share,
+            )
+        if self._config.rp_retry_backoff > 0 and is_sync:
+            mount_retry_policy(
+                self.rp,
+                self._config.rp_api_retries,
+                self._config.rp_retry_backoff,
+                self._config.rp_retry_max_delay,
+                self._config.rp_retry_budgets,
+                self._config.rp_retry_worker_budget,
+                self._rate_limiter,
+            )
+        elif self._rate_limiter:
+            mount_rate_limit(self.rp, self._rate_limiter)
+        if self._config.rp_circuit_breaker_failures > 0 and self._config.rp_client_type is ClientType.SYNC:
+            self.rp = CircuitBreakerClient(
+                self.rp,
+                self._config.rp_circuit_breaker_failures,
+                self._config.rp_circuit_breaker_reset_timeout,
+                self._config.rp_circuit_breaker_journal_dir,
+            )
+            # Log handlers take the current client
+            set_current(self.rp)
         # noinspection PyUnresolvedReferences
         self._start_tracker.add(self.__unique_id())
 
@@ -1443,4 +2178,20 @@ class PyTestService:
         """Finish servicing Report Portal requests."""
         self.rp.close()
         self.rp = None
+        if self._rate_limiter:
+            self._rate_limiter.close()
+            self._rate_limiter = None
+        self._failure_signatures.close()
         self._start_tracker.remove(self.__unique_id())
+
+    def remove_state_files(self) -> None:
+        """Remove the rate limit and failure signature state files, shared with xdist workers."""
+        for state_file in (self.rate_limit_file, self.failure_signature_file):
+            if not state_file:
+                continue
+            try:
+                os.remove(state_file)
+            except OSError:
+                pass
+        self.rate_limit_file = None
+        self.failure_signature_file = None
@@ -0,0 +1,32 @@
+#  Copyright (c) 2023 https://reportportal.io .
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#  https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License
+
+"""This package contains micro-benchmarks for the agent's hot paths."""
+
+from time import perf_counter
+from typing import Callable
+
+
+def best_time(func: Callable[[], object], repeat: int = 3) -> float:
+    """Measure the best execution time of the given function.
+
+    :param func:   a function to measure
+    :param repeat: number of measurements
+    :return: the best time in seconds
+    """
+    result = []
+    for _ in range(repeat):
+        start = perf_counter()
+        func()
+        result.append(perf_counter() - start)
+    return min(result)
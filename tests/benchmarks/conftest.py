@@ -0,0 +1,64 @@
+#  Copyright (c) 2023 https://reportportal.io .
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#  https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License
+
+"""This module contains common Pytest fixtures for micro-benchmarks."""
+
+import os
+from unittest import mock
+
+import pytest
+from pytest import fixture
+
+from pytest_reportportal.config import AgentConfig
+from pytest_reportportal.service import PyTestService
+
+BENCHMARKS_DIR = os.path.dirname(__file__)
+
+
+def pytest_collection_modifyitems(config, items) -> None:
+    """Skip benchmarks unless they are requested, since their timings depend on the load of the machine."""
+    if os.environ.get("RP_BENCHMARKS"):
+        return
+    skip = pytest.mark.skip(reason="Benchmarks run only if RP_BENCHMARKS environment variable is set")
+    for item in items:
+        if str(item.path).startswith(BENCHMARKS_DIR):
+            item.add_marker(skip)
+
+
+class StubClient:
+    """ReportPortal client stub which accepts any call without recording it."""
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: None
+
+
+@fixture()
+def agent_config():
+    """Mock agent configuration for benchmarking."""
+    agent_config = mock.create_autospec(AgentConfig, instance=True)
+    agent_config.rp_tests_attributes = None
+    agent_config.rp_ignore_attributes = set()
+    agent_config.rp_issue_id_marks = True
+    agent_config.rp_is_skipped_an_issue = True
+    agent_config.rp_report_fixtures_buffered = False
+    agent_config.rp_evict_finished_items = False
+    agent_config.rp_lazy_item_paths = False
+    return agent_config
+
+
+@fixture()
+def rp_service(agent_config):
+    """Prepare instance of the PyTestService with a stub client for benchmarking."""
+    service = PyTestService(agent_config)
+    service.rp = StubClient()
+    return service
@@ -0,0 +1,86 @@
+#  Copyright (c) 2023 https://reportportal.io .
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#  https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License
+
+"""This module includes micro-benchmarks for BDD scenario lookups."""
+
+from types import SimpleNamespace
+
+import pytest
+
+from tests.benchmarks import best_time
+
+pytest_bdd_parser = pytest.importorskip("pytest_bdd.parser")
+
+TEMPLATE_NUMBER = 200
+EXAMPLE_NUMBER = 5_000
+STEP_NUMBER = 10
+
+
+def build_template(line_number: int):
+    template = pytest_bdd_parser.ScenarioTemplate.__new__(pytest_bdd_parser.ScenarioTemplate)
+    template.line_number = line_number
+    template.name = f"Scenario {line_number}"
+    return template
+
+
+class FakeFeature:
+    """Lightweight stand-in for pytest_bdd.Feature."""
+
+    def __init__(self) -> None:
+        templates = [build_template(i * 10) for i in range(TEMPLATE_NUMBER)]
+        for template in templates:
+            template.feature = self
+        self.scenarios = {t.name: t for t in templates}
+        steps = [SimpleNamespace(keyword="Given", name=f"step {i}", line_number=i + 1) for i in range(STEP_NUMBER)]
+        self.background = SimpleNamespace(steps=steps)
+
+
+def legacy_get_scenario_template(scenario):
+    for template in scenario.feature.scenarios.values():
+        if template.line_number == scenario.line_number:
+            return template
+
+
+def legacy_is_background_step(step, feature):
+    return any(
+        s.name == step.name and s.keyword == step.keyword and s.line_number == step.line_number
+        for s in feature.background.steps
+    )
+
+
+def test_bdd_outline_lookup_5k(rp_service, record_property):
+    """Template and background step lookups of Scenario Outline rows should not depend on feature size."""
+    feature = FakeFeature()
+    outline_line = (TEMPLATE_NUMBER - 1) * 10
+    scenarios = [SimpleNamespace(feature=feature, line_number=outline_line) for _ in range(EXAMPLE_NUMBER)]
+    steps = [SimpleNamespace(keyword="Then", name=f"row step {i}", line_number=1000 + i) for i in range(STEP_NUMBER)]
+
+    def legacy_lookup():
+        for scenario in scenarios:
+            legacy_get_scenario_template(scenario)
+            for step in steps:
+                legacy_is_background_step(step, feature)
+
+    def indexed_lookup():
+        for scenario in scenarios:
+            rp_service._get_scenario_template(scenario)
+            for step in steps:
+                rp_service._is_background_step(step, feature)
+
+    legacy_time = best_time(legacy_lookup)
+    indexed_time = best_time(indexed_lookup)
+    record_property("linear_lookup_time", legacy_time)
+    record_property("indexed_lookup_time", indexed_time)
+    assert rp_service._get_scenario_template(scenarios[0]) is legacy_get_scenario_template(scenarios[0])
+    assert rp_service._is_background_step(feature.background.steps[3], feature)
+    assert indexed_time < legacy_time
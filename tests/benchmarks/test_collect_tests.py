@@ -0,0 +1,71 @@
+#  Copyright (c) 2023 https://reportportal.io .
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#  https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License
+
+"""This module includes benchmarks for the collection tree building."""
+
+import os
+from time import perf_counter
+from unittest import mock
+
+from py.path import local
+
+DIR_NUMBER = 20
+MODULE_NUMBER = 20
+ITEM_NUMBER = 100
+ROOT_DIR = local(os.path.abspath(os.sep)).join("project")
+
+
+class FakeNode:
+    """Lightweight stand-in for pytest collection nodes."""
+
+    def __init__(self, name: str, parent, fspath: local, session) -> None:
+        self.name = name
+        self.parent = parent
+        self.fspath = fspath
+        self.session = session
+        self.location = (str(fspath), 0, name)
+
+
+def build_session():
+    session = mock.Mock()
+    session.config.rootdir = ROOT_DIR
+    items = []
+    for dir_index in range(DIR_NUMBER):
+        for module_index in range(MODULE_NUMBER):
+            fspath = ROOT_DIR.join("tests", f"dir_{dir_index}", f"test_{module_index}.py")
+            module = FakeNode(fspath.basename, None, fspath, session)
+            for item_index in range(ITEM_NUMBER):
+                items.append(FakeNode(f"test_{item_index}", module, fspath, session))
+    session.items = items
+    return session
+
+
+def test_collect_tests(rp_service, agent_config, record_property):
+    """Item directories and ancestors should be resolved once per parent node."""
+    agent_config.rp_dir_level = 0
+    agent_config.rp_hierarchy_dirs = True
+    agent_config.rp_hierarchy_code = True
+    agent_config.rp_hierarchy_test_file = True
+    session = build_session()
+
+    with mock.patch.object(rp_service, "_get_item_dirs", wraps=rp_service._get_item_dirs) as get_item_dirs:
+        start = perf_counter()
+        rp_service.collect_tests(session)
+        collect_time = perf_counter() - start
+
+    record_property("collect_time", collect_time)
+    assert get_item_dirs.call_count == DIR_NUMBER * MODULE_NUMBER
+    assert len(rp_service._tree_path) == len(session.items)
+    item = session.items[-1]
+    path = rp_service._tree_path[item]
+    assert [leaf["name"] for leaf in path[1:]] == ["tests", f"dir_{DIR_NUMBER - 1}", item.parent.name, item.name]
@@ -0,0 +1,81 @@
+#  Copyright (c) 2023 https://reportportal.io .
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#  https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License
+
+"""This module includes benchmarks for the plugin overhead when reporting is disabled."""
+
+import pytest
+
+from pytest_reportportal import hooks
+from tests.benchmarks import best_time
+
+TEST_NUMBER = 1_000
+RUNTEST_HOOKS = ("pytest_runtest_protocol", "pytest_runtest_makereport", "pytest_fixture_setup")
+
+
+class LegacyRegistration:
+    """Register test execution hooks unconditionally, as the plugin did before."""
+
+    @staticmethod
+    def pytest_configure(config):
+        config.pluginmanager.register(hooks, "legacy_reportportal_hooks")
+
+
+class HookCollector:
+    """Collect names of plugins implementing test execution hooks."""
+
+    def __init__(self) -> None:
+        self.plugin_names = set()
+
+    def pytest_sessionfinish(self, session):
+        pluginmanager = session.config.pluginmanager
+        for hook_name in RUNTEST_HOOKS:
+            for hook_impl in getattr(pluginmanager.hook, hook_name).get_hookimpls():
+                self.plugin_names.add(pluginmanager.get_name(hook_impl.plugin))
+
+
+def run_tests(test_dir, *args, plugins=()) -> set[str]:
+    collector = HookCollector()
+    args = [str(test_dir), "-q", "-p", "no:cacheprovider", "-c", str(test_dir / "pytest.ini"), *args]
+    assert pytest.main(args, plugins=[collector, *plugins]) == 0
+    return collector.plugin_names
+
+
+def test_disabled_overhead(tmp_path, capsys, record_property):
+    """The plugin should not add per-test hook calls when reporting is disabled."""
+    (tmp_path / "pytest.ini").write_text("[pytest]\n")
+    tests = "\n\n".join(f"def test_{i}(tmp_path_factory):\n    pass" for i in range(TEST_NUMBER))
+    (tmp_path / "test_generated.py").write_text(tests)
+
+    def disabled_run():
+        plugin_names = run_tests(tmp_path)
+        assert "reportportal_hooks" not in plugin_names
+        assert "legacy_reportportal_hooks" not in plugin_names
+
+    def legacy_run():
+        assert "legacy_reportportal_hooks" in run_tests(tmp_path, plugins=[LegacyRegistration()])
+
+    def baseline_run():
+        plugin_names = run_tests(tmp_path, "-p", "no:pytest_reportportal")
+        assert "reportportal_hooks" not in plugin_names
+
+    disabled_time = best_time(disabled_run)
+    legacy_time = best_time(legacy_run)
+    baseline_time = best_time(baseline_run)
+    capsys.readouterr()
+
+    record_property("disabled_time", disabled_time)
+    record_property("legacy_time", legacy_time)
+    record_property("baseline_time", baseline_time)
+    # The disabled plugin keeps only session-level hooks, so its runs should be as fast as runs without the plugin.
+    # The margin covers the run-to-run noise of a loaded machine.
+    assert disabled_time < baseline_time * 1.25
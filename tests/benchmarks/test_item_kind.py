@@ -0,0 +1,60 @@
+#  Copyright (c) 2023 https://reportportal.io .
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#  https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License
+
+"""This module includes micro-benchmarks for item kind dispatching."""
+
+import os
+
+from pytest_reportportal.service import PYTEST_BDD, ItemKind, _get_item_kind
+from tests.benchmarks import best_time
+
+ITEM_NUMBER = 100_000
+HOOK_NUMBER = 4
+
+
+def legacy_is_pytest_bdd_scenario(location_path: str) -> bool:
+    """Reproduce per-hook scenario path check which was used before item kinds were introduced."""
+    return location_path.endswith(os.path.join("pytest_bdd", "scenario.py"))
+
+
+class FakeItem:
+    """Lightweight stand-in for pytest.Item."""
+
+    def __init__(self, location: str) -> None:
+        self.location = (location, 0, "")
+
+
+def test_item_kind_dispatch_100k(rp_service, record_property):
+    """Resolved item kind lookup in hot hooks should be cheaper than path checks."""
+    bdd_path = os.path.join("site-packages", "pytest_bdd", "scenario.py")
+    items = [FakeItem(bdd_path if i % 10 == 0 else os.path.join("tests", f"test_{i}.py")) for i in range(ITEM_NUMBER)]
+    for item in items:
+        rp_service._item_kinds[item] = _get_item_kind(item)
+
+    def path_dispatch():
+        for item in items:
+            for _ in range(HOOK_NUMBER):
+                _ = PYTEST_BDD and legacy_is_pytest_bdd_scenario(item.location[0])
+
+    def kind_dispatch():
+        for item in items:
+            for _ in range(HOOK_NUMBER):
+                _ = rp_service._get_kind(item) is ItemKind.BDD_SCENARIO
+
+    path_time = best_time(path_dispatch)
+    kind_time = best_time(kind_dispatch)
+    record_property("path_dispatch_time", path_time)
+    record_property("kind_dispatch_time", kind_time)
+    bdd_items = sum(1 for item in items if rp_service._get_kind(item) is ItemKind.BDD_SCENARIO)
+    assert bdd_items == (ITEM_NUMBER // 10 if PYTEST_BDD else 0)
+    assert kind_time < path_time
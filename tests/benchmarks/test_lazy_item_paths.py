@@ -0,0 +1,66 @@
+#  Copyright (c) 2023 https://reportportal.io .
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#  https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License
+
+"""This module includes benchmarks for lazy item path resolution in xdist workers."""
+
+import gc
+import tracemalloc
+from time import perf_counter
+
+from tests.benchmarks.test_collect_tests import build_session
+
+WORKER_NUMBER = 8
+
+
+def measure(func):
+    gc.collect()
+    tracemalloc.start()
+    try:
+        start = perf_counter()
+        func()
+        elapsed = perf_counter() - start
+        return elapsed, tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+
+
+def test_lazy_item_paths_worker(rp_service, agent_config, record_property):
+    """A worker should pay only for the items it runs when item paths are resolved lazily."""
+    agent_config.rp_dir_level = 0
+    agent_config.rp_hierarchy_dirs = True
+    agent_config.rp_hierarchy_code = True
+    agent_config.rp_hierarchy_test_file = True
+    session = build_session()
+    worker_items = session.items[::WORKER_NUMBER]
+
+    eager_time, eager_memory = measure(lambda: rp_service.collect_tests(session))
+    eager_path = [leaf["name"] for leaf in rp_service._tree_path[worker_items[-1]]]
+    rp_service._tree_path.clear()
+
+    def lazy_run():
+        rp_service.collect_tests(session)
+        for item in worker_items:
+            rp_service._resolve_item_path(item)
+
+    agent_config.rp_lazy_item_paths = True
+    lazy_time, lazy_memory = measure(lazy_run)
+    lazy_path = [leaf["name"] for leaf in rp_service._tree_path[worker_items[-1]]]
+
+    record_property("eager_time", eager_time)
+    record_property("eager_memory", eager_memory)
+    record_property("lazy_time", lazy_time)
+    record_property("lazy_memory", lazy_memory)
+    assert lazy_path == eager_path
+    assert len(rp_service._tree_path) == len(worker_items)
+    assert lazy_time < eager_time
+    assert lazy_memory < eager_memory / 2
@@ -0,0 +1,77 @@
+#  Copyright (c) 2023 https://reportportal.io .
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#  https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License
+
+
+"""This module includes latency benchmarks for log capturing with a synchronous client."""
+
+import logging
+import time
+from typing import Optional
+
+from _pytest.logging import catching_logs
+from reportportal_client import RPLogHandler
+
+from pytest_reportportal.config import LogQueueOverflow
+from pytest_reportportal.rp_logging import LogQueue, QueuedRPLogHandler
+
+CALL_NUMBER = 1000
+BATCH_SIZE = 20
+REQUEST_TIME = 0.01
+
+
+class BatchingClient:
+    """Client stub, which blocks for a request time on every log batch, like the synchronous client does."""
+
+    def __init__(self) -> None:
+        self.count = 0
+
+    def log(self, *args, **kwargs) -> None:
+        self.count += 1
+        if self.count % BATCH_SIZE == 0:
+            time.sleep(REQUEST_TIME)
+
+    # noinspection PyMethodMayBeStatic
+    def current_item(self) -> Optional[str]:
+        return "item"
+
+
+def log_latencies(handler: logging.Handler) -> list[float]:
+    logger = logging.getLogger("timing_sensitive")
+    latencies = []
+    with catching_logs(handler, level=logging.INFO):
+        for i in range(CALL_NUMBER):
+            start = time.perf_counter()
+            logger.info("Response %s received", i)
+            latencies.append(time.perf_counter() - start)
+    return sorted(latencies)
+
+
+def test_log_queue_tail_latency(record_property):
+    """Logging calls should not wait for log requests with the log queue."""
+    client = BatchingClient()
+    direct = log_latencies(RPLogHandler(rp_client=client))
+
+    queued_client = BatchingClient()
+    log_queue = LogQueue(CALL_NUMBER, LogQueueOverflow.BLOCK)
+    log_queue.start()
+    try:
+        queued = log_latencies(QueuedRPLogHandler(log_queue, rp_client=queued_client))
+    finally:
+        log_queue.stop()
+
+    p99 = int(CALL_NUMBER * 0.99)
+    record_property("direct_p99", direct[p99])
+    record_property("queued_p99", queued[p99])
+    assert client.count == queued_client.count == CALL_NUMBER
+    assert direct[p99] >= REQUEST_TIME
+    assert queued[p99] < direct[p99] / 5
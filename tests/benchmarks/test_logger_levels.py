@@ -0,0 +1,82 @@
+#  Copyright (c) 2023 https://reportportal.io .
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#  https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License
+
+"""This module includes micro-benchmarks for log capturing with chatty third-party loggers."""
+
+import logging
+from typing import Any, Optional
+
+from _pytest.logging import catching_logs
+from reportportal_client import RPLogHandler
+
+from pytest_reportportal.rp_logging import patching_logger_levels
+from tests.benchmarks import best_time
+
+TEST_NUMBER = 200
+CALL_NUMBER = 100
+CHATTY_LOGGERS = ("boto", "urllib3.connectionpool", "sqlalchemy.engine")
+
+
+class RecordCounter:
+    """Log record factory wrapper, which counts created records."""
+
+    def __init__(self) -> None:
+        self.factory = logging.getLogRecordFactory()
+        self.count = 0
+
+    def __call__(self, *args, **kwargs) -> logging.LogRecord:
+        self.count += 1
+        return self.factory(*args, **kwargs)
+
+
+def run_tests(rp_client: Any, level: Optional[int], logger_levels: Optional[dict[str, int]] = None) -> None:
+    loggers = [logging.getLogger(name) for name in CHATTY_LOGGERS]
+    handler = RPLogHandler(level=level or logging.NOTSET, rp_client=rp_client)
+    with patching_logger_levels(logger_levels):
+        for _ in range(TEST_NUMBER):
+            with catching_logs(handler, level=level):
+                for i in range(CALL_NUMBER):
+                    for logger in loggers:
+                        logger.debug("Request %s sent", i)
+
+
+def test_chatty_logger_levels(rp_service, record_property):
+    """Chatty loggers should not create records if their levels are respected or set by the level map."""
+    root_level = logging.getLogger().level
+    logging.getLogger().setLevel(logging.WARNING)
+    counter = RecordCounter()
+    logging.setLogRecordFactory(counter)
+    try:
+        counts = {}
+        times = {}
+        modes = {
+            "lowered root level": (logging.NOTSET, None),
+            "respected levels": (None, None),
+            "logger level map": (logging.NOTSET, {name: logging.WARNING for name in CHATTY_LOGGERS}),
+        }
+        for mode, (level, logger_levels) in modes.items():
+            counter.count = 0
+            times[mode] = best_time(lambda: run_tests(rp_service.rp, level, logger_levels), repeat=1)
+            counts[mode] = counter.count
+    finally:
+        logging.setLogRecordFactory(counter.factory)
+        logging.getLogger().setLevel(root_level)
+
+    for mode in modes:
+        record_property(f"{mode} time", times[mode])
+        record_property(f"{mode} records", counts[mode])
+    assert counts["lowered root level"] == TEST_NUMBER * CALL_NUMBER * len(CHATTY_LOGGERS)
+    assert counts["respected levels"] == 0
+    assert counts["logger level map"] == 0
+    assert times["respected levels"] < times["lowered root level"]
+    assert times["logger level map"] < times["lowered root level"]
@@ -0,0 +1,80 @@
+#  Copyright (c) 2023 https://reportportal.io .
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#  https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License
+
+"""This module includes memory benchmarks for the test tree."""
+
+import gc
+import tracemalloc
+
+from pytest_reportportal.service import ExecStatus, LeafType
+
+ITEM_NUMBER = 10_000
+DESCRIPTION = "Generated test description. " * 20
+
+
+class FakeItem:
+    """Lightweight stand-in for pytest.Item."""
+
+    def __init__(self, index: int) -> None:
+        self.name = f"test_{index}"
+        self.location = (f"tests/test_{index // 10}.py", index, self.name)
+
+    # noinspection PyMethodMayBeStatic
+    def iter_markers(self):
+        return iter(())
+
+
+def run_items(rp_service, items):
+    root = rp_service._create_leaf(LeafType.ROOT, None, None)
+    for item in items:
+        suite_name = item.location[0]
+        suite = root["children"].get(suite_name)
+        if not suite:
+            suite = rp_service._create_leaf(LeafType.FILE, root, suite_name, item_id=suite_name)
+            suite["exec"] = ExecStatus.IN_PROGRESS
+            root["children"][suite_name] = suite
+        leaf = rp_service._create_leaf(LeafType.CODE, suite, item, item_id=item.name)
+        suite["children"][item] = leaf
+        rp_service._tree_path[item] = [root, suite, leaf]
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        for item in items:
+            leaf = rp_service._tree_path[item][-1]
+            leaf["exec"] = ExecStatus.IN_PROGRESS
+            leaf["name"] = item.name
+            leaf["description"] = DESCRIPTION + item.name
+            leaf["parameters"] = {"param": item.name}
+            leaf["code_ref"] = f"{item.location[0]}:{item.name}"
+            leaf["test_case_id"] = leaf["code_ref"] + f"[{item.name}]"
+            leaf["attributes"] = [{"key": "index", "value": item.name}]
+            rp_service.finish_pytest_item(item)
+        gc.collect()
+        return tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+
+
+def test_tree_memory_eviction(rp_service, agent_config, record_property):
+    """Finished item metadata should not be retained with eviction enabled."""
+    agent_config.rp_evict_finished_items = False
+    retained = run_items(rp_service, [FakeItem(i) for i in range(ITEM_NUMBER)])
+    rp_service._tree_path.clear()
+
+    agent_config.rp_evict_finished_items = True
+    retained_evicted = run_items(rp_service, [FakeItem(i) for i in range(ITEM_NUMBER)])
+
+    record_property("retained_memory", retained)
+    record_property("retained_memory_evicted", retained_evicted)
+    assert retained_evicted < retained / 2
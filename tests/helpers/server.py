@@ -0,0 +1,77 @@
+#  Copyright (c) 2023 https://reportportal.io .
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#  https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License
+
+"""This module contains a local ReportPortal stand-in server for unit tests."""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class StandInServer(ThreadingHTTPServer):
+    """Local ReportPortal stand-in, which answers requests to a path with scripted responses.
+
+    Each response can be delayed, the server counts requests which are processed at the same time.
+    """
+
+    def __init__(self, delay: float = 0) -> None:
+        super().__init__(("127.0.0.1", 0), StandInHandler)
+        self.scripts = {}
+        self.requests = []
+        self.bodies = []
+        self.delay = delay
+        self.active = 0
+        self.peak_active = 0
+        self.lock = threading.Lock()
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+
+    @property
+    def endpoint(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def attempts(self, path_part: str) -> int:
+        return len([path for _, path in self.requests if path_part in path])
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    def _respond(self) -> None:
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length)
+        server = self.server
+        with server.lock:
+            server.requests.append((self.command, self.path))
+            server.bodies.append((self.path, body))
+            server.active += 1
+            server.peak_active = max(server.peak_active, server.active)
+        time.sleep(server.delay)
+        status, headers, body = 200, {}, {}
+        for path_part, script in self.server.scripts.items():
+            if path_part in self.path and script:
+                status, headers, body = script.pop(0) if len(script) > 1 else script[0]
+                break
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+        with server.lock:
+            server.active -= 1
+
+    do_GET = do_POST = do_PUT = _respond
+
+    def log_message(self, *args) -> None:
+        pass
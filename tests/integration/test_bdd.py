@@ -16,6 +16,7 @@ import importlib.metadata
 from unittest import mock
 
 import pytest
+from reportportal_client.helpers import markdown_helpers
 
 from tests import REPORT_PORTAL_SERVICE
 from tests.helpers import utils
@@ -1081,3 +1082,109 @@ def test_rp_tests_attributes_bdd_tags(mock_client_init):
     assert {"key": "test_key", "value": "test_value"} in attributes
     assert {"value": "ok"} in attributes
     assert {"key": "key", "value": "value"} in attributes
+
+
+@mock.patch(REPORT_PORTAL_SERVICE)
+def test_bdd_steps_mode_buffered_background(mock_client_init):
+    mock_client = setup_mock_for_logging(mock_client_init)
+    variables = {"rp_bdd_steps_mode": "buffered"}
+    variables.update(utils.DEFAULT_VARIABLES.items())
+    result = utils.run_pytest_tests(tests=["examples/bdd/step_defs/test_background_two_steps.py"], variables=variables)
+    assert int(result) == 0, "Exit code should be 0 (no errors)"
+
+    start_calls = mock_client.start_test_item.call_args_list
+    assert len(start_calls) == 5
+    scenario_name = start_calls[0][1]["name"]
+    background_call, nested_step_call_1, nested_step_call_2, scenario_step_call = start_calls[1:]
+    assert background_call[0][0] == "Background"
+    assert background_call[1]["has_stats"] is False
+    assert background_call[1]["parent_item_id"].startswith(scenario_name)
+    assert nested_step_call_1[0][0] == "Given I have first empty step"
+    assert nested_step_call_2[0][0] == "And I have second empty step"
+    assert nested_step_call_1[1]["parent_item_id"] == nested_step_call_2[1]["parent_item_id"]
+    assert nested_step_call_1[1]["parent_item_id"].startswith("Background")
+    assert scenario_step_call[0][0] == "Then I have main step"
+    assert scenario_step_call[1]["parent_item_id"] == background_call[1]["parent_item_id"]
+    assert background_call[0][1] <= nested_step_call_1[0][1] <= nested_step_call_2[0][1] <= scenario_step_call[0][1]
+
+    finish_calls = mock_client.finish_test_item.call_args_list
+    assert len(finish_calls) == 5
+    assert [finish_call[1]["status"] for finish_call in finish_calls] == ["PASSED"] * 5
+    assert finish_calls[-1][1]["item_id"].startswith(scenario_name)
+
+
+@mock.patch(REPORT_PORTAL_SERVICE)
+def test_bdd_steps_mode_buffered_failed_step(mock_client_init):
+    mock_client = setup_mock_for_logging(mock_client_init)
+    variables = {"rp_bdd_steps_mode": "buffered"}
+    variables.update(utils.DEFAULT_VARIABLES.items())
+    result = utils.run_pytest_tests(tests=["examples/bdd/step_defs/test_failed_step.py"], variables=variables)
+    assert int(result) == 1, "Exit code should be 1 (test error)"
+
+    finish_calls = mock_client.finish_test_item.call_args_list
+    assert len(finish_calls) == 2
+    step_item_id = finish_calls[0][0][0]
+    assert step_item_id.startswith("Given I have a failed step")
+    assert finish_calls[0][1]["status"] == "FAILED"
+    assert finish_calls[1][1]["status"] == "FAILED"
+
+    traceback_logs = [
+        log_call[1] for log_call in mock_client.log.call_args_list if log_call[1]["item_id"] == step_item_id
+    ]
+    assert len(traceback_logs) == 1
+    assert traceback_logs[0]["level"] == "ERROR"
+    assert traceback_logs[0]["message"].endswith("AssertionError: assert False\n")
+
+
+@mock.patch(REPORT_PORTAL_SERVICE)
+def test_bdd_steps_mode_log(mock_client_init):
+    mock_client = setup_mock_for_logging(mock_client_init)
+    variables = {"rp_bdd_steps_mode": "log"}
+    variables.update(utils.DEFAULT_VARIABLES.items())
+    result = utils.run_pytest_tests(tests=["examples/bdd/step_defs/test_failed_step.py"], variables=variables)
+    assert int(result) == 1, "Exit code should be 1 (test error)"
+
+    assert mock_client.start_test_item.call_count == 1, "Steps should not be reported as test items"
+    scenario_id = mock_client.finish_test_item.call_args_list[0][1]["item_id"]
+    scenario_logs = [
+        log_call[1] for log_call in mock_client.log.call_args_list if log_call[1]["item_id"] == scenario_id
+    ]
+    table_log = scenario_logs[0]
+    assert table_log["level"] == "INFO"
+    assert table_log["message"].startswith(markdown_helpers.MARKDOWN_MODE)
+    assert "Given I have a failed step" in table_log["message"]
+    assert "FAILED" in table_log["message"]
+    traceback_log = scenario_logs[1]
+    assert traceback_log["level"] == "ERROR"
+    assert traceback_log["message"].startswith("Given I have a failed step\n")
+    assert traceback_log["message"].endswith("AssertionError: assert False\n")
+
+
+@pytest.mark.parametrize("rp_bdd_steps_mode", ["NESTED", "BUFFERED"])
+@mock.patch(REPORT_PORTAL_SERVICE)
+def test_bdd_background_once(mock_client_init, rp_bdd_steps_mode):
+    mock_client = setup_mock_for_logging(mock_client_init)
+    variables = {"rp_bdd_background_once": True, "rp_bdd_steps_mode": rp_bdd_steps_mode}
+    variables.update(utils.DEFAULT_VARIABLES.items())
+    result = utils.run_pytest_tests(
+        tests=["examples/bdd/step_defs/test_background_failed_scenario.py"], variables=variables
+    )
+    assert int(result) == 1, "Exit code should be 1 (test error)"
+
+    start_calls = mock_client.start_test_item.call_args_list
+    scenario_names = [call[1]["name"] for call in start_calls if "name" in call[1]]
+    assert len(scenario_names) == 3
+    background_calls = [call for call in start_calls if call[0] and call[0][0] == "Background"]
+    assert len(background_calls) == 2, "Background should be reported for the first and the failed scenarios only"
+    assert background_calls[0][1]["parent_item_id"].startswith(scenario_names[0])
+    assert background_calls[1][1]["parent_item_id"].startswith(scenario_names[2])
+    background_step_calls = [call for call in start_calls if call[0] and call[0][0] == "Given I have empty step"]
+    assert len(background_step_calls) == 2
+    assert background_calls[0][0][1] <= background_step_calls[0][0][1]
+
+    finish_statuses = {
+        call[0][0]: call[1]["status"] for call in mock_client.finish_test_item.call_args_list if call[0]
+    }
+    background_ids = [item_id for item_id in finish_statuses if item_id.startswith("Background")]
+    assert len(background_ids) == 2
+    assert all(finish_statuses[item_id] == "PASSED" for item_id in background_ids)
@@ -13,6 +13,8 @@
 
 """This module includes integration tests for configuration parameters."""
 
+import gzip
+import logging
 import warnings
 from unittest import mock
 
@@ -20,9 +22,16 @@ import pytest
 from delayed_assert import assert_expectations, expect
 from reportportal_client import OutputType
 
-from examples import test_rp_custom_logging, test_rp_logging
+from examples import (
+    test_rp_custom_logging,
+    test_rp_logging,
+    test_rp_logging_burst,
+    test_rp_logging_fail,
+    test_rp_logging_levels,
+)
 from tests import REPORT_PORTAL_SERVICE
 from tests.helpers import utils
+from tests.helpers.server import StandInServer
 from tests.integration import setup_mock_for_logging
 
 TEST_LAUNCH_ID = "test_launch_id"
@@ -290,3 +299,251 @@ def test_rp_log_custom_levels(mock_client_init):
     mock_client = mock_client_init.return_value
     assert mock_client.log.call_count == 1
     assert mock_client.log.call_args_list[0][1]["level"] == custom_log_name
+
+
+@pytest.mark.parametrize("test", ["examples/test_simple.py", "examples/empty/"])
+@mock.patch(REPORT_PORTAL_SERVICE)
+def test_rp_launch_start_background(mock_client_init, test):
+    """Verify that the launch started in background is joined before items and the launch finish.
+
+    :param mock_client_init: Pytest fixture
+    """
+    mock_client = mock_client_init.return_value
+    mock_client.start_launch.side_effect = lambda **kwargs: TEST_LAUNCH_ID
+    variables = {"rp_launch_start_background": True}
+    variables.update(utils.DEFAULT_VARIABLES.items())
+    result = utils.run_pytest_tests(tests=[test], variables=variables)
+    assert int(result) in (0, 5), "Exit code should be 0 (no errors) or 5 (no tests collected)"
+
+    expect(mock_client.start_launch.call_count == 1, '"start_launch" method was not called')
+    expect(mock_client.finish_launch.call_count == 1, '"finish_launch" method was not called')
+    method_names = [name for name, _, _ in mock_client.method_calls if name in ("start_launch", "finish_launch")]
+    expect(method_names == ["start_launch", "finish_launch"])
+    start_call_args = mock_client.start_test_item.call_args_list
+    expect(len(start_call_args) == mock_client.finish_test_item.call_count)
+    assert_expectations()
+
+
+@pytest.mark.parametrize(
+    "policy, test, expected_messages",
+    [
+        ("ALWAYS", "examples/test_rp_logging.py", [test_rp_logging.LOG_MESSAGE]),
+        ("ON_FAILURE", "examples/test_rp_logging.py", []),
+        ("ON_FAILURE", "examples/test_rp_logging_fail.py", [test_rp_logging_fail.LOG_MESSAGE]),
+        ("ON_FAILURE_OR_RERUN", "examples/test_rp_logging.py", []),
+    ],
+)
+@mock.patch(REPORT_PORTAL_SERVICE)
+def test_rp_log_upload_policy(mock_client_init, policy, test, expected_messages):
+    """Verify that captured logs are uploaded only for items the policy requires.
+
+    :param mock_client_init: Pytest fixture
+    """
+    variables = {"rp_log_upload_policy": policy}
+    variables.update(utils.DEFAULT_VARIABLES.items())
+
+    mock_client = mock_client_init.return_value
+    utils.run_tests_with_client(mock_client, [test], variables=variables)
+
+    messages = [call[0][1] for call in mock_client.log.call_args_list if call[1].get("level") != "ERROR"]
+    assert messages == expected_messages
+
+
+@pytest.mark.parametrize("dedup, attribute", [(False, True), (True, False), (True, True)])
+@mock.patch(REPORT_PORTAL_SERVICE)
+def test_rp_failure_dedup(mock_client_init, dedup, attribute):
+    """Verify that the same failure traceback is sent in full only once and tagged with its signature.
+
+    :param mock_client_init: Pytest fixture
+    """
+    mock_client = mock_client_init.return_value
+    mock_client.start_test_item.side_effect = utils.item_id_gen
+    variables = {"rp_failure_dedup": dedup, "rp_failure_signature_attribute": attribute}
+    variables.update(utils.DEFAULT_VARIABLES.items())
+    result = utils.run_pytest_tests(tests=["examples/test_failure_signature.py"], variables=variables)
+    assert int(result) == 1, "Exit code should be 1 (test failures)"
+
+    messages = [call[1]["message"] for call in mock_client.log.call_args_list]
+    full_messages = [message for message in messages if "ConnectionError" in message]
+    expect(len(messages) == 4)
+    expect(len(full_messages) == (1 if dedup else 3))
+    signatures = []
+    for _, kwargs in mock_client.finish_test_item.call_args_list:
+        signature = [a["value"] for a in kwargs["attributes"] or [] if a.get("key") == "failure_signature"]
+        signatures.append(signature[0] if signature else None)
+    if attribute:
+        expect(len(set(signatures[:3])) == 1)
+        expect(signatures[3] not in (None, signatures[0]))
+        if dedup:
+            expect(all(message.startswith("Failure signature: " + signatures[0]) for message in messages[:3]))
+    else:
+        expect(signatures == [None] * 4)
+    assert_expectations()
+
+
+@pytest.mark.parametrize(
+    "variables, expected_truncated, expected_attachment",
+    [
+        ({}, False, False),
+        ({"rp_traceback_style": "short"}, False, False),
+        ({"rp_traceback_max_bytes": 2000}, True, False),
+        ({"rp_traceback_max_bytes": 2000, "rp_traceback_attach_full": True}, True, True),
+        ({"rp_traceback_max_bytes": 2000, "rp_failure_dedup": True}, True, False),
+    ],
+)
+@mock.patch(REPORT_PORTAL_SERVICE)
+def test_rp_traceback_style_and_size(mock_client_init, variables, expected_truncated, expected_attachment):
+    """Verify that failure tracebacks are rendered in the configured style and truncated to the configured size.
+
+    :param mock_client_init: Pytest fixture
+    """
+    variables = dict(variables, **utils.DEFAULT_VARIABLES)
+    mock_client = mock_client_init.return_value
+    result = utils.run_pytest_tests(tests=["examples/test_deep_traceback.py"], variables=variables)
+    assert int(result) == 1, "Exit code should be 1 (test failures)"
+
+    assert mock_client.log.call_count == 1
+    log_kwargs = mock_client.log.call_args[1]
+    message = log_kwargs["message"]
+    expect("ValueError: Failed at the bottom" in message)
+    expect(("bytes truncated" in message) == expected_truncated)
+    if expected_truncated:
+        expect(len(message.encode("utf-8")) <= 2000)
+    if "rp_traceback_style" in variables:
+        expect("payload = " not in message)
+    else:
+        expect("payload = " in message)
+    attachment = log_kwargs.get("attachment")
+    expect(bool(attachment) == expected_attachment)
+    if attachment:
+        full_text = gzip.decompress(attachment["data"]).decode("utf-8")
+        expect(len(full_text.encode("utf-8")) > 2000)
+        expect(full_text.endswith(message[-100:]))
+    assert_expectations()
+
+
+@pytest.mark.parametrize(
+    "variables, expected_messages",
+    [
+        ({}, [test_rp_logging_levels.THIRD_PARTY_MESSAGE, test_rp_logging_levels.LOG_MESSAGE]),
+        ({"rp_log_logger_levels": "third_party:WARNING"}, [test_rp_logging_levels.LOG_MESSAGE]),
+        ({"rp_log_respect_levels": True}, [test_rp_logging_levels.LOG_MESSAGE]),
+    ],
+)
+@mock.patch(REPORT_PORTAL_SERVICE)
+def test_rp_log_levels(mock_client_init, variables, expected_messages):
+    """Verify that logger levels are set from the level map and respected if configured.
+
+    :param mock_client_init: Pytest fixture
+    """
+    variables = dict(variables, **utils.DEFAULT_VARIABLES)
+    mock_client = mock_client_init.return_value
+    result = utils.run_tests_with_client(mock_client, ["examples/test_rp_logging_levels.py"], variables=variables)
+    assert int(result) == 0, "Exit code should be 0 (no errors)"
+
+    messages = [call[0][1] for call in mock_client.log.call_args_list]
+    assert messages == expected_messages
+    assert logging.getLogger("third_party").level == logging.NOTSET
+
+
+@pytest.mark.parametrize("window, max_length, expected_info_entries", [(0, 16384, 150), (60, 16384, 1), (60, 500, 4)])
+@mock.patch(REPORT_PORTAL_SERVICE)
+def test_rp_log_coalesce(mock_client_init, window, max_length, expected_info_entries):
+    """Verify that bursts of log records are merged into multi-line entries.
+
+    :param mock_client_init: Pytest fixture
+    """
+    variables = {"rp_log_coalesce_window": window, "rp_log_coalesce_max_length": max_length}
+    variables.update(utils.DEFAULT_VARIABLES.items())
+    mock_client = mock_client_init.return_value
+    result = utils.run_tests_with_client(mock_client, ["examples/test_rp_logging_burst.py"], variables=variables)
+    assert int(result) == 0, "Exit code should be 0 (no errors)"
+
+    entries = [
+        (args[1], args[2] if len(args) > 2 else kwargs["level"]) for args, kwargs in mock_client.log.call_args_list
+    ]
+    info_messages = [message for message, level in entries if level == "INFO"]
+    expect(len(info_messages) == expected_info_entries)
+    expect([message for message, level in entries if level == "WARN"] == [test_rp_logging_burst.DONE_MESSAGE])
+    expect(all(len(message) <= max_length for message in info_messages))
+    lines = "\n".join(info_messages).splitlines()
+    processing_lines = [
+        test_rp_logging_burst.PROCESSING_MESSAGE.format(i) for i in range(test_rp_logging_burst.ITEM_NUMBER)
+    ]
+    expect(lines[: test_rp_logging_burst.ITEM_NUMBER] == processing_lines)
+    if window:
+        waiting_line = f"{test_rp_logging_burst.WAITING_MESSAGE} [repeated {test_rp_logging_burst.WAIT_NUMBER} times]"
+        expect(lines[test_rp_logging_burst.ITEM_NUMBER :] == [waiting_line])
+    assert_expectations()
+
+
+@pytest.mark.parametrize(
+    "overflow, window, expected_info_entries",
+    [("BLOCK", 0, 150), ("SPILL", 0, 150), ("DROP_OLDEST", 0, None), ("BLOCK", 60, 1)],
+)
+@mock.patch(REPORT_PORTAL_SERVICE)
+def test_rp_log_queue(mock_client_init, overflow, window, expected_info_entries):
+    """Verify that log records are sent through the log queue with the item they were emitted in.
+
+    :param mock_client_init: Pytest fixture
+    """
+    variables = {"rp_log_queue_size": 10, "rp_log_queue_overflow": overflow, "rp_log_coalesce_window": window}
+    variables.update(utils.DEFAULT_VARIABLES.items())
+    mock_client = mock_client_init.return_value
+    result = utils.run_tests_with_client(mock_client, ["examples/test_rp_logging_burst.py"], variables=variables)
+    assert int(result) == 0, "Exit code should be 0 (no errors)"
+
+    entries = [
+        (args[1], args[2] if len(args) > 2 else kwargs["level"], args[4] if len(args) > 4 else kwargs["item_id"])
+        for args, kwargs in mock_client.log.call_args_list
+    ]
+    info_messages = [message for message, level, _ in entries if level == "INFO"]
+    if expected_info_entries is None:
+        expect(0 < len(info_messages) <= 150)
+    else:
+        expect(len(info_messages) == expected_info_entries)
+    expect([message for message, level, _ in entries if level == "WARN"] == [test_rp_logging_burst.DONE_MESSAGE])
+    expect(all(item_id == mock_client.current_item.return_value for _, _, item_id in entries))
+    if overflow != "DROP_OLDEST" and not window:
+        # Spilled records are sent after the queued ones, but still in the order they were emitted
+        expect(
+            info_messages
+            == [test_rp_logging_burst.PROCESSING_MESSAGE.format(i) for i in range(test_rp_logging_burst.ITEM_NUMBER)]
+            + [test_rp_logging_burst.WAITING_MESSAGE] * test_rp_logging_burst.WAIT_NUMBER
+        )
+    assert_expectations()
+
+
+@pytest.mark.parametrize("client_type", ["ASYNC_THREAD", "ASYNC_BATCHED"])
+def test_rp_log_queue_async_clients(client_type):
+    """Verify that log records are sent through the log queue by real asynchronous clients.
+
+    :param client_type: ReportPortal client type
+    """
+    server = StandInServer()
+    server.scripts["/launch"] = [(200, {}, {"id": TEST_LAUNCH_ID})]
+    server.scripts["/item"] = [(200, {}, {"id": "test_item_id"})]
+    server.scripts["/log"] = [(200, {}, {"responses": [{"id": "test_log_id"}]})]
+    variables = dict(utils.DEFAULT_VARIABLES)
+    variables.update(
+        {
+            "rp_endpoint": server.endpoint,
+            "rp_client_type": client_type,
+            "rp_log_batch_size": 1,
+            "rp_log_queue_size": 10,
+            "rp_log_max_pending": 2,
+        }
+    )
+    try:
+        with warnings.catch_warnings(record=True) as w:
+            warnings.simplefilter("always")
+            result = utils.run_pytest_tests(tests=["examples/test_rp_logging_burst.py"], variables=variables)
+    finally:
+        server.shutdown()
+    assert int(result) == 0, "Exit code should be 0 (no errors)"
+
+    warning_messages = [str(warning.message) for warning in w if warning.category is RuntimeWarning]
+    for option in ("rp_log_queue_size", "rp_log_max_pending"):
+        expect(any(option in message for message in warning_messages) == (client_type == "ASYNC_BATCHED"))
+    expect(server.attempts("/log") == test_rp_logging_burst.ITEM_NUMBER + test_rp_logging_burst.WAIT_NUMBER + 1)
+    assert_expectations()
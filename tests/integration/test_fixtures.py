@@ -604,3 +604,106 @@ def test_fixture_exit(mock_client_init):
 
     call_args = mock_client.finish_test_item.call_args_list
     assert len(call_args) == 2, 'Incorrect number of "finish_test_item" calls'
+
+
+def run_buffered_tests(test_path, threshold=0, should_fail=False):
+    variables = dict(utils.DEFAULT_VARIABLES)
+    variables["rp_report_fixtures"] = True
+    variables["rp_report_fixtures_buffered"] = True
+    variables["rp_report_fixtures_threshold"] = threshold
+    result = utils.run_pytest_tests(tests=[test_path], variables=variables)
+    if should_fail:
+        assert int(result) == 1, "Exit code should be 1 (test failure)"
+    else:
+        assert int(result) == 0, "Exit code should be 0 (no errors)"
+
+
+@mock.patch(REPORT_PORTAL_SERVICE)
+def test_fixture_buffered(mock_client_init):
+    mock_client = setup_mock_for_logging(mock_client_init)
+
+    test_path = "examples/fixtures/test_fixture_teardown"
+    run_buffered_tests(test_path)
+
+    start_count = mock_client.start_test_item.call_count
+    finish_count = mock_client.finish_test_item.call_count
+    assert start_count == 3, 'Incorrect number of "start_test_item" calls'
+    assert finish_count == 3, 'Incorrect number of "finish_test_item" calls'
+
+    test_item_id = mock_client.finish_test_item.call_args_list[-1][1]["item_id"]
+    assert test_item_id.startswith(
+        "examples/fixtures/test_fixture_teardown/test_fixture_teardown.py::test_fixture_teardown_"
+    )
+    fixture_name = f'{test_path.split("/")[-1]}_config'
+    call_args = mock_client.start_test_item.call_args_list
+    assert call_args[1][0][0] == f"function fixture setup: {fixture_name}"
+    assert call_args[2][0][0] == f"function fixture teardown: {fixture_name}"
+    for call in call_args[1:]:
+        assert not call[1]["has_stats"]
+        assert call[1]["parent_item_id"] == test_item_id
+
+    finish_call_args = mock_client.finish_test_item.call_args_list
+    for call in finish_call_args[:-1]:
+        assert call[1]["status"] == "PASSED"
+
+    log_call_args_list = mock_client.log.call_args_list
+    assert len(log_call_args_list) == 2, 'Incorrect number of "log" calls'
+    for call in log_call_args_list:
+        assert call[1]["item_id"] == test_item_id
+
+
+@mock.patch(REPORT_PORTAL_SERVICE)
+def test_fixture_buffered_threshold(mock_client_init):
+    mock_client = setup_mock_for_logging(mock_client_init)
+
+    run_buffered_tests("examples/fixtures/test_fixture_teardown", threshold=10)
+
+    assert mock_client.start_test_item.call_count == 1, 'Incorrect number of "start_test_item" calls'
+    assert mock_client.finish_test_item.call_count == 1, 'Incorrect number of "finish_test_item" calls'
+
+
+@mock.patch(REPORT_PORTAL_SERVICE)
+def test_fixture_buffered_threshold_failure(mock_client_init):
+    mock_client = setup_mock_for_logging(mock_client_init)
+
+    test_path = "examples/fixtures/test_fixture_setup_failure"
+    run_buffered_tests(test_path, threshold=10, should_fail=True)
+
+    start_count = mock_client.start_test_item.call_count
+    finish_count = mock_client.finish_test_item.call_count
+    assert start_count == 2, 'Incorrect number of "start_test_item" calls'
+    assert finish_count == 2, 'Incorrect number of "finish_test_item" calls'
+
+    call_args = mock_client.start_test_item.call_args_list
+    step_name = f"function fixture setup: {test_path.split('/')[-1]}_config"
+    assert call_args[1][0][0] == step_name
+
+    finish_call_args = mock_client.finish_test_item.call_args_list
+    assert finish_call_args[0][1]["status"] == "FAILED"
+
+    log_call_args_list = mock_client.log.call_args_list
+    fixture_logs = [call[1] for call in log_call_args_list if str(call[1].get("item_id")).startswith(step_name)]
+    assert len(fixture_logs) == 2
+    assert fixture_logs[0]["message"] == FIXTURE_FAILED_MESSAGE
+    assert fixture_logs[1]["message"].startswith("Traceback (most recent call last):")
+
+
+@mock.patch(REPORT_PORTAL_SERVICE)
+def test_fixture_aggregate_passed(mock_client_init):
+    mock_client = setup_mock_for_logging(mock_client_init)
+
+    variables = dict(utils.DEFAULT_VARIABLES)
+    variables["rp_report_fixtures"] = True
+    variables["rp_aggregate_passed"] = True
+    variables["rp_parent_item_id"] = "parent_item"
+    result = utils.run_pytest_tests(tests=["examples/fixtures/test_fixture_setup_failure"], variables=variables)
+    assert int(result) == 1, "Exit code should be 1 (test failure)"
+
+    call_args = mock_client.start_test_item.call_args_list
+    step_name = "function fixture setup: test_fixture_setup_failure_config"
+    test_calls = [call for call in call_args if call[1].get("item_type") == "STEP"]
+    fixture_calls = [call for call in call_args if call[0] and call[0][0] == step_name]
+    assert len(test_calls) == 1
+    assert len(fixture_calls) == 1
+    # The fixture is reported under the test started on its finish, not under the suite
+    assert fixture_calls[0][1]["parent_item_id"].startswith(test_calls[0][1]["name"])
@@ -66,3 +66,44 @@ def test_simple_tests(mock_client_init, test, expected_run_status, expected_item
     assert "end_time" in finish_launch_call_args[0][1]
     assert finish_launch_call_args[0][1]["end_time"] is not None
     assert "status" not in finish_launch_call_args[0][1]
+
+
+@pytest.mark.parametrize("hierarchy_code", [False, True])
+@mock.patch(REPORT_PORTAL_SERVICE)
+def test_aggregate_passed(mock_client_init, hierarchy_code):
+    """Verify that passed tests are reported as a summary log of their suite, while others are reported as usual.
+
+    :param mock_client_init: mocked Report Portal client Pytest fixture
+    :param hierarchy_code:   report classes as suites
+    """
+    mock_client = mock_client_init.return_value
+    mock_client.start_test_item.side_effect = utils.item_id_gen
+    variables = {"rp_aggregate_passed": True, "rp_hierarchy_code": hierarchy_code}
+    variables.update(utils.DEFAULT_VARIABLES.items())
+
+    tests = [
+        "examples/hierarchy/test_in_class.py",
+        "examples/test_simple_fail.py",
+        "examples/skip/test_simple_skip.py",
+    ]
+    result = utils.run_pytest_tests(tests=tests, variables=variables)
+    assert int(result) == 1, "Exit code should be 1 (test failures)"
+
+    start_call_args = mock_client.start_test_item.call_args_list
+    step_names = [kwargs["name"].split("::")[-1] for _, kwargs in start_call_args if kwargs["item_type"] == "STEP"]
+    assert len(start_call_args) == mock_client.finish_test_item.call_count
+
+    summary_logs = [call[1] for call in mock_client.log.call_args_list if call[1].get("attachment")]
+    suite_names = [kwargs["name"] for _, kwargs in start_call_args if kwargs["item_type"] == "SUITE"]
+    if hierarchy_code:
+        assert step_names == ["test_simple_fail", "test_simple_skip"]
+        assert "Tests" in suite_names
+        assert len(summary_logs) == 1
+        assert summary_logs[0]["message"].startswith("1 tests passed in ")
+        assert summary_logs[0]["attachment"]["data"].decode("utf-8").endswith("test_in_class")
+        assert summary_logs[0]["item_id"].startswith("Tests-")
+    else:
+        # There is no suite to summarize passed tests in, so they are reported as usual
+        assert step_names == ["test_in_class", "test_simple_fail", "test_simple_skip"]
+        assert suite_names == []
+        assert summary_logs == []
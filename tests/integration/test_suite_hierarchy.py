@@ -50,3 +50,22 @@ def test_rp_hierarchy_parameters(mock_client_init, test, variables, expected_ite
     assert int(result) == 0, "Exit code should be 0 (no errors)"
 
     verify_start_item_parameters(mock_client, expected_items)
+
+
+@pytest.mark.parametrize(("test", "variables", "expected_items"), HIERARCHY_TEST_PARAMETERS)
+@mock.patch(REPORT_PORTAL_SERVICE)
+def test_rp_hierarchy_parameters_lazy_item_paths(mock_client_init, test, variables, expected_items):
+    """Verify that lazily resolved item paths produce the same suite hierarchy.
+
+    :param mock_client_init: Pytest fixture
+    """
+    mock_client = mock_client_init.return_value
+    mock_client.start_test_item.side_effect = utils.item_id_gen
+
+    variables = dict(variables)
+    variables["rp_lazy_item_paths"] = True
+    result = utils.run_pytest_tests(tests=test, variables=variables)
+    assert int(result) == 0, "Exit code should be 0 (no errors)"
+
+    verify_start_item_parameters(mock_client, expected_items)
+    assert mock_client.finish_test_item.call_count == mock_client.start_test_item.call_count
@@ -0,0 +1,58 @@
+#  Copyright (c) 2023 https://reportportal.io .
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#  https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License
+
+"""This module includes integration tests of runs with xdist workers against a local stand-in server."""
+
+import pytest
+
+from tests.helpers import utils
+from tests.helpers.server import StandInServer
+
+pytest.importorskip("xdist")
+
+
+@pytest.fixture()
+def server():
+    server = StandInServer()
+    server.scripts["/launch"] = [(200, {}, {"id": "launch_id", "message": "Launch finished"})]
+    server.scripts["/item"] = [(200, {}, {"id": "item_id", "message": "Item finished"})]
+    server.scripts["/log"] = [(200, {}, {"responses": [{"id": "log_id"}]})]
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def run_xdist_tests(server: StandInServer, tests: list[str], variables: dict) -> int:
+    run_variables = dict(utils.DEFAULT_VARIABLES)
+    run_variables.update({"rp_endpoint": server.endpoint, "rp_log_batch_size": 1})
+    run_variables.update(variables)
+    return int(utils.run_pytest_tests(tests=tests, args=["-n", "2"], variables=run_variables))
+
+
+def test_xdist_failure_dedup(server):
+    """Verify that xdist workers on the same host send the same failure traceback in full only once."""
+    result = run_xdist_tests(server, ["examples/test_failure_signature.py"], {"rp_failure_dedup": True})
+    assert result == 1, "Exit code should be 1 (test failures)"
+
+    log_bodies = [body for path, body in server.bodies if "/log" in path]
+    assert len([body for body in log_bodies if b"ConnectionError" in body]) == 1
+    assert len([body for body in log_bodies if b"the same failure traceback is reported for" in body]) == 2
+
+
+def test_xdist_circuit_breaker(server):
+    """Verify that the controller passes its service with the circuit breaker to xdist workers."""
+    result = run_xdist_tests(
+        server, ["examples/test_simple.py", "examples/test_rp_logging.py"], {"rp_circuit_breaker_failures": 3}
+    )
+    assert result == 0, "Exit code should be 0 (no errors)"
+    assert server.attempts("/item") >= 4
@@ -66,6 +66,38 @@ def mocked_config():
     mocked_config.option.rp_launch_uuid_print_output = "STDOUT"
     mocked_config.option.rp_client_type = "SYNC"
     mocked_config.option.rp_report_fixtures = "False"
+    mocked_config.option.rp_report_fixtures_buffered = "False"
+    mocked_config.option.rp_report_fixtures_threshold = "0"
+    mocked_config.option.rp_description_max_length = "0"
+    mocked_config.option.rp_description_skip_oversized = "False"
+    mocked_config.option.rp_evict_finished_items = "False"
+    mocked_config.option.rp_bdd_steps_mode = "NESTED"
+    mocked_config.option.rp_bdd_background_once = "False"
+    mocked_config.option.rp_lazy_item_paths = "False"
+    mocked_config.option.rp_launch_start_background = "False"
+    mocked_config.option.rp_log_upload_policy = "ALWAYS"
+    mocked_config.option.rp_log_buffer_size = "1000"
+    mocked_config.option.rp_aggregate_passed = "False"
+    mocked_config.option.rp_failure_dedup = "False"
+    mocked_config.option.rp_failure_signature_attribute = "False"
+    mocked_config.option.rp_traceback_style = ""
+    mocked_config.option.rp_traceback_max_bytes = "0"
+    mocked_config.option.rp_traceback_attach_full = "False"
+    mocked_config.option.rp_log_coalesce_window = "0"
+    mocked_config.option.rp_log_coalesce_max_length = "16384"
+    mocked_config.option.rp_log_queue_size = "0"
+    mocked_config.option.rp_log_queue_overflow = "BLOCK"
+    mocked_config.option.rp_log_max_pending = "0"
+    mocked_config.option.rp_circuit_breaker_failures = "0"
+    mocked_config.option.rp_circuit_breaker_reset_timeout = "60"
+    mocked_config.option.rp_circuit_breaker_journal_dir = ""
+    mocked_config.option.rp_retry_backoff = "0"
+    mocked_config.option.rp_retry_max_delay = "30"
+    mocked_config.option.rp_retry_budgets = ""
+    mocked_config.option.rp_retry_worker_budget = "0"
+    mocked_config.option.rp_max_requests_per_second = "0"
+    mocked_config.option.rp_max_bytes_per_second = "0"
+    mocked_config.option.rp_log_respect_levels = "False"
     mocked_config.option.rp_hierarchy_code = "False"
     mocked_config.option.rp_hierarchy_dirs = "False"
     mocked_config.option.rp_hierarchy_test_file = "True"
@@ -0,0 +1,187 @@
+#  Copyright (c) 2022 https://reportportal.io .
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#  https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License
+
+
+import os
+import pickle
+from uuid import uuid4
+
+from reportportal_client.helpers import LifoQueue
+
+from pytest_reportportal.circuit_breaker import CircuitBreakerClient, replay_journal
+
+
+class FakeClient:
+    """Synchronous client stand-in, which returns None on requests while the server is down."""
+
+    def __init__(self) -> None:
+        self.launch_uuid = "launch"
+        self.available = True
+        self.attempts = 0
+        self.requests = []
+        self._item_stack = LifoQueue()
+
+    def _request(self, method, result, **kwargs):
+        self.attempts += 1
+        if not self.available:
+            return None
+        self.requests.append((method, kwargs))
+        return result
+
+    def _add_current_item(self, item):
+        self._item_stack.put(item)
+
+    def _remove_current_item(self):
+        return self._item_stack.get()
+
+    def current_item(self):
+        return self._item_stack.last()
+
+    def start_test_item(self, name, start_time, item_type, parent_item_id=None, uuid=None, **_):
+        uuid = uuid or str(uuid4())
+        item_id = self._request("start_test_item", uuid, name=name, parent_item_id=parent_item_id, uuid=uuid)
+        if item_id:
+            self._add_current_item(item_id)
+        return item_id
+
+    def finish_test_item(self, item_id, end_time, status=None, **_):
+        result = self._request("finish_test_item", "finished", item_id=item_id, status=status)
+        if result:
+            self._remove_current_item()
+        return result
+
+    def log(self, time, message, level=None, attachment=None, item_id=None):
+        self.requests.append(("log", {"message": message, "item_id": item_id}))
+
+    def finish_launch(self, end_time, status=None, **_):
+        return self._request("finish_launch", "finished", status=status)
+
+    def clone(self):
+        cloned = FakeClient()
+        cloned.requests = self.requests
+        cloned._add_current_item(self.current_item())
+        return cloned
+
+    def close(self):
+        pass
+
+
+def run_tests(client, suite_id, count):
+    for i in range(count):
+        item_id = client.start_test_item(f"test_{i}", "0", "step", parent_item_id=suite_id)
+        client.log("0", f"Log {i}", level="INFO", item_id=item_id)
+        client.finish_test_item(item_id, "0", status="PASSED")
+
+
+def test_circuit_breaker_journal_replay(tmp_path):
+    """Verify that the open breaker writes requests to the journal and replays them when the server is back."""
+    client = FakeClient()
+    breaker = CircuitBreakerClient(client, 1, 3600, str(tmp_path))
+    suite_id = breaker.start_test_item("Suite", "0", "suite")
+    client.available = False
+    run_tests(breaker, suite_id, 5)
+
+    assert client.attempts == 2
+    assert breaker.opened_at is not None
+    assert len(breaker.journal) == 5 * 3
+    assert breaker.current_item() == suite_id
+
+    client.available = True
+    breaker.reset_timeout = 0
+    breaker.finish_test_item(suite_id, "0", status="PASSED")
+    assert breaker.opened_at is None
+    assert len(breaker.journal) == 0
+    assert breaker.current_item() is None
+    started = [kwargs for name, kwargs in client.requests if name == "start_test_item"]
+    assert [kwargs["name"] for kwargs in started] == ["Suite"] + [f"test_{i}" for i in range(5)]
+    assert all(kwargs["parent_item_id"] == suite_id for kwargs in started[1:])
+    item_ids = [kwargs["uuid"] for kwargs in started[1:]]
+    assert [kwargs["item_id"] for name, kwargs in client.requests if name == "log"] == item_ids
+    assert [kwargs["item_id"] for name, kwargs in client.requests if name == "finish_test_item"] == item_ids + [
+        suite_id
+    ]
+    breaker.close()
+    assert os.listdir(tmp_path) == []
+
+
+def test_circuit_breaker_journal_kept(tmp_path):
+    """Verify that the journal is kept if the server is not back by the launch finish and can be replayed later."""
+    client = FakeClient()
+    breaker = CircuitBreakerClient(client, 1, 3600, str(tmp_path))
+    suite_id = breaker.start_test_item("Suite", "0", "suite")
+    client.available = False
+    run_tests(breaker, suite_id, 5)
+    breaker.finish_test_item(suite_id, "0", status="PASSED")
+    assert breaker.finish_launch("0", status="PASSED") is None
+    breaker.close()
+    journal_files = os.listdir(tmp_path)
+    assert len(journal_files) == 1 and journal_files[0].startswith("rp-journal-launch-")
+
+    client.available = True
+    assert replay_journal(os.path.join(tmp_path, journal_files[0]), client)
+    assert [name for name, _ in client.requests] == (
+        ["start_test_item"]
+        + ["start_test_item", "log", "finish_test_item"] * 5
+        + ["finish_test_item", "finish_launch"]
+    )
+
+
+def test_circuit_breaker_nested_steps_and_clones(tmp_path):
+    """Verify that nested steps and clients cloned for other threads do not send requests while the breaker is open."""
+    client = FakeClient()
+    breaker = CircuitBreakerClient(client, 1, 3600, str(tmp_path))
+    suite_id = breaker.start_test_item("Suite", "0", "suite")
+    client.available = False
+    assert breaker.start_test_item("test", "0", "step", parent_item_id=suite_id)
+    assert client.attempts == 2
+
+    step_id = breaker.step_reporter.start_nested_step("Nested step", "0")
+    breaker.step_reporter.finish_nested_step(step_id, "0", "PASSED")
+    cloned = breaker.clone()
+    run_tests(cloned, cloned.current_item(), 2)
+    cloned.close()
+    assert client.attempts == 2
+    assert cloned.client.attempts == 0
+    assert len(breaker.journal) == 1 + 2 + 2 * 3
+
+    client.available = True
+    breaker.reset_timeout = 0
+    assert breaker.finish_launch("0", status="PASSED") == "finished"
+    assert len(breaker.journal) == 0
+    assert [kwargs["name"] for name, kwargs in client.requests if name == "start_test_item"] == [
+        "Suite",
+        "test",
+        "Nested step",
+        "test_0",
+        "test_1",
+    ]
+    breaker.close()
+
+
+def test_circuit_breaker_pickling(tmp_path):
+    """Verify that the breaker is restored from a pickle, as xdist workers receive it, with its own closed journal."""
+    client = FakeClient()
+    breaker = CircuitBreakerClient(client, 1, 3600, str(tmp_path))
+    suite_id = breaker.start_test_item("Suite", "0", "suite")
+    client.available = False
+    run_tests(breaker, suite_id, 1)
+
+    restored = pickle.loads(pickle.dumps(breaker))
+
+    assert restored.opened_at is None
+    assert len(restored.journal) == 0
+    assert restored.step_reporter.client is restored
+    assert restored.launch_uuid == "launch"
+    assert len(breaker.journal) == 3
+    breaker.close()
+    restored.close()
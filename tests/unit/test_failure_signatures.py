@@ -0,0 +1,56 @@
+#  Copyright (c) 2023 https://reportportal.io .
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#  https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License
+
+import pickle
+
+import pytest
+
+from pytest_reportportal.failure_signatures import FILE_LOCKS, FailureSignatures
+
+
+def test_signatures_without_state_file():
+    """Verify that the first Test Item of a signature is kept in memory if there is no state file."""
+    signatures = FailureSignatures()
+
+    assert signatures.setdefault("abc", "test_a") == "test_a"
+    assert signatures.setdefault("abc", "test_b") == "test_a"
+    assert signatures.setdefault("def", "test_b") == "test_b"
+
+
+@pytest.mark.skipif(not FILE_LOCKS, reason="File locks are not supported on the platform")
+def test_state_file_shares_signatures(tmp_path):
+    """Verify that registries with the same state file, as xdist workers have, share the first Test Items."""
+    state_file = str(tmp_path / "failure-signatures")
+    first, second = FailureSignatures(state_file), FailureSignatures(state_file)
+
+    assert first.setdefault("abc", "test_a[1]") == "test_a[1]"
+    assert second.setdefault("abc", "test_b") == "test_a[1]"
+    assert second.setdefault("def", "test b") == "test b"
+    assert first.setdefault("def", "test_c") == "test b"
+    first.close()
+    second.close()
+
+
+@pytest.mark.skipif(not FILE_LOCKS, reason="File locks are not supported on the platform")
+def test_signatures_pickling(tmp_path):
+    """Verify that the registry is restored from a pickle, as xdist workers receive it."""
+    signatures = FailureSignatures(str(tmp_path / "failure-signatures"))
+    signatures.setdefault("abc", "test_a")
+
+    restored = pickle.loads(pickle.dumps(signatures))
+
+    assert restored.setdefault("abc", "test_b") == "test_a"
+    assert restored.setdefault("def", "test_b") == "test_b"
+    assert signatures.setdefault("def", "test_c") == "test_b"
+    signatures.close()
+    restored.close()
@@ -13,6 +13,9 @@
 
 """This module includes unit tests for the plugin."""
 
+import subprocess
+import sys
+
 # noinspection PyUnresolvedReferences
 from unittest import mock
 
@@ -20,9 +23,11 @@ import pytest
 from _pytest.config.argparsing import Parser
 from delayed_assert import assert_expectations, expect
 
+from pytest_reportportal import hooks
 from pytest_reportportal.config import AgentConfig
 from pytest_reportportal.plugin import (
     FAILED_LAUNCH_WAIT,
+    HOOKS_PLUGIN_NAME,
     LOGGER,
     MANDATORY_PARAMETER_MISSED_PATTERN,
     is_control,
@@ -87,11 +92,23 @@ def test_pytest_configure(mocked_config):
     )
 
 
+def test_pytest_configure_registers_hooks(mocked_config):
+    """Test that test execution hooks are registered if reporting is enabled.
+
+    :param mocked_config: Pytest fixture
+    """
+    mocked_config.option.rp_enabled = True
+    mocked_config.pluginmanager.is_registered.return_value = False
+    pytest_configure(mocked_config)
+    mocked_config.pluginmanager.register.assert_called_once_with(hooks, HOOKS_PLUGIN_NAME)
+
+
 def test_pytest_configure_dry_run(mocked_config):
     """Test plugin configuration in case of dry-run execution."""
     mocked_config.getoption.side_effect = lambda opt, default: True
     pytest_configure(mocked_config)
     assert mocked_config._rp_enabled is False
+    mocked_config.pluginmanager.register.assert_not_called()
 
 
 @mock.patch("pytest_reportportal.plugin.LOGGER", wraps=LOGGER)
@@ -141,13 +158,12 @@ def test_pytest_configure_misssing_rp_project(mocked_log, mocked_config):
 
 
 @mock.patch("pytest_reportportal.plugin.LAUNCH_WAIT_TIMEOUT", 1)
-@mock.patch("pytest_reportportal.plugin.time")
-def test_wait_launch(time_mock):
+def test_wait_launch():
     """Test wait_launch() function for the correct behavior."""
-    time_mock.time.side_effect = [0, 1, 2]
-    rp_client = mock.Mock()
-    rp_client.launch_uuid = None
-    assert not wait_launch(rp_client)
+    py_test_service = mock.Mock()
+    py_test_service.wait_launch.return_value = False
+    assert not wait_launch(py_test_service)
+    py_test_service.wait_launch.assert_called_once_with(1)
 
 
 def test_pytest_collection_finish(mocked_session):
@@ -170,6 +186,7 @@ def test_pytest_sessionstart(mocked_session):
     mocked_session.config.pluginmanager.hasplugin.return_value = True
     mocked_session.config._reporter_config = mock.Mock(spec=AgentConfig(mocked_session.config))
     mocked_session.config._reporter_config.rp_launch_attributes = []
+    mocked_session.config._reporter_config.rp_launch_start_background = False
     mocked_session.config.py_test_service = mock.Mock()
     pytest_sessionstart(mocked_session)
     expect(lambda: mocked_session.config.py_test_service.init_service.called)
@@ -192,6 +209,7 @@ def test_pytest_sessionstart_launch_wait_fail(mocked_log, mocked_session):
     mocked_session.config._reporter_config = mock.Mock(spec=AgentConfig(mocked_session.config))
     mocked_session.config._reporter_config.rp_launch_attributes = []
     mocked_session.config._reporter_config.rp_launch_id = None
+    mocked_session.config._reporter_config.rp_launch_start_background = False
     mocked_session.config.py_test_service = mock.Mock()
     pytest_sessionstart(mocked_session)
     expect(lambda: mocked_session.config.py_test_service.rp is None)
@@ -261,6 +279,8 @@ def test_pytest_addoption_adds_correct_ini_file_arguments():
         "rp_log_batch_payload_limit",
         "rp_log_batch_payload_size",
         "rp_log_custom_levels",
+        "rp_log_logger_levels",
+        "rp_log_respect_levels",
         "rp_ignore_attributes",
         "rp_is_skipped_an_issue",
         "rp_hierarchy_code",
@@ -280,6 +300,37 @@ def test_pytest_addoption_adds_correct_ini_file_arguments():
         "rp_connect_timeout",
         "rp_read_timeout",
         "rp_report_fixtures",
+        "rp_report_fixtures_buffered",
+        "rp_report_fixtures_threshold",
+        "rp_description_max_length",
+        "rp_description_skip_oversized",
+        "rp_evict_finished_items",
+        "rp_bdd_steps_mode",
+        "rp_bdd_background_once",
+        "rp_lazy_item_paths",
+        "rp_launch_start_background",
+        "rp_log_upload_policy",
+        "rp_log_buffer_size",
+        "rp_aggregate_passed",
+        "rp_failure_dedup",
+        "rp_failure_signature_attribute",
+        "rp_traceback_style",
+        "rp_traceback_max_bytes",
+        "rp_traceback_attach_full",
+        "rp_log_coalesce_window",
+        "rp_log_coalesce_max_length",
+        "rp_log_queue_size",
+        "rp_log_queue_overflow",
+        "rp_log_max_pending",
+        "rp_circuit_breaker_failures",
+        "rp_circuit_breaker_reset_timeout",
+        "rp_circuit_breaker_journal_dir",
+        "rp_retry_backoff",
+        "rp_retry_max_delay",
+        "rp_retry_budgets",
+        "rp_retry_worker_budget",
+        "rp_max_requests_per_second",
+        "rp_max_bytes_per_second",
     )
 
     pytest_addoption(mock_parser)
@@ -323,3 +374,26 @@ def test_pytest_addoption_adds_correct_command_line_arguments():
     for args, kwargs in mock_reporting_group.addoption.call_args_list:
         added_argument_names.append(args[0] if args else kwargs.get("name"))
     assert tuple(added_argument_names) == expected_argument_names
+
+
+HEAVY_MODULES = ("reportportal_client", "pytest_bdd", "pytest_reportportal.service", "pytest_reportportal.hooks")
+
+
+def test_plugin_import_does_not_load_heavy_modules():
+    """Test that the plugin entry point imports only what is needed to register options.
+
+    The import is traced with `-X importtime` in a separate process, pytest itself is imported beforehand to measure
+    only the plugin's share.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import pytest; import pytest_reportportal.plugin"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    lines = [line.split("|") for line in result.stderr.splitlines() if line.startswith("import time:")]
+    names = [line[2].strip() for line in lines]
+    plugin_modules = names[names.index("pytest") + 1 :]
+    assert "pytest_reportportal.plugin" in plugin_modules
+    loaded = [name for name in plugin_modules if name.split(".")[0] in HEAVY_MODULES or name in HEAVY_MODULES]
+    assert loaded == []
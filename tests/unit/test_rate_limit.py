@@ -0,0 +1,213 @@
+#  Copyright (c) 2022 https://reportportal.io .
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#  https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License
+
+
+import pickle
+import threading
+import time
+
+import pytest
+from reportportal_client import RPClient
+
+from pytest_reportportal.rate_limit import (
+    FILE_LOCKS,
+    RateLimitedAdapter,
+    RateLimiter,
+    create_rate_limiter,
+    mount_parent_rate_limit,
+    mount_rate_limit,
+)
+from pytest_reportportal.retries import mount_retry_policy
+from tests.helpers.server import StandInServer
+
+START_TIME = "1700000000000"
+
+
+def test_request_rate_is_limited():
+    """Verify that requests above the full bucket wait for new tokens."""
+    limiter = RateLimiter(50, 0)
+
+    start = time.monotonic()
+    for _ in range(75):
+        limiter.acquire()
+
+    # 50 requests of the full bucket pass at once, other 25 take half a second
+    assert time.monotonic() - start >= 0.45
+
+
+def test_large_request_is_sent_in_debt():
+    """Verify that a request larger than the bytes bucket is sent at once and the next request pays the debt."""
+    limiter = RateLimiter(0, 1000)
+
+    start = time.monotonic()
+    limiter.acquire(3000)
+    assert time.monotonic() - start < 0.1
+    limiter.acquire(10)
+
+    # The next request waits until the 2000 bytes debt is paid
+    assert time.monotonic() - start >= 1.9
+
+
+def test_no_limits():
+    """Verify that requests do not wait if there are no limits."""
+    limiter = RateLimiter(0, 0)
+
+    start = time.monotonic()
+    for _ in range(1000):
+        limiter.acquire(10000)
+
+    assert time.monotonic() - start < 0.5
+
+
+@pytest.mark.skipif(not FILE_LOCKS, reason="File locks are not supported on the platform")
+def test_state_file_shares_limit(tmp_path):
+    """Verify that limiters with the same state file share the limit."""
+    state_file = str(tmp_path / "rate-limit")
+    limiters = [RateLimiter(40, 0, state_file) for _ in range(2)]
+
+    def send(limiter: RateLimiter) -> None:
+        for _ in range(30):
+            limiter.acquire()
+
+    threads = [threading.Thread(target=send, args=(limiter,)) for limiter in limiters]
+    start = time.monotonic()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # 40 requests of the full bucket pass at once, other 20 take half a second
+    assert time.monotonic() - start >= 0.45
+    for limiter in limiters:
+        limiter.close()
+
+
+def test_limits_are_divided_without_state_file():
+    """Verify that processes get their share of the limits if there is no state file."""
+    limiter = create_rate_limiter(100, 1000, None, 4)
+
+    assert limiter.max_requests == 25
+    assert limiter.max_bytes == 250
+    assert limiter.state_file is None
+
+
+def test_limiter_pickling(tmp_path):
+    """Verify that the limiter is restored from a pickle, as xdist workers receive it."""
+    limiter = RateLimiter(10, 0, str(tmp_path / "rate-limit"))
+    limiter.acquire()
+
+    restored = pickle.loads(pickle.dumps(limiter))
+    restored.acquire()
+
+    assert restored.max_requests == 10
+    limiter.close()
+    restored.close()
+
+
+def test_adapter_takes_body_size():
+    """Verify that the adapter waits for the limiter with the request body size."""
+
+    class Limiter:
+        def __init__(self) -> None:
+            self.sizes = []
+
+        def acquire(self, size: int = 0) -> None:
+            self.sizes.append(size)
+            raise RuntimeError("Stop before sending")
+
+    class Request:
+        body = b"0123456789"
+
+    limiter = Limiter()
+    adapter = RateLimitedAdapter(limiter)
+
+    with pytest.raises(RuntimeError):
+        adapter.send(Request())
+
+    assert limiter.sizes == [10]
+
+
+class CountingLimiter(RateLimiter):
+    """Rate limiter without limits, which counts waits."""
+
+    def __init__(self) -> None:
+        super().__init__(0, 0)
+        self.waits = 0
+
+    def acquire(self, size: int = 0) -> None:
+        self.waits += 1
+
+
+def create_client(server: StandInServer, info_requests: int = 1) -> RPClient:
+    client = RPClient(server.endpoint, "project", api_key="api_key", launch_uuid="launch", retries=3)
+    wait_for_info(server, info_requests)
+    return client
+
+
+def wait_for_info(server: StandInServer, info_requests: int) -> None:
+    # Clients request API info in a background thread, which should not be counted by the limiter
+    deadline = time.monotonic() + 5
+    while server.attempts("/info") < info_requests and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+
+def test_retries_are_limited():
+    """Verify that retries made by urllib3 inside the adapter wait for the limiter with the backoff retry policy."""
+    server = StandInServer()
+    server.scripts["/item"] = [(503, {}, {}), (503, {}, {}), (201, {}, {"id": "item_id"})]
+    client = create_client(server)
+    limiter = CountingLimiter()
+    mount_retry_policy(client, 3, 0.01, 1, rate_limiter=limiter)
+
+    assert client.start_test_item("test", START_TIME, "step") == "item_id"
+    assert server.attempts("/item") == 3
+    assert limiter.waits == 3
+    client.close()
+    server.shutdown()
+    server.server_close()
+
+
+def test_retries_of_client_policy_are_limited():
+    """Verify that retries of the client's own retry policy wait for the limiter."""
+    server = StandInServer()
+    server.scripts["/settings"] = [(503, {}, {}), (200, {}, {})]
+    client = create_client(server)
+    limiter = CountingLimiter()
+    mount_rate_limit(client, limiter)
+
+    client.get_project_settings()
+    assert server.attempts("/settings") == 2
+    assert limiter.waits == 2
+    client.close()
+    server.shutdown()
+    server.server_close()
+
+
+def test_cloned_client_is_limited():
+    """Verify that a cloned client, which has a new session, waits for the limiter of its parent."""
+    server = StandInServer()
+    server.scripts["/item"] = [(503, {}, {}), (201, {}, {"id": "item_id"})]
+    parent = create_client(server)
+    limiter = CountingLimiter()
+    mount_retry_policy(parent, 3, 0.01, 1, rate_limiter=limiter)
+    client = parent.clone()
+    mount_parent_rate_limit(client, parent)
+    wait_for_info(server, 2)
+    waits = limiter.waits
+
+    assert client.start_test_item("test", START_TIME, "step") == "item_id"
+    assert limiter.waits - waits == 2
+    client.close()
+    parent.close()
+    server.shutdown()
+    server.server_close()
@@ -0,0 +1,109 @@
+#  Copyright (c) 2022 https://reportportal.io .
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#  https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License
+
+
+import random
+import time
+
+import pytest
+from reportportal_client import RPClient
+
+from pytest_reportportal.retries import create_retry, mount_retry_policy
+from tests.helpers.server import StandInServer
+
+START_TIME = "1700000000000"
+
+
+@pytest.fixture()
+def server():
+    server = StandInServer()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def create_client(server: StandInServer) -> RPClient:
+    return RPClient(server.endpoint, "project", api_key="api_key", launch_uuid="launch", retries=3, log_batch_size=1)
+
+
+ITEM_CREATED = (201, {}, {"id": "item_id"})
+
+
+def test_not_processed_statuses_are_retried(server):
+    """Verify that item starts answered with 429 and 503 are retried, though they are POST requests."""
+    server.scripts["/item"] = [(429, {"Retry-After": "0"}, {}), (503, {}, {}), ITEM_CREATED]
+    client = create_client(server)
+    assert client.start_test_item("test", START_TIME, "step") is None
+    assert server.attempts("/item") == 1
+
+    server.scripts["/item"] = [(429, {"Retry-After": "0"}, {}), (503, {}, {}), ITEM_CREATED]
+    mount_retry_policy(client, 3, 0.01, 1)
+    assert client.start_test_item("test", START_TIME, "step") == "item_id"
+    assert server.attempts("/item") == 4
+    client.close()
+
+
+def test_retry_after_is_capped(server):
+    """Verify that the 'Retry-After' header is honored, but not longer than the maximum delay."""
+    server.scripts["/item"] = [(429, {"Retry-After": "100"}, {}), ITEM_CREATED]
+    client = create_client(server)
+    mount_retry_policy(client, 3, 0.01, 0.5)
+    start = time.monotonic()
+    assert client.start_test_item("test", START_TIME, "step") == "item_id"
+    assert 0.5 <= time.monotonic() - start < 5
+    client.close()
+
+
+def test_retry_budgets(server):
+    """Verify that request type and process retry budgets limit retries."""
+    server.scripts["/log"] = [(503, {}, {})]
+    server.scripts["/item"] = [(503, {}, {})]
+    client = create_client(server)
+    mount_retry_policy(client, 3, 0.01, 0.1, {"log": 0}, worker_budget=4)
+
+    client.log(START_TIME, "Log", level="INFO")
+    assert server.attempts("/log") == 1
+    assert client.start_test_item("test", START_TIME, "step") is None
+    assert server.attempts("/item") == 4
+    assert client.start_test_item("test", START_TIME, "step") is None
+    assert server.attempts("/item") == 6
+    client.close()
+
+
+def test_request_type_budget_is_shared(server):
+    """Verify that all requests of a type share its retry budget, while each request is capped with its own limit."""
+    server.scripts["/item"] = [(503, {}, {})]
+    server.scripts["/log"] = [(503, {}, {})]
+    client = create_client(server)
+    mount_retry_policy(client, 2, 0.01, 0.1, {"item": 3}, worker_budget=10)
+
+    assert client.start_test_item("test", START_TIME, "step") is None
+    assert server.attempts("/item") == 3
+    assert client.start_test_item("test", START_TIME, "step") is None
+    assert server.attempts("/item") == 5
+    assert client.start_test_item("test", START_TIME, "step") is None
+    assert server.attempts("/item") == 6
+    # Other request types are not limited by the item budget
+    client.log(START_TIME, "Log", level="INFO")
+    assert server.attempts("/log") == 3
+    client.close()
+
+
+def test_full_jitter_backoff():
+    """Verify that backoff delays are random up to the exponential value capped with the maximum delay."""
+    random.seed(1)
+    retry = create_retry(10, 0.5, 4, None)
+    for retry_number in range(1, 8):
+        delays = {retry.new(history=(None,) * retry_number).get_backoff_time() for _ in range(50)}
+        assert all(0 <= delay <= min(4, 0.5 * 2 ** (retry_number - 1)) for delay in delays)
+        assert len(delays) > 1
@@ -0,0 +1,177 @@
+#  Copyright (c) 2022 https://reportportal.io .
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#  https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License
+
+
+import logging
+import threading
+import time
+from datetime import datetime, timezone
+
+import pytest
+from reportportal_client.aio import ThreadedRPClient
+
+from pytest_reportportal.config import LogQueueOverflow
+from pytest_reportportal.rp_logging import LogCoalescer, LogQueue, QueuedRPLogHandler
+from tests.helpers.server import StandInServer
+
+RECORD_NUMBER = 200
+REQUEST_TIME = 0.002
+PENDING_RECORD_NUMBER = 50
+
+
+def make_record(i: int) -> logging.LogRecord:
+    return logging.makeLogRecord({"msg": "Record %d", "args": (i,), "levelno": logging.INFO})
+
+
+@pytest.mark.parametrize("overflow", [LogQueueOverflow.BLOCK, LogQueueOverflow.SPILL])
+def test_log_queue_max_pending(overflow):
+    """Verify that the log queue limits unfinished requests of the threaded client and keeps the record order."""
+    server = StandInServer(delay=REQUEST_TIME * 5)
+    server.scripts["/log"] = [(200, {}, {"responses": [{"id": "log"}]})]
+    client = ThreadedRPClient(server.endpoint, "project", api_key="key", launch_uuid="launch", log_batch_size=1)
+    log_queue = LogQueue(10, overflow, max_pending=5)
+    handler = QueuedRPLogHandler(log_queue, rp_client=client)
+    log_queue.start()
+    try:
+        for i in range(PENDING_RECORD_NUMBER):
+            handler.handle(make_record(i))
+    finally:
+        log_queue.stop()
+        client.close()
+        server.shutdown()
+
+    assert server.attempts("/log") == PENDING_RECORD_NUMBER
+    assert server.peak_active <= 6
+    if overflow is LogQueueOverflow.SPILL:
+        assert log_queue.spilled > 0
+        assert log_queue.drained == log_queue.spilled
+    else:
+        assert log_queue.spilled == 0
+
+
+class RecordingClient:
+    """Client stand-in, which records sent messages."""
+
+    def __init__(self) -> None:
+        self.messages = []
+
+    def log(self, time, message, level=None, attachment=None, item_id=None):
+        self.messages.append(message)
+
+    # noinspection PyMethodMayBeStatic
+    def current_item(self) -> str:
+        return "item"
+
+
+@pytest.mark.parametrize("max_length", [30, 40, 60])
+def test_log_coalescer_repeats_fit_max_length(max_length):
+    """Verify that repeat counters of merged lines do not push merged messages past the length limit."""
+    client = RecordingClient()
+    coalescer = LogCoalescer(client, 60, max_length)
+    now = datetime.now(tz=timezone.utc)
+    messages = ["Processing item", "Waiting for the server", "Waiting for the server", "Done", "Done", "Done"]
+    for _ in range(5):
+        for message in messages:
+            coalescer.log(now, message, "INFO", item_id="item")
+    coalescer.flush()
+
+    assert all(len(message) <= max_length for message in client.messages)
+    lines = []
+    for line in "\n".join(client.messages).splitlines():
+        message, _, repeats = line.partition(" [repeated ")
+        lines.extend([message] * (int(repeats.split()[0]) if repeats else 1))
+    assert lines == messages * 5
+
+
+class SlowClient(RecordingClient):
+    """Synchronous client stand-in, which takes time to send a request."""
+
+    def log(self, time, message, level=None, attachment=None, item_id=None):
+        threading.Event().wait(REQUEST_TIME)
+        super().log(time, message, level, attachment, item_id)
+
+
+def test_log_queue_drop_oldest():
+    """Verify that the log queue drops the oldest records if it is full and sends the newest ones."""
+    client = SlowClient()
+    log_queue = LogQueue(5, LogQueueOverflow.DROP_OLDEST)
+    handler = QueuedRPLogHandler(log_queue, rp_client=client)
+    log_queue.start()
+    try:
+        for i in range(RECORD_NUMBER):
+            handler.handle(make_record(i))
+    finally:
+        log_queue.stop()
+
+    assert log_queue.dropped > 0
+    assert len(client.messages) + log_queue.dropped == RECORD_NUMBER
+    assert client.messages == sorted(client.messages, key=lambda message: int(message.split()[-1]))
+    assert client.messages[-1] == f"Record {RECORD_NUMBER - 1}"
+
+
+def test_log_queue_stop_while_logging():
+    """Verify that the log queue stops while another thread keeps logging and drops the oldest records."""
+    client = SlowClient()
+    log_queue = LogQueue(1, LogQueueOverflow.DROP_OLDEST)
+    handler = QueuedRPLogHandler(log_queue, rp_client=client)
+    log_queue.start()
+    logging_finished = threading.Event()
+
+    def log_for_a_second() -> None:
+        deadline = time.monotonic() + 1
+        i = 0
+        while time.monotonic() < deadline:
+            handler.handle(make_record(i))
+            i += 1
+            time.sleep(REQUEST_TIME / 4)
+        logging_finished.set()
+
+    thread = threading.Thread(target=log_for_a_second, daemon=True)
+    thread.start()
+    time.sleep(0.3)
+    stopper = threading.Thread(target=log_queue.stop, daemon=True)
+    stopper.start()
+    stopper.join(3)
+    thread.join(3)
+
+    assert not stopper.is_alive(), "Log queue stop hung"
+    assert logging_finished.is_set()
+
+
+def test_log_queue_spill_sends_without_stop():
+    """Verify that the spilled records of several logging threads are sent in their order before the queue stops."""
+    client = SlowClient()
+    log_queue = LogQueue(2, LogQueueOverflow.SPILL)
+    handler = QueuedRPLogHandler(log_queue, rp_client=client)
+    log_queue.start()
+    threads = [
+        threading.Thread(target=lambda n=n: [handler.handle(make_record(n * RECORD_NUMBER + i)) for i in range(50)])
+        for n in range(4)
+    ]
+    try:
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        deadline = time.monotonic() + 5
+        while len(client.messages) < 200 and time.monotonic() < deadline:
+            time.sleep(REQUEST_TIME)
+        sent = list(client.messages)
+    finally:
+        log_queue.stop()
+
+    assert log_queue.spilled > 0
+    assert len(sent) == 200
+    for n in range(4):
+        numbers = [int(message.split()[-1]) for message in sent if int(message.split()[-1]) // RECORD_NUMBER == n]
+        assert numbers == list(range(n * RECORD_NUMBER, n * RECORD_NUMBER + 50))
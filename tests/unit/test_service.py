@@ -14,10 +14,24 @@
 """This module includes unit tests for the service.py module."""
 
 import os
+import tempfile
+import threading
+from unittest import mock
 
+import pytest
 from delayed_assert import assert_expectations, expect
+from pytest import Function
 
-from pytest_reportportal.service import _is_pytest_bdd_scenario
+from pytest_reportportal.config import LogUploadPolicy
+from pytest_reportportal.service import (
+    ExecStatus,
+    ItemKind,
+    LeafType,
+    _is_pytest_bdd_scenario,
+    _trim_docstring_cached,
+    get_failure_signature,
+    truncate_middle,
+)
 
 
 def test_is_pytest_bdd_scenario_path():
@@ -85,3 +99,208 @@ def test_get_method_name_preserves_at_inside_params(mocked_item, rp_service):
 
     expect(result == "test_email[user@example.com]")
     assert_expectations()
+
+
+def test_get_kind_is_resolved_once(mocked_item, rp_service):
+    """Test that item kind is cached after the first resolution."""
+    mocked_item.location = ("examples/test_simple.py", 0, "test_item")
+
+    expect(rp_service._get_kind(mocked_item) is ItemKind.REGULAR)
+    mocked_item.location = (os.path.join("project", "pytest_bdd", "scenario.py"), 0, "test_item")
+    expect(rp_service._get_kind(mocked_item) is ItemKind.REGULAR)
+
+    assert_expectations()
+
+
+def test_get_item_description_is_memoized(rp_service):
+    """Test that trimmed docstrings are reused for items of the same function."""
+
+    def test_function():
+        """
+        Test description.
+        """
+
+    items = [mock.Mock(spec=Function), mock.Mock(spec=Function)]
+    for item in items:
+        item.obj = test_function
+
+    hits = _trim_docstring_cached.cache_info().hits
+    descriptions = [rp_service._get_item_description(item) for item in items]
+
+    expect(descriptions == ["Test description.", "Test description."])
+    expect(_trim_docstring_cached.cache_info().hits == hits + 1)
+    assert_expectations()
+
+
+@pytest.mark.parametrize(
+    ["max_length", "skip_oversized", "description", "expected_result"],
+    [
+        (0, False, "Long description", "Long description"),
+        (16, False, "Long description", "Long description"),
+        (10, False, "Long description", "Long de..."),
+        (2, False, "Long description", "Lo"),
+        (10, True, "Long description", None),
+        (10, True, None, None),
+    ],
+)
+def test_limit_description(rp_service, max_length, skip_oversized, description, expected_result):
+    """Test that oversized descriptions are truncated or skipped."""
+    rp_service._config.rp_description_max_length = max_length
+    rp_service._config.rp_description_skip_oversized = skip_oversized
+
+    assert rp_service._limit_description(description) == expected_result
+
+
+def test_finished_item_eviction(mocked_item, rp_service):
+    """Test that finished item metadata is released while late logs still reach the item."""
+    rp_service._config.rp_evict_finished_items = True
+    mocked_item.location = ("examples/test_simple.py", 0, "test_item")
+    mocked_item.iter_markers.return_value = []
+    root = rp_service._create_leaf(LeafType.ROOT, None, None)
+    suite = rp_service._create_leaf(LeafType.FILE, root, "suite", item_id="suite_id")
+    suite["exec"] = ExecStatus.IN_PROGRESS
+    leaf = rp_service._create_leaf(LeafType.CODE, suite, mocked_item, item_id="item_id")
+    leaf.update({"exec": ExecStatus.IN_PROGRESS, "name": "test_item", "description": "Test description."})
+    root["children"]["suite"] = suite
+    suite["children"][mocked_item] = leaf
+    rp_service._tree_path[mocked_item] = [root, suite, leaf]
+
+    with mock.patch.object(rp_service, "rp") as client:
+        rp_service.finish_pytest_item(mocked_item)
+        rp_service.post_log(mocked_item, "Late message")
+
+    expect(rp_service._tree_path[mocked_item] == [leaf])
+    expect("description" not in leaf)
+    expect(leaf["exec"] == ExecStatus.FINISHED)
+    expect(suite["exec"] == ExecStatus.FINISHED)
+    expect(suite["children"] == {})
+    expect(client.log.call_args[1]["item_id"] == "item_id")
+    assert_expectations()
+
+
+def test_scenario_outline_metadata_is_precomputed(rp_service):
+    """Test that Scenario Outline metadata is computed once per template for all example rows."""
+    parser = pytest.importorskip("pytest_bdd.parser")
+    feature = mock.Mock(rel_filename="features/outline.feature")
+    examples = parser.Examples(example_params=["b", "a"], examples=[["1", "2"], ["3", "4"]], tags={"row_tag"})
+    template = parser.ScenarioTemplate(
+        feature=feature, keyword="Scenario Outline", name="Outline", line_number=3, templated=True, description=""
+    )
+    template.examples = [examples]
+
+    with mock.patch(
+        "pytest_reportportal.service.markdown_helpers.format_data_table_dict", return_value="table"
+    ) as format_table:
+        template_metadata = rp_service._get_template_metadata(template)
+        row_metadata = rp_service._get_example_row_metadata(template, {"b": "3", "a": "4"})
+        rp_service._get_template_metadata(template)
+
+    expect(format_table.call_count == 2)
+    expect(template_metadata["code_ref_prefix"] == "features/outline.feature/")
+    expect(template_metadata["example_tags"] == ["row_tag"])
+    expect(row_metadata["parameters_str"] == "[a:4;b:3]")
+    expect(row_metadata["parameters_table"] == "Parameters:\n\ntable")
+    scenario = mock.Mock(feature=feature, rule=None)
+    scenario.name = "Outline"
+    code_ref = rp_service._get_scenario_code_ref(scenario, template, row_metadata)
+    expect(code_ref == "features/outline.feature/[EXAMPLE:Outline[a:4;b:3]]")
+    assert_expectations()
+
+
+def test_start_in_background(rp_service):
+    """Test that the launch is started in a background thread and joined by wait_launch."""
+    started = threading.Event()
+    client = mock.Mock()
+    client.start_launch.side_effect = lambda **kwargs: started.wait(5) and "launch_uuid"
+    with mock.patch("pytest_reportportal.service.create_client", return_value=client):
+        rp_service.start_in_background()
+
+    expect(rp_service.launch_pending)
+    expect(rp_service.rp is client)
+    started.set()
+    expect(rp_service.wait_launch(5))
+    expect(not rp_service.launch_pending)
+    expect(client.get_project_settings.called)
+    expect(rp_service._launch_id == "launch_uuid")
+    assert_expectations()
+
+
+def test_start_in_background_failure(rp_service):
+    """Test that wait_launch reports failure of the background launch start."""
+    client = mock.Mock()
+    client.get_project_settings.side_effect = ValueError("Connection refused")
+    with mock.patch("pytest_reportportal.service.create_client", return_value=client):
+        rp_service.start_in_background()
+
+    assert not rp_service.wait_launch(5)
+    client.start_launch.assert_not_called()
+
+
+@pytest.mark.parametrize(
+    "policy, rerun, expected_log_count",
+    [
+        ("ON_FAILURE", False, 0),
+        ("ON_FAILURE", True, 0),
+        ("ON_FAILURE_OR_RERUN", False, 0),
+        ("ON_FAILURE_OR_RERUN", True, 4),
+    ],
+)
+def test_log_buffer_flush_on_rerun(mocked_item, rp_service, policy, rerun, expected_log_count):
+    """Test that buffered logs of passed items are sent only if the item was rerun and the policy requires it."""
+    rp_service._config.rp_log_upload_policy = LogUploadPolicy[policy]
+    mocked_item.location = ("examples/test_simple.py", 0, "test_item")
+    mocked_item.iter_markers.return_value = []
+    root = rp_service._create_leaf(LeafType.ROOT, None, None)
+    leaf = rp_service._create_leaf(LeafType.CODE, root, mocked_item, item_id="item_id")
+    leaf["exec"] = ExecStatus.IN_PROGRESS
+    rp_service._tree_path[mocked_item] = [root, leaf]
+
+    with mock.patch.object(rp_service, "rp") as client:
+        rp_service._item_kinds[mocked_item] = ItemKind.REGULAR
+        log_buffer = rp_service.create_log_buffer(mocked_item)
+        for when in ("setup", "call", "setup", "call")[: 4 if rerun else 2]:
+            rp_service.process_results(mocked_item, mock.Mock(when=when, longrepr=None, failed=False, skipped=False))
+            log_buffer.log("time", f"{when} message", "INFO", None, "item_id")
+        rp_service.finish_pytest_item(mocked_item)
+
+    assert client.log.call_count == expected_log_count
+
+
+def test_failure_signature_normalization():
+    """Test that failure signatures do not depend on memory addresses, temporary paths and parameter values."""
+    traceback_text = (
+        "value = {0}\n"
+        "    def test_dependency_failure(value):\n"
+        ">       raise ConnectionError(f'Dependency is not available for {{value}}')\n"
+        "E       ConnectionError: Dependency <object at {1}> is not available for {0}\n"
+        "{2}/pytest-of-user/pytest-1/test_failure0/test_file.py:12: ConnectionError"
+    )
+    signature = get_failure_signature(traceback_text.format(1, "0x7f12ab", tempfile.gettempdir()), {"value": 1})
+    expect(
+        signature == get_failure_signature(traceback_text.format(2, "0x7f34cd", tempfile.gettempdir()), {"value": 2})
+    )
+    expect(
+        signature != get_failure_signature(traceback_text.format(2, "0x7f34cd", tempfile.gettempdir()), {"value": 1})
+    )
+    assert_expectations()
+
+
+@pytest.mark.parametrize("max_bytes", [1, 10, 40, 100, 1000])
+def test_truncate_middle_fits_limit(max_bytes):
+    """Truncated text should never exceed the limit, even if the truncation marker does not fit into it."""
+    text = "é" * 500 + "x" * 500
+
+    result = truncate_middle(text, max_bytes)
+
+    expect(len(result.encode("utf-8")) <= max_bytes)
+    expect(result != text)
+    assert_expectations()
+
+
+def test_truncate_middle_keeps_short_text():
+    """Text which fits into the limit should be returned as is."""
+    text = "short text"
+
+    expect(truncate_middle(text, 10) is text)
+    expect(truncate_middle(text, 0) is text)
+    assert_expectations()